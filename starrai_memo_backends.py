@@ -0,0 +1,241 @@
+"""設定の保存先（バックエンド）の切り替え
+
+アプリは SettingsBackend の load・save_section・save_all・flush だけを使い、
+実際の形式（テキスト・pickle・JSON・settings.bin・SQLite）はストアクラスが
+受け持つ。保存先は環境変数 STARRAI_MEMO_BACKEND で選ぶ（未設定の場合は
+既存のファイルから判定する）。
+
+    STARRAI_MEMO_BACKEND=pickle python starrai_memo_text.py
+
+形式の変換（拡張子で形式を判定する）:
+    python starrai_memo_backends.py settings.txt settings.db
+    python starrai_memo_backends.py settings.pkl settings.bin
+"""
+import importlib
+import os
+import sys
+
+BACKEND_ENV = "STARRAI_MEMO_BACKEND"
+
+# 名前 -> (モジュール, ストアクラス, 既定のファイル名)。使うときに初めて import する
+BACKENDS = {
+    "text": ("starrai_memo_storage", "TextSettingsStore", "settings.txt"),
+    "pickle": ("starrai_memo_storage", "PickleSettingsStore", "settings.pkl"),
+    "json": ("starrai_memo_storage", "JsonSettingsStore", "settings.json"),
+    "binary": ("starrai_memo_binary", "BinarySettingsStore", "settings.bin"),
+    "sqlite": ("starrai_memo_sqlite", "SqliteSettingsStore", "settings.db"),
+}
+AUTO_DETECT_ORDER = ["sqlite", "binary", "text"]  # 未指定時、ファイルがあれば優先する順
+MIGRATION_ORDER = ["text", "pickle", "json", "binary", "sqlite"]  # 保存先がないときの移行元
+BACKUP_AFTER_MIGRATION = ("pickle", "json")  # 移行後に *_backup にリネームする旧形式
+COMPANION_SUFFIXES = (".journal", "-wal", "-shm")  # 保存ファイルと一緒に退避する付随ファイル
+DEFAULT_BACKEND = "text"
+
+
+def create_store(name, path=None):
+    """バックエンド名からストアを作成"""
+    module_name, class_name, default_path = BACKENDS[name]
+    store_class = getattr(importlib.import_module(module_name), class_name)
+    return store_class(path or default_path)
+
+
+def backend_for_path(path):
+    """ファイルの拡張子からバックエンド名を判定"""
+    ext = os.path.splitext(path)[1].lower()
+    for name, (_, _, default_path) in BACKENDS.items():
+        if os.path.splitext(default_path)[1] == ext:
+            return name
+    return DEFAULT_BACKEND
+
+
+def selected_backend_name():
+    """環境変数、なければ既存のファイルから使うバックエンドを決める"""
+    name = os.environ.get(BACKEND_ENV, "").strip().lower()
+    if name:
+        if name not in BACKENDS:
+            print(f"{BACKEND_ENV}={name} は不明なバックエンドです（{', '.join(BACKENDS)}）。{DEFAULT_BACKEND} を使います")
+            return DEFAULT_BACKEND
+        return name
+    for name in AUTO_DETECT_ORDER:
+        if os.path.exists(BACKENDS[name][2]):
+            return name
+    return DEFAULT_BACKEND
+
+
+class SettingsBackend:
+    """保存先の共通インターフェース
+
+    load: 保存データを (section_data, last_section) で返す（なければ旧形式から移行）。
+          読み込めなかった場合は load_error にメッセージが入る
+    save_section: 1セクション分の変更を保存
+    save_all: 全セクションを保存（compact=True で終了時の畳み込みも行う）
+    flush: 依頼済みの保存が終わるまで待つ
+
+    エンコード・書き込みは SettingsWriter の専用スレッドで行うため、save_* は
+    すぐに戻る。差分の検出はストア側で行う。
+    """
+
+    def __init__(self, name, store):
+        from starrai_memo_storage import SettingsWriter
+        self.name = name
+        self.store = store
+        self.writer = SettingsWriter(store)
+        self._sections = {}  # 直近に保存を依頼したスナップショット
+        self._last_section = None
+        self.load_error = None  # 保存ファイルを読み込めなかった場合のメッセージ
+        self.saving_disabled = False  # 読み込めなかったファイルを退避できず、上書きしないようにした
+
+    @property
+    def path(self):
+        return self.store.path
+
+    def load(self):
+        if self.store.exists():
+            try:
+                section_data, last_section = self.store.load()
+                print(f"設定を読み込みました（{self.path}）: {len(section_data)}セクション")
+            except Exception as e:
+                print(f"設定読み込みエラー（{self.path}）: {e}")
+                # 旧形式からの移行はしない（古いデータや空のデータで上書きしてしまう）
+                section_data, last_section = {}, None
+                self.load_error = f"{self.path} を読み込めませんでした:\n{e}\n\n{self._set_aside_broken()}"
+        else:
+            section_data, last_section = self._migrate()
+        self._sections = dict(section_data)
+        self._last_section = last_section
+        return section_data, last_section
+
+    def save_section(self, name, section, last_section):
+        """1セクション分のスナップショットを差し替えて保存を依頼"""
+        sections = dict(self._sections)
+        sections[name] = section
+        self._submit(sections, last_section)
+
+    def save_all(self, section_data, last_section, compact=False):
+        self._submit(dict(section_data), last_section, compact)
+
+    def flush(self, timeout=None):
+        return self.writer.flush(timeout)
+
+    def close(self, timeout=None):
+        self.writer.close(timeout)
+
+    def _submit(self, sections, last_section, compact=False):
+        if self.saving_disabled:
+            return
+        self._sections = sections
+        self._last_section = last_section
+        self.writer.submit(sections, last_section, compact)
+
+    def _set_aside_broken(self):
+        """読み込めなかった保存ファイル（と付随ファイル）を *_broken にリネームし、結果の説明を返す
+
+        リネームできなければ、ファイルを空のデータで上書きしないように保存をやめる。
+        """
+        if hasattr(self.store, "close"):
+            self.store.close()
+        root, ext = os.path.splitext(self.path)
+        broken_path = f"{root}_broken{ext}"
+        number = 1
+        while os.path.exists(broken_path):
+            number += 1
+            broken_path = f"{root}_broken{number}{ext}"
+        try:
+            os.replace(self.path, broken_path)
+            for suffix in COMPANION_SUFFIXES:
+                if os.path.exists(self.path + suffix):
+                    os.replace(self.path + suffix, broken_path + suffix)
+        except OSError as e:
+            print(f"{self.path} のリネームエラー: {e}")
+            self.saving_disabled = True
+            return "ファイルを退避できなかったため、このまま終了しても上書き保存しません。"
+        print(f"読み込めなかった設定ファイルを{broken_path}にリネームしました")
+        return f"元のファイルは {broken_path} に残しています。"
+
+    def _migrate(self):
+        """他の形式のファイルがあれば読み込み、この保存先に書き直す"""
+        for name in MIGRATION_ORDER:
+            if name == self.name:
+                continue
+            source = create_store(name)
+            if not source.exists():
+                continue
+            try:
+                section_data, last_section = source.load()
+                section_data = {key: _decoded(value) for key, value in section_data.items()}
+            except Exception as e:
+                print(f"{source.path} からの移行エラー: {e}")
+                continue
+            print(f"{source.path} からデータを移行しました: {len(section_data)}セクション")
+            self.save_all(section_data, last_section, compact=True)
+            self.flush()
+            if hasattr(source, "close"):
+                source.close()
+            if name in BACKUP_AFTER_MIGRATION:
+                root, ext = os.path.splitext(source.path)
+                backup_path = f"{root}_backup{ext}"
+                os.replace(source.path, backup_path)
+                print(f"旧設定ファイルを{backup_path}にリネームしました")
+            return section_data, last_section
+        print("設定ファイルが見つかりません")
+        return {}, None
+
+
+def _decoded(section, baseline=True):
+    return section if isinstance(section, dict) else section.decode(baseline)
+
+
+def open_backend(name=None, path=None):
+    """保存先を開く（name を省略すると selected_backend_name() で決める）"""
+    name = name or selected_backend_name()
+    return SettingsBackend(name, create_store(name, path))
+
+
+def read_settings(path):
+    """拡張子に応じて設定を読み込み (section_data, last_section) を返す（全セクションをデコード）"""
+    store = create_store(backend_for_path(path), path)
+    section_data, last_section = store.load(read_only=True)
+    section_data = {name: _decoded(section) for name, section in section_data.items()}
+    if hasattr(store, "close"):
+        store.close()
+    return section_data, last_section
+
+
+def iter_settings(path):
+    """拡張子に応じて設定を開き、(名前, セクションの辞書) を1件ずつデコードして返す
+
+    デコード済みのセクションを溜めない（保存時の差分の基準にも残さない）ので、
+    書き出しなど全体を1回読むだけの処理に使う。読み取り専用で開くため、
+    アプリの起動中でも保存ファイル・ジャーナルを書き換えない。最後まで読むか
+    途中で閉じるとファイルを閉じる。
+    """
+    store = create_store(backend_for_path(path), path)
+    try:
+        section_data, _ = store.load(read_only=True)
+        for name in [name for name in section_data if not name.startswith('_')]:
+            yield name, _decoded(section_data.pop(name), baseline=False)
+    finally:
+        if hasattr(store, "close"):
+            store.close()
+
+
+def write_settings(path, section_data, last_section):
+    """拡張子に応じて設定を書き出す"""
+    store = create_store(backend_for_path(path), path)
+    store.compact(section_data, last_section)
+    if hasattr(store, "close"):
+        store.close()
+
+
+def convert_settings(src, dst):
+    """設定ファイルの形式を変換"""
+    section_data, last_section = read_settings(src)
+    write_settings(dst, section_data, last_section)
+    print(f"{src} -> {dst}: {len(section_data)}セクション")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    convert_settings(sys.argv[1], sys.argv[2])
@@ -0,0 +1,780 @@
+"""スターレイル メモアプリのベンチマーク
+
+使い方:
+    python starrai_memo_bench.py          # 保存処理（保存形式ごとの比較を含む）
+    python starrai_memo_bench.py parse    # settings.txt の読み込み（約10万行）・settings.bin との比較
+    python starrai_memo_bench.py rows     # 編成行の生成・復元・削除/追加・タブ切り替え・取り込み（ディスプレイ不要）
+    python starrai_memo_bench.py storage [--sections N] [--teams M] [--output result.json]
+                                          # 保存先ごとの保存・読み込み・1編集保存（JSON で出力）
+    python starrai_memo_bench.py gui [--sections N] [--teams M] [--output result.json]
+                                          # GUI 操作の所要時間と QObject 数（ディスプレイ不要、JSON で出力）
+    python starrai_memo_bench.py search   # 全文検索（1万編成）の索引作成・検索・索引の更新
+    python starrai_memo_bench.py stats    # 使用回数の集計（1万編成）の作成・1編集あたりの更新・表の再表示、
+                                          # 共起行列（1万・4万編成、NumPy が必要）の計算
+    python starrai_memo_bench.py export   # 保存ファイル（1万編成）から CSV・JSONL への書き出しの時間と最大メモリ
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from starrai_memo_storage import RELIC_PARTS, TextSettingsEncoder, parse_settings_text
+
+NAMES = ["カフカ", "銀狼", "ブラックスワン", "ルアン・メェイ", "符玄", "ホタル", "黄泉", "ロビン",
+         "サンデー", "アベンチュリン", "景元", "刃", "姫子", "ヴェルト", "停雲", "羅刹"]
+LIGHTCONES = ["只ある夜の下", "雨が止まぬ間", "夢が帰り着く場所", "今が永遠であれば",
+              "過ぎ去りし日", "純粋なる思惟の洗礼", "星間の旅路"]
+MAIN_STATS = ["HP%", "攻撃%", "防御%", "会心率", "会心DMG", "撃破", "回復効率", "属性DMG"]
+MEMO_LINES = ["セット効果: 4セット", "サブ効果: 会心率 / 会心DMG / 速度", "速度 134 以上を目標",
+              "必殺技の前にバフを入れる", "オーナメント: 停止した星盤（ピノコニー）", "被弾が多いので HP% 胴",
+              "2凸から編成が安定する", "敵の弱点: 氷・量子", "サイクル数: 2", "メモ: 次の更新で光円錐を変更"]
+
+
+def make_memo(rng, max_lines):
+    """0〜max_lines 行のメモ"""
+    return "\n".join(rng.choice(MEMO_LINES) for _ in range(rng.randint(0, max_lines)))
+
+
+def make_team(rng, row_id, long_memo=False):
+    """ダミーの編成を1件作成（long_memo=True では最大10行のメモ）"""
+    characters = []
+    for _ in range(4):
+        characters.append({
+            'name': rng.choice(NAMES),
+            'eidolon': rng.randint(0, 6),
+            'superimpose': rng.randint(1, 5),
+            'level': 80,
+            'lightcone': rng.choice(LIGHTCONES),
+            'main_stats': {part: rng.choice(MAIN_STATS) for part in RELIC_PARTS},
+            'memo': (make_memo(rng, 10) if long_memo else
+                     "セット効果: 4セット\nサブ効果: 会心率 / 会心DMG / 速度" * rng.randint(0, 3)),
+            'detail_shown': False,
+        })
+    return {'row_id': row_id, 'score': str(rng.randint(20000, 40000)), 'characters': characters}
+
+
+def make_section_data(sections, teams_per_section, seed=0, long_memo=False):
+    """sections × teams_per_section のダミーデータを作成（seed が同じなら同じデータ）"""
+    rng = random.Random(seed)
+    data = {}
+    for s in range(sections):
+        data[f"セクション {s+1}"] = {
+            'content': rng.choice(["忘却の庭", "虚構叙事", "末日の幻影"]),
+            'phase': rng.choice(["前半", "後半"]),
+            'teams': [make_team(rng, t + 1, long_memo) for t in range(teams_per_section)],
+        }
+    return data
+
+
+def edit_one_score(section_data, name, value):
+    """1セクションの先頭編成のスコアだけを変更（GUIと同じく変更した編成は新しい辞書にする）"""
+    teams = section_data[name]['teams']
+    team = dict(teams[0])
+    team['score'] = str(value)
+    section_data[name]['teams'] = [team] + teams[1:]
+
+
+def bench_incremental_save(section_counts=(1, 10, 50, 200), teams_per_section=20, repeat=20):
+    """未変更セクションが増えても1編集あたりの保存コストが増えないことを確認"""
+    print(f"incremental save ({teams_per_section} teams/section, 1 score edit per save)")
+    print(f"{'sections':>8} {'bytes':>10} {'full ms':>9} {'encode ms':>10} {'write ms':>9} {'teams':>6}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "settings.txt")
+        for count in section_counts:
+            data = make_section_data(count, teams_per_section)
+            target = next(iter(data))
+
+            # キャッシュなし（毎回全体をエンコード）
+            start = time.perf_counter()
+            for i in range(repeat):
+                edit_one_score(data, target, i)
+                text = TextSettingsEncoder().encode(data, target)
+            full_ms = (time.perf_counter() - start) / repeat * 1000
+
+            encoder = TextSettingsEncoder()
+            encoder.encode(data, target)
+            encode_total = 0.0
+            write_total = 0.0
+            for i in range(repeat):
+                edit_one_score(data, target, i)
+                start = time.perf_counter()
+                text = encoder.encode(data, target)
+                encode_total += time.perf_counter() - start
+                start = time.perf_counter()
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                write_total += time.perf_counter() - start
+
+            print(f"{count:>8} {len(text.encode('utf-8')):>10} {full_ms:>9.2f} "
+                  f"{encode_total / repeat * 1000:>10.3f} {write_total / repeat * 1000:>9.3f} "
+                  f"{encoder.encoded_teams:>6}")
+
+
+def bench_edit_save(team_counts=(1000, 5000), repeat=20):
+    """保存先（バックエンド）ごとの1編集あたりの保存時間"""
+    from starrai_memo_backends import BACKENDS, create_store
+    print(f"single-edit save (ms per save, {repeat} saves)")
+    print(f"{'teams':>8} " + " ".join(f"{name:>8}" for name in BACKENDS))
+    for count in team_counts:
+        data = make_section_data(count // 100, 100)
+        target = next(iter(data))
+        results = []
+        for name, (_, _, filename) in BACKENDS.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                store = create_store(name, os.path.join(tmp, filename))
+                store.compact(data, target)
+                start = time.perf_counter()
+                for i in range(repeat):
+                    edit_one_score(data, target, i)
+                    store.save(data, target)
+                results.append((time.perf_counter() - start) / repeat * 1000)
+                if hasattr(store, "close"):
+                    store.close()
+        print(f"{count:>8} " + " ".join(f"{ms:>8.2f}" for ms in results))
+
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def _measure(func, repeat):
+    """func の最短時間（ms）と tracemalloc のピークメモリ（バイト、計測は別の1回で行う）"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def bench_storage(sections=10, teams_per_section=100, repeat=3, edits=20, seed=0):
+    """保存先ごとの全体保存・全体読み込み・1編集保存と、旧 JSON からの移行（結果は辞書）"""
+    import contextlib
+    import io
+    from starrai_memo_backends import BACKENDS, SettingsBackend, create_store
+    data = make_section_data(sections, teams_per_section, seed, long_memo=True)
+    target = next(iter(data))
+    result = {
+        "dataset": {"sections": sections, "teams_per_section": teams_per_section,
+                    "characters_per_team": 4, "seed": seed},
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "backends": {},
+    }
+
+    for name, (_, _, filename) in BACKENDS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, filename)
+
+            def full_save():
+                for leftover in os.listdir(tmp):
+                    os.remove(os.path.join(tmp, leftover))
+                store = create_store(name, path)
+                store.compact(data, target)
+                if hasattr(store, "close"):
+                    store.close()
+
+            def full_load():
+                store = create_store(name, path)
+                loaded, _ = store.load()
+                for section in loaded.values():
+                    if not isinstance(section, dict):
+                        section.decode()
+                if hasattr(store, "close"):
+                    store.close()
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                save_ms, save_peak = _measure(full_save, repeat)
+                size = _dir_size(tmp)
+                load_ms, load_peak = _measure(full_load, repeat)
+
+                # アプリと同じく、読み込み後に開いた（デコードした）セクションだけを編集する
+                store = create_store(name, path)
+                edited, _ = store.load()
+                if not isinstance(edited[target], dict):
+                    edited[target] = edited[target].decode()
+                start = time.perf_counter()
+                for i in range(edits):
+                    edit_one_score(edited, target, i)
+                    store.save(edited, target)
+                edit_ms = (time.perf_counter() - start) / edits * 1000
+                if hasattr(store, "close"):
+                    store.close()
+
+        result["backends"][name] = {
+            "full_save_ms": round(save_ms, 3),
+            "full_load_ms": round(load_ms, 3),
+            "edit_save_ms": round(edit_ms, 3),
+            "bytes_on_disk": size,
+            "full_save_peak_bytes": save_peak,
+            "full_load_peak_bytes": load_peak,
+        }
+
+    # 旧 JSON 版の settings.json から既定の保存先（テキスト）への移行
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            legacy = create_store("json")
+
+            def migrate():
+                for leftover in os.listdir(tmp):
+                    os.remove(leftover)
+                legacy.save(data, target)
+                backend = SettingsBackend("text", create_store("text"))
+                backend.load()
+                backend.close()
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                migrate_ms, migrate_peak = _measure(migrate, repeat)
+        finally:
+            os.chdir(cwd)
+    result["json_migration"] = {"ms": round(migrate_ms, 3), "peak_bytes": migrate_peak,
+                                "note": "settings.json の書き出しを含む"}
+    return result
+
+
+def bench_parse(target_lines=100_000, repeat=3):
+    """約 target_lines 行の settings.txt を読み込むスループット"""
+    teams_per_section = 100
+    per_section = TextSettingsEncoder().encode(make_section_data(1, teams_per_section)).count("\n")
+    sections = -(-target_lines // per_section)
+    data = make_section_data(sections, teams_per_section)
+    text = TextSettingsEncoder().encode(data, next(iter(data)))
+    line_count = text.count("\n")
+    size = len(text.encode("utf-8"))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "settings.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with open(path, "r", encoding="utf-8") as f:
+                parsed = parse_settings_text(f)[0]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    teams = sum(len(section['teams']) for section in parsed.values())
+    print(f"parse {line_count} lines ({size / 1024 / 1024:.1f} MiB, {teams} teams): "
+          f"{best * 1000:.0f} ms, {line_count / best / 1000:.0f}k lines/s, {size / best / 1024 / 1024:.1f} MiB/s")
+
+
+def bench_binary_load(sections=26, teams_per_section=100, repeat=3):
+    """settings.txt の全体読み込みと settings.bin の索引＋1セクション読み込みの比較"""
+    from starrai_memo_binary import BinarySettingsStore
+    data = make_section_data(sections, teams_per_section)
+    last = next(iter(data))
+    with tempfile.TemporaryDirectory() as tmp:
+        txt_path = os.path.join(tmp, "settings.txt")
+        bin_path = os.path.join(tmp, "settings.bin")
+        with open(txt_path, "w", encoding="utf-8") as f:
+            f.write(TextSettingsEncoder().encode(data, last))
+        BinarySettingsStore(bin_path).save(data, last)
+
+        def best_of(func):
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - start)
+            return min(times) * 1000
+
+        def load_text():
+            with open(txt_path, "r", encoding="utf-8") as f:
+                parse_settings_text(f)
+
+        def load_binary(all_sections):
+            store = BinarySettingsStore(bin_path)
+            section_data, last_section = store.load()
+            targets = section_data.values() if all_sections else [section_data[last_section]]
+            for raw in targets:
+                raw.decode()
+            store.close()
+
+        print(f"load {sections} sections x {teams_per_section} teams "
+              f"(txt {os.path.getsize(txt_path) / 1024 / 1024:.1f} MiB, "
+              f"bin {os.path.getsize(bin_path) / 1024 / 1024:.1f} MiB)")
+        print(f"  settings.txt (all sections):         {best_of(load_text):8.1f} ms")
+        print(f"  settings.bin (all sections):         {best_of(lambda: load_binary(True)):8.1f} ms")
+        print(f"  settings.bin (index + last section): {best_of(lambda: load_binary(False)):8.1f} ms")
+
+
+def bench_team_rows(count=50, expand=False):
+    """SimpleTeamRow 1行あたりの生成時間とウィジェット数"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    from starrai_memo_model import Team
+    from starrai_memo_text import SimpleTeamRow
+    from starrai_memo_theme import apply_theme
+    apply_theme(app)
+
+    rng = random.Random(0)
+    teams = [Team.from_dict(make_team(rng, i + 1)) for i in range(count)]
+    before = len(app.allWidgets())
+    start = time.perf_counter()
+    rows = [SimpleTeamRow(team) for team in teams]
+    elapsed = time.perf_counter() - start
+    widgets = (len(app.allWidgets()) - before) / count
+    print(f"SimpleTeamRow x{count}: {elapsed / count * 1000:.2f} ms/row, {widgets:.0f} widgets/row")
+
+    if expand:
+        start = time.perf_counter()
+        for row in rows:
+            row.toggle_character_detail(0, True)
+        elapsed = time.perf_counter() - start
+        print(f"toggle_character_detail (first open): {elapsed / count * 1000:.2f} ms/row")
+    for row in rows:
+        row.deleteLater()
+    app.processEvents()
+
+
+def bench_set_all_team_data(counts=(10, 40, 100)):
+    """TeamCompositionWidget.set_all_team_data の所要時間"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    from starrai_memo_model import Section
+    from starrai_memo_scheduler import idle_scheduler
+    from starrai_memo_text import TeamCompositionWidget
+    from starrai_memo_theme import apply_theme
+    apply_theme(app)
+
+    rng = random.Random(0)
+    for count in counts:
+        widget = TeamCompositionWidget(Section("bench"))
+        widget.resize(1200, 800)
+        widget.show()
+        for label in ("first", "again"):
+            teams = [make_team(rng, i + 1) for i in range(count)]
+            start = time.perf_counter()
+            widget.set_all_team_data(teams)
+            blocked = time.perf_counter() - start
+            # 残りの行はアイドル時間に作られる。イベント処理1回あたりの最長時間も測る
+            longest = 0
+            while idle_scheduler().pending(widget):
+                tick = time.perf_counter()
+                app.processEvents()
+                longest = max(longest, time.perf_counter() - tick)
+            app.processEvents()
+            elapsed = time.perf_counter() - start
+            print(f"set_all_team_data({count}, {label}): {elapsed * 1000:.1f} ms "
+                  f"(call {blocked * 1000:.1f} ms, longest slice {longest * 1000:.1f} ms)")
+        widget.deleteLater()
+        app.processEvents()
+
+
+def bench_import_teams(counts=(20, 1000)):
+    """TeamCompositionWidget.import_teams（コピー形式のテキストの取り込み）の所要時間
+
+    検索索引と使用回数の集計にセクションを登録した状態で、通知の処理も含めて測る。
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    import contextlib
+    import io
+    from starrai_memo_model import Section, Team, format_team_line
+    from starrai_memo_scheduler import idle_scheduler
+    from starrai_memo_search import SearchIndex
+    from starrai_memo_stats import UsageStats
+    from starrai_memo_text import TeamCompositionWidget
+
+    rng = random.Random(0)
+    for count in counts:
+        lines = [format_team_line(Team.from_dict(make_team(rng, i + 1))) for i in range(count)]
+        section = Section("bench")
+        indexes = [SearchIndex(), UsageStats()]
+        for index in indexes:
+            index.index_section(section)
+        widget = TeamCompositionWidget(section)
+        widget.resize(1200, 800)
+        widget.show()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            widget.import_teams(lines)
+            blocked = time.perf_counter() - start
+            longest = 0
+            while idle_scheduler().pending((widget, "import")) or idle_scheduler().pending(widget):
+                tick = time.perf_counter()
+                app.processEvents()
+                longest = max(longest, time.perf_counter() - tick)
+            elapsed = time.perf_counter() - start
+        print(f"import_teams({count}): {elapsed * 1000:.1f} ms "
+              f"(call {blocked * 1000:.1f} ms, longest slice {longest * 1000:.1f} ms, {len(section.teams)} teams)")
+        widget.save_timer.stop()
+        widget.deleteLater()
+        for index in indexes:
+            index.close()
+        app.processEvents()
+
+
+def bench_delete_add(count=20, repeat=20):
+    """編成行の削除→追加の繰り返し（1往復あたり）"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    from starrai_memo_model import Section
+    from starrai_memo_scheduler import idle_scheduler
+    from starrai_memo_text import TeamCompositionWidget
+    from starrai_memo_theme import apply_theme
+    apply_theme(app)
+
+    rng = random.Random(0)
+    widget = TeamCompositionWidget(Section("bench"))
+    widget.set_all_team_data([make_team(rng, i + 1) for i in range(count)])
+    idle_scheduler().finish(widget)
+    app.processEvents()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        widget.delete_team_row(widget.team_rows[0].row_id)
+        widget.add_team_row()
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    print(f"delete_team_row + add_team_row: {elapsed / repeat * 1000:.2f} ms")
+    widget.deleteLater()
+    app.processEvents()
+
+
+
+def bench_tab_switch(teams_per_section=(40, 300), repeat=10):
+    """2つのセクション間のタブ切り替え（1回あたり）"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import contextlib
+    import io
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    import starrai_memo_text
+    from starrai_memo_scheduler import idle_scheduler
+
+    cwd = os.getcwd()
+    for teams in teams_per_section:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                data = make_section_data(2, teams)
+                names = list(data)
+                with open("settings.txt", "w", encoding="utf-8") as f:
+                    f.write(TextSettingsEncoder().encode(data, names[0]))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    window = starrai_memo_text.StarRailMemo()
+                    window.show()
+                    for name in names:  # 初回表示（ウィジェット作成）は計測しない
+                        window.change_section_by_name(name)
+                        idle_scheduler().finish(window.section_ui[name]["team_widget"])
+                        app.processEvents()
+                    start = time.perf_counter()
+                    for i in range(repeat):
+                        window.change_section_by_name(names[i % 2])
+                        app.processEvents()
+                    elapsed = time.perf_counter() - start
+                    window.close()
+                    app.processEvents()
+            finally:
+                os.chdir(cwd)
+        print(f"change_section_by_name ({teams} teams): {elapsed / repeat * 1000:.2f} ms")
+
+
+def bench_search(sections=100, teams_per_section=100, repeat=200):
+    """全文検索の索引作成・検索・1編集あたりの索引更新（GUI 不要）"""
+    from starrai_memo_model import sections_from_dict
+    from starrai_memo_search import SearchIndex
+
+    section_data = sections_from_dict(make_section_data(sections, teams_per_section, long_memo=True))
+    index = SearchIndex()
+    start = time.perf_counter()
+    for section in section_data.values():
+        index.index_section(section)
+    print(f"search index: {len(index)} teams, build {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for query in ["カフカ", "銀狼 会心DMG", "ブラックスワン 速度 134", "停止した星盤", "3999", "ホタル 黄泉 氷", "存在しない語"]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            hits = index.search(query)
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        matched = len(index.search(query, limit=None))
+        print(f"  search {query!r}: {elapsed:.3f} ms ({matched} matches, {len(hits)} returned)")
+
+    teams = [team for section in section_data.values() for team in section.teams]
+    start = time.perf_counter()
+    for i in range(repeat):
+        teams[i % len(teams)].set_character_field(0, "memo", f"DoT 編成のローテーション {i}")
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"  memo edit + index update: {elapsed:.3f} ms")
+    index.close()
+
+
+def bench_stats(sections=100, teams_per_section=100, repeat=200):
+    """使用回数の集計の作成・1編集あたりの更新・パネルの再表示（ディスプレイ不要）"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    from starrai_memo_model import sections_from_dict
+    from starrai_memo_stats import UsageStats, UsageStatsPanel
+
+    section_data = sections_from_dict(make_section_data(sections, teams_per_section))
+    stats = UsageStats()
+    start = time.perf_counter()
+    for section in section_data.values():
+        stats.index_section(section)
+    print(f"usage stats: {len(stats)} teams, build {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(0)
+    teams = [team for section in section_data.values() for team in section.teams]
+    edits = {
+        "name": lambda team, i: team.set_character_field(i % 4, "name", rng.choice(NAMES)),
+        "lightcone": lambda team, i: team.set_character_field(i % 4, "lightcone", rng.choice(LIGHTCONES)),
+        "main stat": lambda team, i: team.set_main_stat(i % 4, RELIC_PARTS[i % 4], rng.choice(MAIN_STATS)),
+    }
+    for label, edit in edits.items():
+        start = time.perf_counter()
+        for i in range(repeat):
+            edit(teams[rng.randrange(len(teams))], i)
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        print(f"  {label} edit + stats update: {elapsed:.3f} ms")
+
+    section = next(iter(section_data.values()))
+    start = time.perf_counter()
+    for i in range(repeat):
+        section.set_content(["忘却の庭", "虚構叙事", "末日の幻影"][i % 3])
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"  content change ({teams_per_section} teams): {elapsed:.3f} ms")
+
+    panel = UsageStatsPanel(stats)
+    panel.show()
+    app.processEvents()
+    for content in range(2):
+        panel.content_combo.setCurrentIndex(content)
+        start = time.perf_counter()
+        for _ in range(20):
+            panel.refresh()
+        elapsed = (time.perf_counter() - start) / 20 * 1000
+        print(f"  panel refresh ({panel.content_combo.currentText()}): {elapsed:.2f} ms")
+    panel.close()
+    stats.close()
+    bench_cooccurrence()
+
+
+def bench_cooccurrence(team_counts=(10_000, 40_000), repeat=5):
+    """共起行列の計算（スコアの数値は計算済みの状態で計測）"""
+    import starrai_memo_cooccur
+    if not starrai_memo_cooccur.available():
+        print("cooccurrence: NumPy がないため省略")
+        return
+    from starrai_memo_model import sections_from_dict
+
+    for count in team_counts:
+        section_data = sections_from_dict(make_section_data(count // 100, 100))
+        index = starrai_memo_cooccur.CooccurrenceIndex()
+        for section in section_data.values():
+            index.index_section(section)
+        first = time.perf_counter()
+        index.matrix()
+        first = (time.perf_counter() - first) * 1000
+        start = time.perf_counter()
+        for _ in range(repeat):
+            index._result = None  # 変更があった状態にする
+            index.matrix()
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        print(f"cooccurrence ({count} teams): first {first:.0f} ms, recompute {elapsed:.0f} ms")
+        index.close()
+
+
+def bench_export(sections=100, teams_per_section=100):
+    """保存形式ごとの CSV・JSONL 書き出し（tracemalloc の最大メモリと、全体を読んでから書く場合の比較）"""
+    import contextlib
+    import io
+    from starrai_memo_backends import read_settings, write_settings
+    from starrai_memo_export import export
+
+    data = make_section_data(sections, teams_per_section)
+    last = next(iter(data))
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ("settings.txt", "settings.bin", "settings.db")]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for path in paths:
+                write_settings(path, data, last)
+        del data
+        output = os.path.join(tmp, "export")
+        for path in paths:
+            for fmt in ("csv", "jsonl"):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    with open(output, "w", encoding="utf-8", newline="") as f:
+                        count = export(path, f, fmt)
+                    elapsed = time.perf_counter() - start
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                print(f"export {os.path.basename(path)} -> {fmt}: {elapsed * 1000:.0f} ms, "
+                      f"peak {peak / 1024 / 1024:.1f} MB, {count} rows")
+            # 比較: 全セクションをデコードしてから書き出す場合の最大メモリ
+            with contextlib.redirect_stdout(io.StringIO()):
+                tracemalloc.start()
+                section_data, _ = read_settings(path)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            del section_data
+            print(f"  (read_settings {os.path.basename(path)}: peak {peak / 1024 / 1024:.1f} MB)")
+
+
+def _count_qobjects(app):
+    """トップレベルウィジェット以下の QObject 数"""
+    from PyQt5.QtCore import QObject
+    return sum(1 + len(widget.findChildren(QObject)) for widget in app.topLevelWidgets())
+
+
+def _gui_op(app, func, repeat=1):
+    """func を repeat 回実行（イベント処理を含む）し、1回あたりの ms と QObject の増減を返す"""
+    app.processEvents()
+    before = _count_qobjects(app)
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    return {"ms": round(elapsed, 3), "qobjects_per_op": round((_count_qobjects(app) - before) / repeat, 1)}
+
+
+def bench_gui(sections=10, teams_per_section=10, set_all_counts=(10, 100, 1000), seed=0):
+    """主要な GUI 操作の所要時間と QObject 数（QT_QPA_PLATFORM=offscreen、結果は辞書）"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import contextlib
+    import io
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    import starrai_memo_text
+    from starrai_memo_model import Section
+    from starrai_memo_scheduler import idle_scheduler
+    from starrai_memo_text import StarRailMemo, TeamCompositionWidget
+
+    data = make_section_data(sections, teams_per_section, seed)
+    names = list(data)
+    result = {
+        "dataset": {"sections": sections, "teams_per_section": teams_per_section, "seed": seed},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "qpa": os.environ.get("QT_QPA_PLATFORM")},
+        "operations": {},
+    }
+    ops = result["operations"]
+
+    cwd = os.getcwd()
+    backend = os.environ.get("STARRAI_MEMO_BACKEND")
+    os.environ["STARRAI_MEMO_BACKEND"] = "text"
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with open("settings.txt", "w", encoding="utf-8") as f:
+                f.write(TextSettingsEncoder().encode(data, names[0]))
+            with contextlib.redirect_stdout(io.StringIO()):
+                # 保存ファイルからの起動（最初の描画まで・最初のセクションの編成の表示まで）
+                holder = []
+
+                def start_window(i):
+                    holder.append((time.perf_counter(), StarRailMemo()))
+                    while holder[-1][1].first_frame_at is None:
+                        app.processEvents()
+
+                ops["startup"] = _gui_op(app, start_window)
+                started, window = holder[0]
+                ops["startup (first frame)"] = {"ms": round((window.first_frame_at - started) * 1000, 3)}
+
+                if len(names) > 1:  # 切り替え先のセクションがある場合だけ測る
+                    ops["change_section_by_name (first visit)"] = _gui_op(
+                        app, lambda i: window.change_section_by_name(names[1 + i % (len(names) - 1)]),
+                        repeat=min(5, len(names) - 1))
+                    ops["change_section_by_name (revisit)"] = _gui_op(
+                        app, lambda i: window.change_section_by_name(names[i % 2]), repeat=10)
+                ops["add_section"] = _gui_op(
+                    app, lambda i: window.add_section(f"ベンチ {i + 1}"), repeat=5)
+
+                team_widget = window.section_ui[window.current_section_name()]["team_widget"]
+                ops["add_team_row"] = _gui_op(app, lambda i: team_widget.add_team_row(), repeat=20)
+                row = team_widget.team_rows[0]
+                ops["toggle_character_detail (first open)"] = _gui_op(
+                    app, lambda i: row.toggle_character_detail(i, True), repeat=4)
+                ops["toggle_character_detail (close/reopen)"] = _gui_op(
+                    app, lambda i: row.toggle_character_detail(i % 4, i % 2 == 1), repeat=8)
+
+                rng = random.Random(seed)
+                for count in set_all_counts:
+                    widget = TeamCompositionWidget(Section("bench"))
+                    widget.resize(1200, 800)
+                    widget.show()
+                    teams = [make_team(rng, i + 1) for i in range(count)]
+
+                    def set_all(i):
+                        widget.set_all_team_data(teams)
+                        idle_scheduler().finish(widget)  # アイドル時間に作る行も含める
+
+                    ops[f"set_all_team_data ({count})"] = _gui_op(app, set_all)
+                    # 並び替え・絞り込みは既存の行を並べ替えるだけ（QObject は増えない）
+                    ops[f"sort by score ({count})"] = _gui_op(
+                        app, lambda i: widget.sort_combo.setCurrentIndex(1 + i % 2), repeat=4)
+                    ops[f"filter by score ({count})"] = _gui_op(
+                        app, lambda i: widget.min_score_edit.setText(str(25000 + i * 5000)), repeat=4)
+                    widget.close()
+                    widget.deleteLater()
+                    app.processEvents()
+
+                window.close()
+                app.processEvents()
+        finally:
+            os.chdir(cwd)
+            if backend is None:
+                os.environ.pop("STARRAI_MEMO_BACKEND", None)
+            else:
+                os.environ["STARRAI_MEMO_BACKEND"] = backend
+    result["virtual_row_threshold"] = starrai_memo_text.VIRTUAL_ROW_THRESHOLD
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="スターレイル メモアプリのベンチマーク")
+    parser.add_argument("mode", nargs="?", default="save", choices=["save", "parse", "rows", "storage", "gui", "search", "stats", "export"])
+    parser.add_argument("--sections", type=int, default=10, help="storage/gui: セクション数")
+    parser.add_argument("--teams", type=int, help="storage/gui: 1セクションあたりの編成数（既定 100/10）")
+    parser.add_argument("--seed", type=int, default=0, help="storage/gui: データ生成の乱数シード")
+    parser.add_argument("--output", help="storage/gui: 結果の JSON を書き出すファイル（省略時は標準出力）")
+    args = parser.parse_args()
+
+    if args.mode == "rows":
+        bench_team_rows(expand=True)
+        bench_set_all_team_data()
+        bench_import_teams()
+        bench_delete_add()
+        bench_tab_switch()
+    elif args.mode == "search":
+        bench_search()
+    elif args.mode == "stats":
+        bench_stats()
+    elif args.mode == "export":
+        bench_export()
+    elif args.mode == "parse":
+        bench_parse()
+        bench_binary_load()
+    elif args.mode in ("storage", "gui"):
+        if args.mode == "storage":
+            result = bench_storage(args.sections, args.teams or 100, seed=args.seed)
+        else:
+            result = bench_gui(args.sections, args.teams or 10, seed=args.seed)
+        result = json.dumps(result, ensure_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(result + "\n")
+        else:
+            print(result)
+    else:
+        bench_incremental_save()
+        bench_edit_save()
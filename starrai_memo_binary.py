@@ -0,0 +1,212 @@
+"""索引付きバイナリ設定ファイル（settings.bin）
+
+ファイル先頭の索引に各セクションの位置を記録し、mmap で開いて必要なセクション
+だけをデコードする。起動時は最後に開いていたセクションだけをデコードし、
+他のセクションはタブを初めて開いたときにデコードする。
+
+形式:
+    MAGIC (8バイト) | 索引の長さ (uint32 LE) | 索引 (UTF-8 JSON) | セクション本体...
+    索引: {"version", "last_section", "generation", "sections": [[名前, 位置, 長さ], ...]}
+    セクション本体: 保存形式の辞書（content・phase・teams）の UTF-8 JSON。
+    位置はセクション本体の先頭（索引の直後）からのオフセット。
+
+他の形式との変換は starrai_memo_backends.py を使う。
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+
+BINARY_SETTINGS_PATH = "settings.bin"
+MAGIC = b"SRMEMOB1"
+BINARY_VERSION = 1
+_HEADER = struct.Struct("<8sI")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class RawSection:
+    """未デコードのセクション（settings.bin 内の位置）
+
+    保存時に書き換えなかったセクションは、デコードせずにバイト列のまま
+    新しいファイルへ写す。位置は保存のたびにストアが更新する。
+    """
+    __slots__ = ("store", "offset", "length")
+
+    def __init__(self, store, offset, length):
+        self.store = store
+        self.offset = offset
+        self.length = length
+
+    def decode(self, baseline=True):
+        """セクションの保存形式の辞書を返す（差分の基準は持たないので baseline は使わない）"""
+        return json.loads(self.store.read_payload(self))
+
+
+class _SectionPayload:
+    """エンコード済みセクションのキャッシュ（編成は辞書の同一性で判定）"""
+    __slots__ = ("content", "phase", "teams", "team_payloads", "payload")
+
+    def __init__(self, content, phase, teams, team_payloads, payload):
+        self.content = content
+        self.phase = phase
+        self.teams = teams
+        self.team_payloads = team_payloads
+        self.payload = payload
+
+    def matches(self, content, phase, teams):
+        if self.content != content or self.phase != phase or len(self.teams) != len(teams):
+            return False
+        return all(a is b for a, b in zip(self.teams, teams))
+
+
+class BinarySettingsStore:
+    """settings.bin の読み込み・保存（TextSettingsStore と同じく SettingsWriter から使う）
+
+    load は索引だけを読み、各セクションを RawSection として返す。保存は毎回
+    ファイル全体を一時ファイルに書き出して os.replace で差し替えるが、未変更の
+    セクション・編成はエンコード済みのバイト列を使い回す。
+    """
+
+    def __init__(self, path=BINARY_SETTINGS_PATH):
+        self.path = path
+        self.generation = None  # 未保存の場合は None
+        self._lock = threading.Lock()  # mmap の差し替えと RawSection の読み出しを排他する
+        self._file = None
+        self._mm = None
+        self._base = 0
+        self._cache = {}  # セクション名 -> _SectionPayload
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self, read_only=False):
+        """索引を読み込み (section_data, last_section) を返す（値は未デコードの RawSection）
+
+        読み込みではファイルに書き込まないので、read_only は他のストアと揃えるための引数。
+        """
+        with self._lock:
+            index = self._open()
+        self.generation = index.get("generation", 0)
+        section_data = {
+            name: RawSection(self, offset, length)
+            for name, offset, length in index["sections"]
+        }
+        return section_data, index.get("last_section")
+
+    def read_payload(self, raw):
+        """RawSection のバイト列を読み出す"""
+        with self._lock:
+            start = self._base + raw.offset
+            return self._mm[start:start + raw.length]
+
+    def save(self, section_data, last_section):
+        """全セクションを書き出す（変更のないセクションはデコードせずに写す）"""
+        generation = (self.generation or 0) + 1
+        names = [name for name in section_data if not name.startswith('_')]
+
+        payloads = []
+        moved = []  # (RawSection, 新しい位置の添字)
+        with self._lock:
+            for name in names:
+                section = section_data[name]
+                if isinstance(section, RawSection) and section.store is self and self._mm is not None:
+                    start = self._base + section.offset
+                    payloads.append(self._mm[start:start + section.length])
+                    moved.append((section, len(payloads) - 1))
+                else:
+                    if not isinstance(section, dict):
+                        section = section.decode()  # 他のファイル・形式の未デコードのセクション
+                    payloads.append(self._encode_section(name, section))
+
+        entries = []
+        offset = 0
+        for name, payload in zip(names, payloads):
+            entries.append([name, offset, len(payload)])
+            offset += len(payload)
+        index = _dumps({
+            "version": BINARY_VERSION,
+            "last_section": last_section,
+            "generation": generation,
+            "sections": entries,
+        })
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(index)))
+            f.write(index)
+            for payload in payloads:
+                f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        with self._lock:
+            self._close()  # Windows では開いたままのファイルを置き換えられない
+            os.replace(tmp_path, self.path)
+            self._open()
+            for raw, i in moved:
+                raw.offset, raw.length = entries[i][1], entries[i][2]
+        self.generation = generation
+
+        # 削除・改名されたセクションのキャッシュを破棄
+        if len(self._cache) > len(names):
+            live = set(names)
+            for name in [n for n in self._cache if n not in live]:
+                del self._cache[name]
+
+    # 畳み込むジャーナルはないので保存と同じ
+    compact = save
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _encode_section(self, name, section):
+        content = section.get("content")
+        phase = section.get("phase")
+        teams = section.get("teams", [])
+
+        cached = self._cache.get(name)
+        if cached is not None and cached.matches(content, phase, teams):
+            return cached.payload
+
+        previous = {}
+        if cached is not None:
+            previous = {id(team): payload for team, payload in zip(cached.teams, cached.team_payloads)}
+        team_payloads = [previous.get(id(team)) or _dumps(team) for team in teams]
+        payload = b"".join([
+            b'{"content":', _dumps(content),
+            b',"phase":', _dumps(phase),
+            b',"teams":[', b",".join(team_payloads), b"]}",
+        ])
+        self._cache[name] = _SectionPayload(content, phase, tuple(teams), team_payloads, payload)
+        return payload
+
+    def _open(self):
+        """ファイルを mmap で開き、索引を返す（ロックを取ってから呼ぶ）"""
+        self._close()
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_length = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"settings.bin の形式ではありません: {self.path}")
+            start = _HEADER.size
+            index = json.loads(self._mm[start:start + index_length])
+        except Exception:
+            self._close()
+            raise
+        self._base = start + index_length
+        return index
+
+    def _close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
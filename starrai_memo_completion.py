@@ -0,0 +1,199 @@
+"""キャラクター名・光円錐名の入力補完
+
+全セクションで使われている名前と、あればカタログ（starrai_memo_catalog.json）の
+名前をトライに登録し、入力中の文字列で前方一致検索する。トライはモデルの
+変更通知で差分だけ更新する（入力途中の文字列は、確定して別の文字列に
+変わった時点で使用回数が0になり取り除かれる）。
+
+QCompleter と候補のモデルは種類（name・lightcone）ごとに1つだけ作り、
+入力中の QLineEdit に付け替えて全行で共有する。
+"""
+import json
+import os
+import unicodedata
+
+from PyQt5.QtCore import QStringListModel, Qt
+from PyQt5.QtWidgets import QCompleter
+
+from starrai_memo_model import TeamIndex
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "starrai_memo_catalog.json")
+CATALOG_KEYS = {"name": "characters", "lightcone": "lightcones"}  # 種類 -> カタログのキー
+COMPLETION_LIMIT = 20  # 候補の最大表示数
+
+
+def _key(word):
+    """トライのキー（全角英数字を半角に、英字を小文字に）"""
+    return unicodedata.normalize("NFKC", word).lower()
+
+
+class PrefixTrie:
+    """前方一致検索用のトライ（語ごとに使用回数を持つ）
+
+    使用回数が0になった語は取り除く。pin した語（カタログ）は使用回数が
+    0でも残し、候補では使用回数の多い語の後ろに並べる。
+    """
+
+    def __init__(self):
+        self._root = {}
+        self._counts = {}  # 語 -> 使用回数
+        self._pinned = set()
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, word):
+        return word in self._counts
+
+    def add(self, word, count=1):
+        if not word:
+            return
+        if word not in self._counts:
+            node = self._root
+            for char in _key(word):
+                node = node.setdefault(char, {})
+            node.setdefault(None, set()).add(word)  # None: この位置で終わる語
+            self._counts[word] = 0
+        self._counts[word] += count
+
+    def pin(self, word):
+        """使用回数が0でも残す語を登録"""
+        if word:
+            self._pinned.add(word)
+            self.add(word, 0)
+
+    def remove(self, word, count=1):
+        current = self._counts.get(word)
+        if current is None:
+            return
+        current -= count
+        if current > 0 or word in self._pinned:
+            self._counts[word] = max(current, 0)
+            return
+        del self._counts[word]
+        # 語を取り除き、空になった節点を末端から削除する
+        path = [self._root]
+        for char in _key(word):
+            path.append(path[-1][char])
+        ends = path[-1][None]
+        ends.discard(word)
+        if not ends:
+            del path[-1][None]
+        for depth in range(len(path) - 1, 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][_key(word)[depth - 1]]
+
+    def count(self, word):
+        return self._counts.get(word, 0)
+
+    def complete(self, prefix, limit=COMPLETION_LIMIT):
+        """prefix で始まる語を使用回数の多い順に最大 limit 件"""
+        node = self._root
+        for char in _key(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        words = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for char, child in node.items():
+                if char is None:
+                    words.extend(child)
+                else:
+                    stack.append(child)
+        words.sort(key=lambda word: (-self._counts[word], word))
+        return words[:limit]
+
+
+def load_catalog(path=CATALOG_PATH):
+    """カタログ（{"characters": [...], "lightcones": [...]}）を読み込む（なければ空）"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"カタログ読み込みエラー（{path}）: {e}")
+        return {}
+
+
+class CompletionIndex(TeamIndex):
+    """全セクションのキャラクター名・光円錐名のトライと、共有の QCompleter"""
+
+    def __init__(self, catalog=None):
+        super().__init__()
+        self.tries = {kind: PrefixTrie() for kind in CATALOG_KEYS}
+        if catalog is None:
+            catalog = load_catalog()
+        for kind, key in CATALOG_KEYS.items():
+            for word in catalog.get(key, []):
+                self.tries[kind].pin(word)
+        self._teams = set()  # 名前を数えた編成
+        self.models = {}
+        self.completers = {}
+
+    # TeamIndex
+    def add_team(self, section, team):
+        self._teams.add(team)
+        for char in team.characters:
+            for kind, trie in self.tries.items():
+                trie.add(getattr(char, kind))
+
+    def remove_team(self, team):
+        if team not in self._teams:
+            return
+        self._teams.discard(team)
+        for char in team.characters:
+            for kind, trie in self.tries.items():
+                trie.remove(getattr(char, kind))
+
+    def team_changed(self, team, index, key, old, new):
+        # 未登録のセクションの編成は、セクションを登録するときに最新の名前を数える
+        trie = self.tries.get(key)
+        if trie is not None and team in self._teams:
+            trie.remove(old)
+            trie.add(new)
+
+    def attach(self, edit, kind):
+        """QLineEdit で入力するたびに共有の補完候補を表示する"""
+        edit.textEdited.connect(lambda text, e=edit: self.show_completions(e, kind, text))
+
+    def completer(self, kind):
+        """種類ごとに1つの QCompleter（最初に必要になったときに作る）"""
+        completer = self.completers.get(kind)
+        if completer is None:
+            model = self.models[kind] = QStringListModel()
+            completer = self.completers[kind] = QCompleter(model)
+            completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+            completer.setCaseSensitivity(Qt.CaseInsensitive)
+            completer.activated[str].connect(lambda text, c=completer: self._insert(c, text))
+        return completer
+
+    def show_completions(self, edit, kind, text):
+        completer = self.completer(kind)
+        words = [word for word in self.tries[kind].complete(text) if word != text] if text else []
+        self.models[kind].setStringList(words)
+        if not words:
+            completer.popup().hide()
+            return
+        if completer.widget() is not edit:
+            completer.setWidget(edit)
+        completer.complete()
+
+    def _insert(self, completer, text):
+        edit = completer.widget()
+        if edit is not None:
+            edit.setText(text)  # textChanged でモデルに反映される
+
+
+_index = None
+
+
+def completion_index():
+    """アプリ全体で共有する補完の索引（QApplication の作成後に呼ぶ）"""
+    global _index
+    if _index is None:
+        _index = CompletionIndex()
+    return _index
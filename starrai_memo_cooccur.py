@@ -0,0 +1,150 @@
+"""キャラクター × キャラクターの共起行列（同じ編成で一緒に使われた回数）
+
+全セクションの編成のキャラクター名を整数の ID に置き換えて (編成数, 4) の
+配列にし、NumPy の bincount で組み合わせごとの編成数とスコアの合計を数える
+（対角成分はそのキャラクターを使った編成数）。同じ編成に同じ名前が2人いても
+1回と数える。
+
+行列はモデルの変更通知で「古くなった」印を付けるだけで、次に matrix() を
+呼んだときに作り直す。NumPy がない環境では available() が False を返す。
+NumPy は起動を遅くしないように、初めて行列を作るときに読み込む。
+"""
+import csv
+import importlib.util
+
+from starrai_memo_model import TEAM_SIZE, TeamIndex
+
+
+def available():
+    """NumPy があるか（読み込まずに調べる）"""
+    return importlib.util.find_spec("numpy") is not None
+
+
+def _numpy():
+    import numpy  # NumPy は共起行列でだけ使う
+    return numpy
+
+
+class Cooccurrence:
+    """共起行列の計算結果
+
+    names[i] が行・列 i のキャラクター。counts[i, j] は i と j を両方使った編成数、
+    mean_scores[i, j] はそのうちスコアが数値の編成の平均スコア（なければ NaN）。
+    """
+
+    def __init__(self, names, counts, score_sums, score_counts):
+        self.names = names
+        self.counts = counts
+        self.score_counts = score_counts
+        np = _numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean_scores = score_sums / score_counts  # 0 / 0 は NaN
+
+    def __len__(self):
+        return len(self.names)
+
+    def top_pairs(self, limit=30):
+        """一緒に使われた回数の多い組み合わせ [(名前, 名前, 回数, 平均スコア), ...]"""
+        np = _numpy()
+        rows, cols = np.triu_indices(len(self.names), k=1)
+        pair_counts = self.counts[rows, cols]
+        order = np.argsort(-pair_counts, kind="stable")[:limit]
+        return [
+            (self.names[rows[i]], self.names[cols[i]], int(pair_counts[i]), float(self.mean_scores[rows[i], cols[i]]))
+            for i in order if pair_counts[i] > 0
+        ]
+
+    def write_csv(self, f, scores=False):
+        """行列を CSV で1行ずつ書き出す（scores=True では平均スコア、空欄は該当なし）"""
+        writer = csv.writer(f)
+        writer.writerow([""] + self.names)
+        np = _numpy()
+        values = self.mean_scores if scores else self.counts
+        for name, row in zip(self.names, values):
+            if scores:
+                writer.writerow([name] + ["" if np.isnan(v) else f"{v:.1f}" for v in row])
+            else:
+                writer.writerow([name] + row.tolist())
+
+
+def compute(teams):
+    """編成のリストから Cooccurrence を作る"""
+    np = _numpy()
+    ids = {}
+    members = np.full((len(teams), TEAM_SIZE), -1, dtype=np.int64)
+    scores = np.full(len(teams), np.nan)
+    for row, team in enumerate(teams):
+        for col, char in enumerate(team.characters[:TEAM_SIZE]):
+            name = char.name.strip()
+            if name:
+                members[row, col] = ids.setdefault(name, len(ids))
+        score = team.score_value
+        if score is not None:
+            scores[row] = score
+
+    # 同じ編成内の重複した名前は1人分だけ残す
+    members.sort(axis=1)
+    members[:, 1:][members[:, 1:] == members[:, :-1]] = -1
+
+    # 列の組み合わせ (a, b) ごとに「行の ID * n + 列の ID」を数える（a == b は対角成分）
+    n = len(ids)
+    size = n * n
+    counts = np.zeros(size, dtype=np.int64)
+    score_sums = np.zeros(size)
+    score_counts = np.zeros(size, dtype=np.int64)
+    scored = ~np.isnan(scores)
+    for a in range(TEAM_SIZE):
+        for b in range(TEAM_SIZE):
+            valid = (members[:, a] >= 0) & (members[:, b] >= 0)
+            cells = members[valid, a] * n + members[valid, b]
+            counts += np.bincount(cells, minlength=size)
+            valid &= scored
+            cells = members[valid, a] * n + members[valid, b]
+            score_sums += np.bincount(cells, scores[valid], minlength=size)
+            score_counts += np.bincount(cells, minlength=size)
+
+    # 名前順に並べ替える（ID は編成を読んだ順なので実行ごとに変わりうる）
+    names = sorted(ids)
+    order = np.array([ids[name] for name in names], dtype=np.int64)
+    grid = np.ix_(order, order)
+    return Cooccurrence(names, counts.reshape(n, n)[grid], score_sums.reshape(n, n)[grid],
+                        score_counts.reshape(n, n)[grid])
+
+
+class CooccurrenceIndex(TeamIndex):
+    """登録済みセクションの共起行列（編成・名前・スコアが変わったら次の matrix() で作り直す）
+
+    on_change に関数を設定すると、計算済みの行列が古くなったときに引数なしで呼ぶ。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._result = None  # 作り直すまでは None
+        self.on_change = None
+
+    def _invalidate(self):
+        if self._result is not None:
+            self._result = None
+            if self.on_change is not None:
+                self.on_change()
+
+    def add_team(self, section, team):
+        self._invalidate()
+
+    def remove_team(self, team):
+        self._invalidate()
+
+    def team_changed(self, team, index, key, old, new):
+        if key in ("name", "score"):
+            self._invalidate()
+
+    @property
+    def stale(self):
+        return self._result is None
+
+    def matrix(self):
+        """最新の Cooccurrence（変更がなければ前回の結果を返す）"""
+        if self._result is None:
+            teams = [team for section in self._sections for team in section.teams]
+            self._result = compute(teams)
+        return self._result
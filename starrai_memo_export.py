@@ -0,0 +1,148 @@
+"""保存ファイルの全セクション・編成・キャラクターを CSV・JSON Lines に書き出す
+
+ウィジェットは作らず、保存ファイルをストア（starrai_memo_backends）で直接開く。
+セクションは iter_settings で1件ずつデコードし、ジェネレーターで
+    セクション -> 編成 -> 行（CSV: キャラクター1人1行 / JSONL: 編成1件1行）
+と流して1行ずつ書き出すので、全体をメモリ上に組み立てない。名前が空の枠は
+書き出さない（CSV ではキャラクターのいない編成もキャラクターの列を空欄にした
+1行にする）。
+
+使い方（形式は出力の拡張子、"-" は標準出力で --format を指定）:
+    python starrai_memo_export.py export.csv
+    python starrai_memo_export.py export.jsonl --input settings.bin
+    python starrai_memo_export.py - --format jsonl
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+
+from starrai_memo_backends import BACKENDS, iter_settings, selected_backend_name
+from starrai_memo_model import CHARACTER_DEFAULTS, parse_score
+from starrai_memo_storage import RELIC_PARTS
+
+FORMATS = ("csv", "jsonl")
+TEAM_COLUMNS = ["section", "content", "phase", "team", "row_id", "score", "score_value"]
+CHARACTER_COLUMNS = ["slot", "name", "eidolon", "superimpose", "level", "lightcone"]
+CSV_COLUMNS = TEAM_COLUMNS + CHARACTER_COLUMNS + [f"main_{part}" for part in RELIC_PARTS] + ["memo"]
+
+
+def iter_teams(sections):
+    """セクションから (セクション名, セクションの辞書, 何番目か, 編成の辞書) を返す"""
+    for name, section in sections:
+        for number, team in enumerate(section.get("teams", []), 1):
+            yield name, section, number, team
+
+
+def _team_fields(name, section, number, team):
+    score = team.get("score", "")
+    return {
+        "section": name,
+        "content": section.get("content") or "",
+        "phase": section.get("phase") or "",
+        "team": number,
+        "row_id": team.get("row_id"),
+        "score": score,
+        "score_value": parse_score(score),
+    }
+
+
+def _characters(team):
+    """名前が入力されたキャラクターを (枠番号, 辞書) で返す"""
+    for slot, char in enumerate(team.get("characters", []), 1):
+        if str(char.get("name", "")).strip():
+            yield slot, char
+
+
+def character_rows(teams):
+    """CSV 用: キャラクター1人につき1行（編成・セクションの列を繰り返す）
+
+    キャラクターのいない編成も、キャラクターの列を空欄にして1行書き出す。
+    """
+    for name, section, number, team in teams:
+        fields = _team_fields(name, section, number, team)
+        empty = True
+        for slot, char in _characters(team):
+            empty = False
+            row = dict(fields, slot=slot)
+            for key in CHARACTER_COLUMNS[1:] + ["memo"]:
+                row[key] = char.get(key, CHARACTER_DEFAULTS[key])
+            main_stats = char.get("main_stats", {})
+            for part in RELIC_PARTS:
+                row[f"main_{part}"] = main_stats.get(part, "")
+            yield row
+        if empty:
+            yield fields  # 足りない列は DictWriter が空欄にする
+
+
+def team_records(teams):
+    """JSONL 用: 編成1件につき1つの辞書（キャラクターはリスト）"""
+    for name, section, number, team in teams:
+        record = _team_fields(name, section, number, team)
+        record["characters"] = [
+            dict({key: char.get(key, CHARACTER_DEFAULTS[key]) for key in CHARACTER_COLUMNS[1:] + ["memo"]},
+                 slot=slot, main_stats=char.get("main_stats", {}))
+            for slot, char in _characters(team)
+        ]
+        yield record
+
+
+def write_csv(rows, f):
+    """行を1行ずつ CSV に書き出し、書いた行数を返す"""
+    writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(records, f):
+    """辞書を1行ずつ JSON Lines に書き出し、書いた行数を返す"""
+    count = 0
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def export(path, f, fmt):
+    """保存ファイル path の全編成を f に書き出す（fmt は "csv" か "jsonl"）"""
+    teams = iter_teams(iter_settings(path))
+    if fmt == "csv":
+        return write_csv(character_rows(teams), f)
+    return write_jsonl(team_records(teams), f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="保存ファイルを CSV・JSON Lines に書き出す")
+    parser.add_argument("output", help="出力ファイル（.csv / .jsonl、- は標準出力）")
+    parser.add_argument("--input", help="保存ファイル（省略時はアプリと同じ保存先）")
+    parser.add_argument("--format", choices=FORMATS, help="出力形式（省略時は出力の拡張子から判定）")
+    args = parser.parse_args(argv)
+
+    path = args.input or BACKENDS[selected_backend_name()][2]
+    if not os.path.exists(path):
+        print(f"保存ファイルが見つかりません: {path}", file=sys.stderr)
+        return 1
+    fmt = args.format or ("jsonl" if args.output.lower().endswith((".jsonl", ".ndjson")) else "csv")
+
+    if args.output == "-":
+        # 読み込み時のメッセージは標準エラーへ回し、標準出力には書き出す内容だけを出す
+        out = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            count = export(path, out, fmt)
+    else:
+        # CSV は Excel で文字化けしないように BOM を付ける
+        encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+        with open(args.output, "w", encoding=encoding, newline="") as f:
+            count = export(path, f, fmt)
+    print(f"{path} -> {args.output}: {count}行", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
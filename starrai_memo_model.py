@@ -0,0 +1,405 @@
+"""編成データのモデル（ウィジェットに依存しない）
+
+ウィジェットは変更シグナルでモデルをその場で更新し、保存・コピー・
+タブ切り替えはウィジェットを辿らずにモデルを直接読む。検索索引などの
+派生データは ModelListener を add_listener で登録し、変更の通知を受けて
+差分だけを更新する。
+"""
+import re
+import unicodedata
+
+from starrai_memo_storage import RELIC_PARTS
+
+CHARACTER_FIELDS = ("name", "eidolon", "superimpose", "level", "lightcone", "memo", "detail_shown")
+CHARACTER_DEFAULTS = {
+    "name": "",
+    "eidolon": 0,
+    "superimpose": 1,
+    "level": 80,
+    "lightcone": "",
+    "memo": "",
+    "detail_shown": False,
+}
+DEFAULT_MAIN_STAT = "HP%"
+TEAM_SIZE = 4
+SCORE_UNITS = {"万": 10000, "k": 1000}  # スコアの数値の後ろに付く単位
+
+_THOUSANDS = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+_SCORE_NUMBER = re.compile(r"(\d+(?:\.\d+)?)(?:\s*(万|k))?")
+_UNPARSED = object()  # Team のスコアの数値が未計算
+_TEAM_LINE_CHARACTER = re.compile(r"^(.+?)(?:\s+E(\d+))?(?:\s+S(\d+))?$")
+SCORE_SEPARATOR = " - スコア: "
+_TEAM_LINE_DELIMITERS = (":", "：", "/", "／")  # 編成の行のキャラクター名に含まれない文字
+
+_listeners = []
+
+
+class ModelListener:
+    """モデルの変更通知を受け取る側の基底クラス（必要なメソッドだけ上書きする）"""
+
+    def team_changed(self, team, index, key, old, new):
+        """編成の入力が変わった（score の場合 index は None、メイン効果は key="main_stats" で辞書の写し）"""
+
+    def teams_changed(self, section, added, removed):
+        """セクションの編成が追加・削除・入れ替えされた（added・removed は Team のリスト）"""
+
+    def section_changed(self, section, key, old, new):
+        """セクションの content・phase が変わった"""
+
+
+def add_listener(listener):
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+class TeamIndex(ModelListener):
+    """全セクションの編成から作る派生データ（検索索引など）の基底クラス
+
+    サブクラスは add_team・remove_team（と必要なら team_changed）を実装する。
+    セクションの登録（build・index_section）と、登録済みセクションの編成の
+    追加・削除の通知の振り分けはここで行う。使い終わったら close を呼ぶ。
+    """
+
+    def __init__(self):
+        self._sections = set()  # 登録済みのセクション
+        add_listener(self)
+
+    def close(self):
+        remove_listener(self)
+
+    def build(self, section_data):
+        """section_data（名前 -> Section）の未登録のセクションを1件ずつ登録するジェネレーター
+
+        idle_scheduler で少しずつ進める。途中で削除されたセクションは登録しない。
+        """
+        for section in list(section_data.values()):
+            if section not in self._sections and section_data.get(section.name) is section:
+                self.index_section(section)
+                yield
+
+    def index_section(self, section):
+        """セクションの全編成を登録（未読み込みのセクションはここで読み込まれる）"""
+        if section in self._sections:
+            return
+        self._sections.add(section)
+        for team in section.teams:
+            self.add_team(section, team)
+
+    def remove_section(self, section):
+        if section in self._sections:
+            self._sections.discard(section)
+            for team in section.teams:
+                self.remove_team(team)
+
+    def add_team(self, section, team):
+        raise NotImplementedError
+
+    def remove_team(self, team):
+        raise NotImplementedError
+
+    def teams_changed(self, section, added, removed):
+        if section not in self._sections:
+            return  # 未登録のセクションは build で登録するときに最新の編成を読む
+        for team in removed:
+            self.remove_team(team)
+        for team in added:
+            self.add_team(section, team)
+
+
+def parse_score(text):
+    """自由入力のスコアを数値にする（数値がなければ None）
+
+    全角数字・桁区切りのカンマ・「万」「k」の単位に対応する。★に直接隣り合う
+    数字は星の数として除き（★の両側に数字があれば小さい方）、残りの数字が
+    複数ある場合は最も大きいものをスコアとする。
+        "38,500" -> 38500、"3★ 34000" -> 34000、"35000★3" -> 35000、"3.4万" -> 34000
+    """
+    if not text:
+        return None
+    text = _THOUSANDS.sub("", unicodedata.normalize("NFKC", text).lower().replace("☆", "★"))
+    numbers = [(m.start(), m.end(), float(m.group(1)) * SCORE_UNITS.get(m.group(2), 1))
+               for m in _SCORE_NUMBER.finditer(text)]
+    stars = set()  # 星の数とみなした数字の添字
+    for i, (start, end, value) in enumerate(numbers):
+        if text.startswith("★", end):
+            # 後ろの★の反対側にも数字があれば、小さい方を星の数とする
+            after = i + 1 if i + 1 < len(numbers) and numbers[i + 1][0] == end + 1 else None
+            stars.add(after if after is not None and numbers[after][2] < value else i)
+        if start > 0 and text[start - 1] == "★" and not (i > 0 and numbers[i - 1][1] == start - 1):
+            stars.add(i)
+    best = None
+    for i, (_, _, value) in enumerate(numbers):
+        if i not in stars and (best is None or value > best):
+            best = value
+    if best is not None and best.is_integer():
+        best = int(best)
+    return best
+
+
+class Character:
+    """キャラクター1人分のデータ"""
+    __slots__ = CHARACTER_FIELDS + ("main_stats",)
+
+    def __init__(self, data=None):
+        data = data or {}
+        for key in CHARACTER_FIELDS:
+            setattr(self, key, data.get(key, CHARACTER_DEFAULTS[key]))
+        main_stats = data.get("main_stats", {})
+        self.main_stats = {part: main_stats.get(part, DEFAULT_MAIN_STAT) for part in RELIC_PARTS}
+
+    def to_dict(self):
+        data = {key: getattr(self, key) for key in CHARACTER_FIELDS}
+        data["main_stats"] = dict(self.main_stats)
+        return data
+
+
+class Team:
+    """編成1件分のデータ"""
+
+    def __init__(self, row_id, score="", characters=None):
+        self.row_id = row_id
+        self.score = score
+        self.characters = list(characters or [])
+        while len(self.characters) < TEAM_SIZE:
+            self.characters.append(Character())
+        self.version = 0  # 変更のたびに増える
+        self._dict = None  # to_dict のキャッシュ
+        self._score_value = _UNPARSED  # score_value のキャッシュ
+
+    @classmethod
+    def from_dict(cls, data, row_id=None):
+        return cls(
+            row_id if row_id is not None else data.get("row_id", 1),
+            data.get("score", ""),
+            [Character(char) for char in data.get("characters", [])],
+        )
+
+    @property
+    def score_value(self):
+        """スコアの数値（parse_score の結果をスコアが変わるまで使い回す）"""
+        if self._score_value is _UNPARSED:
+            self._score_value = parse_score(self.score)
+        return self._score_value
+
+    def set_score(self, score):
+        if self.score != score:
+            old, self.score = self.score, score
+            self._score_value = _UNPARSED
+            self._changed(None, "score", old, score)
+
+    def set_character_field(self, index, key, value):
+        char = self.characters[index]
+        old = getattr(char, key)
+        if old != value:
+            setattr(char, key, value)
+            self._changed(index, key, old, value)
+
+    def set_main_stat(self, index, part, value):
+        main_stats = self.characters[index].main_stats
+        if main_stats.get(part) != value:
+            old = dict(main_stats)
+            main_stats[part] = value
+            self._changed(index, "main_stats", old, dict(main_stats))
+
+    def to_dict(self):
+        """保存用の辞書（変更がない間は同じ辞書を返す）"""
+        if self._dict is None:
+            self._dict = {
+                "row_id": self.row_id,
+                "score": self.score,
+                "characters": [char.to_dict() for char in self.characters],
+            }
+        return self._dict
+
+    def _changed(self, index, key, old, new):
+        self.version += 1
+        self._dict = None
+        for listener in _listeners:
+            listener.team_changed(self, index, key, old, new)
+
+
+class Section:
+    """セクション（タブ）1件分のデータ
+
+    generation は編成の追加・削除・入れ替えのたびに増える。編成の中身の入力は
+    行ウィジェットがモデルに書き込むものなので数えない（表示側は常に一致している）。
+    """
+
+    def __init__(self, name, content=None, phase=None, teams=None):
+        self.name = name
+        self.content = content
+        self.phase = phase
+        self.teams = list(teams or [])
+        self.next_row_id = max((team.row_id for team in self.teams), default=0) + 1
+        self.generation = 0
+        self._raw = None  # 未デコードの保存データ（lazy で作成した場合）
+
+    @classmethod
+    def from_dict(cls, name, data):
+        return cls(
+            name,
+            data.get("content"),
+            data.get("phase"),
+            [Team.from_dict(team) for team in data.get("teams", [])],
+        )
+
+    @classmethod
+    def lazy(cls, name, raw):
+        """未デコードのセクション（中身に初めて触れたときに raw.decode() する）"""
+        section = cls.__new__(cls)
+        section.name = name
+        section._raw = raw
+        return section
+
+    @property
+    def loaded(self):
+        return self._raw is None
+
+    def __getattr__(self, key):
+        # lazy で作成したセクションの content・teams などは初回アクセス時にデコード
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise AttributeError(key)
+        loaded = Section.from_dict(self.name, raw.decode())
+        self.__dict__.update(loaded.__dict__)
+        return getattr(self, key)
+
+    def set_content(self, content):
+        self._set_field("content", content)
+
+    def set_phase(self, phase):
+        self._set_field("phase", phase)
+
+    def _set_field(self, key, value):
+        old = getattr(self, key)
+        if old != value:
+            setattr(self, key, value)
+            for listener in _listeners:
+                listener.section_changed(self, key, old, value)
+
+    def new_team(self):
+        """空の編成を末尾に追加"""
+        team = Team(self.next_row_id)
+        self.add_team(team)
+        return team
+
+    def add_team(self, team):
+        self.next_row_id = max(self.next_row_id, team.row_id + 1)
+        self.teams.append(team)
+        self.generation += 1
+        self._teams_changed([team], [])
+
+    def add_teams(self, teams):
+        """複数の編成を末尾に追加（変更の通知は1回にまとめる）"""
+        if not teams:
+            return
+        self.next_row_id = max([self.next_row_id] + [team.row_id + 1 for team in teams])
+        self.teams.extend(teams)
+        self.generation += 1
+        self._teams_changed(list(teams), [])
+
+    def remove_team(self, row_id):
+        """row_id の編成を削除（削除した編成を返す）"""
+        for i, team in enumerate(self.teams):
+            if team.row_id == row_id:
+                self.generation += 1
+                removed = self.teams.pop(i)
+                self._teams_changed([], [removed])
+                return removed
+        return None
+
+    def set_teams(self, teams):
+        removed = self.teams
+        self.teams = list(teams)
+        self.next_row_id = max([self.next_row_id] + [team.row_id + 1 for team in self.teams])
+        self.generation += 1
+        self._teams_changed(self.teams, removed)
+
+    def _teams_changed(self, added, removed):
+        for listener in _listeners:
+            listener.teams_changed(self, added, removed)
+
+    def to_dict(self):
+        """保存用のスナップショット（未変更の編成は前回と同じ辞書、未デコードならそのまま）"""
+        if self._raw is not None:
+            return self._raw
+        return {
+            "content": self.content,
+            "phase": self.phase,
+            "teams": [team.to_dict() for team in self.teams],
+        }
+
+
+def format_team_line(team):
+    """編成を1行のテキストにする（例: "カフカ E0 S1 / 銀狼 E2 S1 - スコア: 35000"）
+
+    名前が入力されていない編成は空文字列を返す。
+    """
+    char_parts = [
+        f"{char.name.strip()} E{char.eidolon} S{char.superimpose}"
+        for char in team.characters if char.name.strip()
+    ]
+    if not char_parts:
+        return ""
+    line = " / ".join(char_parts)
+    if team.score.strip():
+        line += f"{SCORE_SEPARATOR}{team.score}"
+    return line
+
+
+def parse_team_line(line):
+    """format_team_line の1行を編成の辞書にする（編成の行でなければ None）
+
+    "カフカ E0 S1 / 銀狼 E2 S1 - スコア: 35000" -> {"score": "35000", "characters": [...]}
+    E・S が省略されたキャラクターは既定値（E0・S1）にする。ただし普通の文章を
+    編成として取り込まないように、E・S かスコアの区切りが1つもない行や、
+    空のキャラクター・区切り文字（: や /）を含む名前がある行は None にする。
+    """
+    names, separator, score = line.strip().partition(SCORE_SEPARATOR.strip())
+    score = score.strip() if separator else ""
+    characters = []
+    marked = bool(separator)
+    for part in names.split(" / "):
+        match = _TEAM_LINE_CHARACTER.match(part.strip())
+        if match is None:
+            return None  # 空のキャラクター
+        name, eidolon, superimpose = match.groups()
+        if any(c in name for c in _TEAM_LINE_DELIMITERS):
+            return None
+        marked = marked or bool(eidolon or superimpose)
+        characters.append({
+            "name": name,
+            "eidolon": int(eidolon) if eidolon else CHARACTER_DEFAULTS["eidolon"],
+            "superimpose": int(superimpose) if superimpose else CHARACTER_DEFAULTS["superimpose"],
+        })
+    if not marked or len(characters) > TEAM_SIZE:
+        return None
+    return {"score": score, "characters": characters}
+
+
+def iter_teams_from_lines(lines):
+    """行の iterable から (行番号, 編成の辞書 または None) を1行ずつ返す（空行は飛ばす）"""
+    for lineno, line in enumerate(lines, 1):
+        if line.strip():
+            yield lineno, parse_team_line(line)
+
+
+def sections_from_dict(data):
+    """保存形式の辞書からセクションを作成（特別なキーは除く）
+
+    値が辞書でないもの（settings.bin・settings.db の未デコードのセクション）は
+    Section.lazy で作成し、初めて中身に触れたときに decode() する。
+    """
+    return {
+        name: Section.from_dict(name, section) if isinstance(section, dict) else Section.lazy(name, section)
+        for name, section in data.items() if not name.startswith('_')
+    }
+
+
+def snapshot_sections(sections):
+    """全セクションの保存用スナップショット"""
+    return {name: section.to_dict() for name, section in sections.items()}
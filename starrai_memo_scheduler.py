@@ -0,0 +1,85 @@
+"""イベントループの空き時間に処理を少しずつ進める協調スケジューラ
+
+重い処理（行ウィジェットの大量作成など）をジェネレーターに分けて登録すると、
+イベントループの合間に1回あたり SLICE_MS 以内ずつ next() で進める。処理は
+キー（通常は依頼元のウィジェット）ごとに1件で、同じキーで登録し直すと
+古い処理は取り消される。
+
+    def build():
+        for team in teams:
+            create_row(team)
+            yield
+    idle_scheduler().schedule(widget, build())
+"""
+import time
+
+from PyQt5 import sip
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+SLICE_MS = 8  # 1回のタイマー呼び出しで処理を進める時間の上限
+
+
+class IdleScheduler:
+    """キーごとのジェネレーターを優先度順に時間を区切って進める
+
+    priority の小さい処理から進め、同じ優先度では先に登録したものから進める。
+    """
+
+    def __init__(self, slice_ms=SLICE_MS):
+        self.slice_ms = slice_ms
+        self._tasks = {}  # キー -> (priority, 登録順, ジェネレーター)
+        self._count = 0
+        self._timer = QTimer(QCoreApplication.instance())
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_slice)
+
+    def schedule(self, key, steps, priority=0):
+        """steps（ジェネレーター）を登録（同じキーの処理があれば取り消して置き換える）"""
+        self.cancel(key)
+        self._count += 1
+        self._tasks[key] = (priority, self._count, steps)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self, key):
+        """キーの処理を途中で取り消す（取り消した場合は True）"""
+        task = self._tasks.pop(key, None)
+        if task is None:
+            return False
+        task[2].close()
+        return True
+
+    def pending(self, key):
+        return key in self._tasks
+
+    def finish(self, key):
+        """キーの処理の残りをすぐに最後まで実行"""
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            for _ in task[2]:
+                pass
+
+    def _run_slice(self):
+        deadline = time.perf_counter() + self.slice_ms / 1000
+        while self._tasks and time.perf_counter() < deadline:
+            key = min(self._tasks, key=lambda k: self._tasks[k][:2])
+            try:
+                next(self._tasks[key][2])
+            except StopIteration:
+                self._tasks.pop(key, None)
+            except Exception as e:
+                print(f"バックグラウンド処理エラー: {e}")
+                self._tasks.pop(key, None)
+        if not self._tasks:
+            self._timer.stop()
+
+
+_scheduler = None
+
+
+def idle_scheduler():
+    """アプリ全体で共有するスケジューラ（QApplication の作成後に呼ぶ）"""
+    global _scheduler
+    if _scheduler is None or sip.isdeleted(_scheduler._timer):  # QApplication を作り直した場合
+        _scheduler = IdleScheduler()
+    return _scheduler
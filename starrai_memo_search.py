@@ -0,0 +1,216 @@
+"""全セクションの編成の全文検索（転置索引）
+
+キャラクター名・光円錐・メモ・スコアを1文字と2文字の n-gram に分けて
+転置索引（n-gram -> 編成の集合）に登録する。日本語は単語の区切りがないため
+形態素解析はせず、検索語の n-gram をすべて含む編成を索引から絞り込んでから、
+実際の文字列に検索語が含まれるかを確かめる。
+
+索引は ModelListener としてモデルの変更通知を受け、変わった編成だけを
+登録し直す（全体を作り直さない）。
+"""
+import unicodedata
+
+from starrai_memo_model import TeamIndex
+
+NGRAM = 2
+LINE_CACHE_LIMIT = 50000  # 行ごとの n-gram のキャッシュの上限（超えたら捨てる）
+FIELD_LABELS = {"name": "名前", "lightcone": "光円錐", "memo": "メモ", "score": "スコア"}
+
+
+def normalize(text):
+    """検索用に正規化（全角英数字を半角に、英字を小文字に）"""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def ngrams(text):
+    """正規化済みの文字列の1文字と NGRAM 文字の n-gram（行をまたぐものは作らない）"""
+    grams = set()
+    for line in text.split("\n"):
+        grams.update(line)
+        grams.update(line[i:i + NGRAM] for i in range(len(line) - NGRAM + 1))
+    return grams
+
+
+def query_grams(term):
+    """検索語を絞り込むための n-gram（重なりを減らすため NGRAM 文字ずつ区切る）"""
+    if len(term) <= NGRAM:
+        return [term]
+    grams = [term[i:i + NGRAM] for i in range(0, len(term) - NGRAM + 1, NGRAM)]
+    if len(term) % NGRAM:
+        grams.append(term[-NGRAM:])
+    return grams
+
+
+def team_fields(team):
+    """編成の検索対象のフィールド [(フィールド名, キャラクター番号, 正規化済みの文字列), ...]"""
+    fields = []
+    if team.score:
+        fields.append(("score", None, normalize(team.score)))
+    for i, char in enumerate(team.characters):
+        for key in ("name", "lightcone", "memo"):
+            value = getattr(char, key)
+            if value:
+                fields.append((key, i, normalize(value)))
+    return fields
+
+
+class SearchHit:
+    """検索結果1件（section.name は改名後の名前を指す）"""
+    __slots__ = ("section", "team", "field", "char_index", "text")
+
+    def __init__(self, section, team, field, char_index, text):
+        self.section = section
+        self.team = team
+        self.field = field
+        self.char_index = char_index
+        self.text = text
+
+    def label(self):
+        """一覧表示用の説明（例: "セクション 1 / 3番目 / メモ: ...")"""
+        position = self.section.teams.index(self.team) + 1 if self.team in self.section.teams else "?"
+        text = self.text.replace("\n", " ")
+        if len(text) > 30:
+            text = text[:30] + "…"
+        return f"{self.section.name} / {position}番目 / {FIELD_LABELS[self.field]}: {text}"
+
+
+class _Document:
+    """索引に登録した編成1件"""
+    __slots__ = ("section", "team", "fields", "grams")
+
+    def __init__(self, section, team, fields, grams):
+        self.section = section
+        self.team = team
+        self.fields = fields
+        self.grams = grams
+
+
+class SearchIndex(TeamIndex):
+    """全セクションの編成の転置索引
+
+    セクションを登録すると（build をスケジューラで進めるか、index_section を呼ぶ）、
+    以降はモデルの変更通知で差分だけを更新する。使い終わったら close を呼ぶ。
+    version は索引の内容が変わるたびに増える（検索結果を取っておく側が古くなったかを判定する）。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._postings = {}  # n-gram -> 文書番号の集合
+        self._documents = {}  # 文書番号（登録順）-> _Document
+        self._doc_ids = {}  # Team -> 文書番号
+        self._line_grams = {}  # 行 -> n-gram（メモは同じ行を使い回すことが多い）
+        self._next_id = 0
+        self.version = 0
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add_team(self, section, team):
+        fields, grams = self._analyze(team)
+        doc_id = self._next_id
+        self._next_id += 1
+        self._documents[doc_id] = _Document(section, team, fields, grams)
+        self._doc_ids[team] = doc_id
+        self.version += 1
+        postings = self._postings
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {doc_id}
+            else:
+                ids.add(doc_id)
+
+    def remove_team(self, team):
+        doc_id = self._doc_ids.pop(team, None)
+        if doc_id is None:
+            return
+        doc = self._documents.pop(doc_id)
+        self._unpost(doc.grams, doc_id)
+        self.version += 1
+
+    def update_team(self, team):
+        """編成の入力が変わったときに、増減した n-gram だけを付け替える"""
+        doc_id = self._doc_ids.get(team)
+        if doc_id is None:
+            return
+        doc = self._documents[doc_id]
+        fields, grams = self._analyze(team)
+        self._unpost(doc.grams - grams, doc_id)
+        for gram in grams - doc.grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+        doc.fields = fields
+        doc.grams = grams
+        self.version += 1
+
+    def _unpost(self, grams, doc_id):
+        for gram in grams:
+            ids = self._postings[gram]
+            ids.discard(doc_id)
+            if not ids:
+                del self._postings[gram]
+
+    def _analyze(self, team):
+        """編成の検索対象のフィールドと n-gram の集合"""
+        fields = team_fields(team)
+        grams = set()
+        cache = self._line_grams
+        if len(cache) > LINE_CACHE_LIMIT:
+            cache.clear()
+        for _, _, text in fields:
+            for line in text.split("\n"):
+                line_grams = cache.get(line)
+                if line_grams is None:
+                    line_grams = cache[line] = ngrams(line)
+                grams |= line_grams
+        return fields, grams
+
+    # ModelListener
+    def team_changed(self, team, index, key, old, new):
+        if key in FIELD_LABELS:
+            self.update_team(team)
+
+    def search(self, query, limit=100):
+        """空白区切りの語をすべて含む編成を登録順に最大 limit 件（None で全件）返す（SearchHit のリスト）
+
+        n-gram で絞り込んだ候補を登録順に確かめ、limit 件見つかったところで打ち切る。
+        """
+        terms = normalize(query).split()
+        if not terms:
+            return []
+        candidates = None
+        for term in terms:
+            for gram in query_grams(term):
+                ids = self._postings.get(gram)
+                if not ids:
+                    return []
+                if candidates is None:
+                    candidates = ids
+                else:
+                    candidates = candidates & ids if len(candidates) <= len(ids) else ids & candidates
+                if not candidates:
+                    return []
+
+        hits = []
+        for doc_id in sorted(candidates):
+            hit = self._match(self._documents[doc_id], terms)
+            if hit is not None:
+                hits.append(hit)
+                if len(hits) == limit:
+                    break
+        return hits
+
+    def _match(self, doc, terms):
+        """すべての語が編成のどこかに含まれていれば最初に一致したフィールドの SearchHit を返す"""
+        first = None
+        for term in terms:
+            for field, char_index, text in doc.fields:
+                if term in text:
+                    if first is None:
+                        first = (field, char_index)
+                    break
+            else:
+                return None
+        field, char_index = first
+        team = doc.team
+        value = team.score if field == "score" else getattr(team.characters[char_index], field)
+        return SearchHit(doc.section, team, field, char_index, value)
@@ -0,0 +1,278 @@
+"""SQLite による設定の保存（settings.db）
+
+sections・teams・characters の3テーブルに WAL モードで保存する。自動保存では
+前回保存時から変わった編成だけを UPSERT するため、編成数が増えても1編集
+あたりの書き込み量は変わらない。セクションは settings.bin と同じく、タブを
+初めて開いたときに読み込む。
+"""
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+
+from starrai_memo_storage import RELIC_PARTS
+
+SQLITE_SETTINGS_PATH = "settings.db"
+CHARACTER_COLUMNS = ("name", "eidolon", "superimpose", "level", "lightcone", "memo", "detail_shown")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS sections (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    content TEXT,
+    phase TEXT
+);
+CREATE TABLE IF NOT EXISTS teams (
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    row_id INTEGER NOT NULL,
+    score TEXT NOT NULL,
+    PRIMARY KEY (section, position)
+);
+CREATE TABLE IF NOT EXISTS characters (
+    section TEXT NOT NULL,
+    team INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    eidolon INTEGER NOT NULL,
+    superimpose INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    lightcone TEXT NOT NULL,
+    memo TEXT NOT NULL,
+    detail_shown INTEGER NOT NULL,
+    main_stats TEXT NOT NULL,
+    PRIMARY KEY (section, team, slot)
+);
+"""
+
+_UPSERT_TEAM = """
+INSERT INTO teams (section, position, row_id, score) VALUES (?, ?, ?, ?)
+ON CONFLICT (section, position) DO UPDATE SET row_id = excluded.row_id, score = excluded.score
+"""
+_UPSERT_CHARACTER = """
+INSERT INTO characters (section, team, slot, name, eidolon, superimpose, level,
+                        lightcone, memo, detail_shown, main_stats)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (section, team, slot) DO UPDATE SET
+    name = excluded.name, eidolon = excluded.eidolon, superimpose = excluded.superimpose,
+    level = excluded.level, lightcone = excluded.lightcone, memo = excluded.memo,
+    detail_shown = excluded.detail_shown, main_stats = excluded.main_stats
+"""
+_UPSERT_SECTION = """
+INSERT INTO sections (name, position, content, phase) VALUES (?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    position = excluded.position, content = excluded.content, phase = excluded.phase
+"""
+
+
+class SqliteSection:
+    """まだ読み込んでいないセクション（decode で settings.db から読み込む）"""
+    __slots__ = ("store", "name")
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def decode(self, baseline=True):
+        """セクションの保存形式の辞書を返す（baseline=False では保存時の差分の基準に残さない）"""
+        return self.store.read_section(self.name, baseline)
+
+
+class SqliteSettingsStore:
+    """settings.db の読み込み・保存（TextSettingsStore と同じく SettingsWriter から使う）
+
+    接続はスレッドごとに作る（保存は書き込みスレッド、セクションの読み込みは
+    GUI スレッド）。WAL モードなので保存中でも読み込みはブロックされない。
+    """
+
+    def __init__(self, path=SQLITE_SETTINGS_PATH):
+        self.path = path
+        self.generation = None  # 他のストアと揃えるための属性（SQLite では使わない）
+        self.updated_teams = 0  # 直近の save で書き込んだ編成数
+        self._local = threading.local()
+        self._lock = threading.Lock()  # _persisted は書き込みスレッドと GUI スレッドの両方が触る
+        self._persisted = {}  # セクション名 -> (content, phase, teams) または未読み込みの SqliteSection
+        self._order = []
+        self._last_section = None
+        self._read_only = False
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self, read_only=False):
+        """セクション名の一覧を読み込み (section_data, last_section) を返す（値は SqliteSection）
+
+        read_only=True では読み取り専用で開く（テーブルの作成・WAL の設定もしない）。
+        """
+        self._read_only = read_only
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_section'").fetchone()
+        last_section = json.loads(row[0]) if row else None
+        names = [name for (name,) in conn.execute("SELECT name FROM sections ORDER BY position")]
+        section_data = {name: SqliteSection(self, name) for name in names}
+        with self._lock:
+            self._persisted = dict(section_data)
+            self._order = names
+            self._last_section = last_section
+        return section_data, last_section
+
+    def read_section(self, name, baseline=True):
+        """セクション1件を読み込む（主キーの範囲検索のみ）"""
+        conn = self._connect()
+        row = conn.execute("SELECT content, phase FROM sections WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        teams = [
+            {"row_id": row_id, "score": score, "characters": []}
+            for row_id, score in conn.execute(
+                "SELECT row_id, score FROM teams WHERE section = ? ORDER BY position", (name,))
+        ]
+        for team, slot, *values, main_stats in conn.execute(
+                "SELECT team, slot, name, eidolon, superimpose, level, lightcone, memo, detail_shown, main_stats "
+                "FROM characters WHERE section = ? ORDER BY team, slot", (name,)):
+            char = dict(zip(CHARACTER_COLUMNS, values))
+            char["detail_shown"] = bool(char["detail_shown"])
+            char["main_stats"] = json.loads(main_stats)
+            teams[team]["characters"].append(char)
+
+        section = {"content": row[0], "phase": row[1], "teams": teams}
+        if not baseline:
+            return section
+        with self._lock:
+            if isinstance(self._persisted.get(name), SqliteSection):
+                self._persisted[name] = (section["content"], section["phase"], list(teams))
+        return section
+
+    def save(self, section_data, last_section):
+        """前回保存時から変わった編成だけを書き込む"""
+        names = [name for name in section_data if not name.startswith('_')]
+        with self._lock:
+            persisted = dict(self._persisted)
+            order = self._order
+            previous_last = self._last_section
+
+        # 読み込まないまま改名されたセクション（保存先の行はまだ元の名前のまま）
+        renamed = {name: section for name, section in section_data.items()
+                   if isinstance(section, SqliteSection) and section.store is self
+                   and section.name != name and name in names}
+
+        conn = self._connect()
+        self.updated_teams = 0
+        current = {}
+        with conn:
+            if last_section != previous_last:
+                conn.execute("INSERT INTO meta (key, value) VALUES ('last_section', ?) "
+                             "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                             (json.dumps(last_section, ensure_ascii=False),))
+            decoded = {}
+            for name, section in renamed.items():
+                if name in persisted:
+                    # 新しい名前の行がまだ残っている（名前の入れ替えなど）ので、先に読み込んで書き直す
+                    decoded[name] = self.read_section(section.name, baseline=False)
+            for name, section in renamed.items():
+                if name not in decoded:
+                    self._move_section(conn, section.name, name)
+            for name in persisted:
+                if name not in section_data:
+                    self._delete_section(conn, name)
+            for position, name in enumerate(names):
+                section = decoded.get(name, section_data[name])
+                if isinstance(section, SqliteSection) and section.store is self:
+                    current[name] = section
+                    continue  # 読み込んでいないセクションは変更もない
+                if not isinstance(section, dict):
+                    section = section.decode()  # 他の形式の未デコードのセクション
+                current[name] = (section.get("content"), section.get("phase"), list(section.get("teams", [])))
+                old = persisted.get(name)
+                if old is None or isinstance(old, SqliteSection):
+                    self._write_section(conn, name, position, section)
+                else:
+                    self._update_section(conn, name, position, old, section)
+            if names != order:
+                conn.executemany("UPDATE sections SET position = ? WHERE name = ?",
+                                 [(position, name) for position, name in enumerate(names)])
+
+        with self._lock:
+            for name, section in renamed.items():
+                section.name = name  # 以降は新しい名前の行を読み込む
+            self._persisted = current
+            self._order = names
+            self._last_section = last_section
+
+    def compact(self, section_data, last_section):
+        """保存してから WAL をデータベース本体に書き戻す（終了時用）"""
+        self.save(section_data, last_section)
+        self._connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """このスレッドの接続を閉じる"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None and self._read_only:
+            conn = sqlite3.connect(pathlib.Path(self.path).absolute().as_uri() + "?mode=ro", uri=True)
+            self._local.conn = conn
+        elif conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _write_section(self, conn, name, position, section):
+        """セクション全体を書き込む（新規・改名したセクション）"""
+        self._delete_section(conn, name)
+        conn.execute(_UPSERT_SECTION, (name, position, section.get("content"), section.get("phase")))
+        for i, team in enumerate(section.get("teams", [])):
+            self._upsert_team(conn, name, i, team)
+
+    def _update_section(self, conn, name, position, old, section):
+        """変わった編成だけを UPSERT し、減った分を削除する"""
+        old_content, old_phase, old_teams = old
+        if old_content != section.get("content") or old_phase != section.get("phase"):
+            conn.execute(_UPSERT_SECTION, (name, position, section.get("content"), section.get("phase")))
+        teams = section.get("teams", [])
+        for i, team in enumerate(teams):
+            if i < len(old_teams) and (team is old_teams[i] or team == old_teams[i]):
+                continue
+            self._upsert_team(conn, name, i, team)
+        if len(teams) < len(old_teams):
+            conn.execute("DELETE FROM teams WHERE section = ? AND position >= ?", (name, len(teams)))
+            conn.execute("DELETE FROM characters WHERE section = ? AND team >= ?", (name, len(teams)))
+
+    def _upsert_team(self, conn, name, position, team):
+        self.updated_teams += 1
+        conn.execute(_UPSERT_TEAM, (name, position, team.get("row_id", 1), team.get("score", "")))
+        characters = team.get("characters", [])
+        conn.executemany(_UPSERT_CHARACTER, [
+            (name, position, slot,
+             char.get("name", ""), char.get("eidolon", 0), char.get("superimpose", 1),
+             char.get("level", 80), char.get("lightcone", ""), char.get("memo", ""),
+             int(bool(char.get("detail_shown", False))),
+             json.dumps({part: char.get("main_stats", {}).get(part, "HP%") for part in RELIC_PARTS},
+                        ensure_ascii=False))
+            for slot, char in enumerate(characters)
+        ])
+        conn.execute("DELETE FROM characters WHERE section = ? AND team = ? AND slot >= ?",
+                     (name, position, len(characters)))
+
+    def _move_section(self, conn, old_name, name):
+        """セクションの行を読み込まずに新しい名前へ付け替える"""
+        conn.execute("UPDATE sections SET name = ? WHERE name = ?", (name, old_name))
+        conn.execute("UPDATE teams SET section = ? WHERE section = ?", (name, old_name))
+        conn.execute("UPDATE characters SET section = ? WHERE section = ?", (name, old_name))
+
+    def _delete_section(self, conn, name):
+        conn.execute("DELETE FROM characters WHERE section = ?", (name,))
+        conn.execute("DELETE FROM teams WHERE section = ?", (name,))
+        conn.execute("DELETE FROM sections WHERE name = ?", (name,))
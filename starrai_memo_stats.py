@@ -0,0 +1,287 @@
+"""キャラクター・光円錐・遺物メイン効果の使用回数（コンテンツ・区分別）
+
+UsageStats は TeamIndex としてモデルの変更通知を受け、入力が変わった
+キャラクター1人分だけを数え直して回数を増減する（全セクションを数え直さない）。
+セクションの content・phase が変わった場合は、そのセクションの編成の回数を
+別の区分へ付け替える。
+
+UsageStatsPanel は集計を表で表示する。変更の通知は次のイベントループで
+まとめて反映し、表示中のときだけ表を書き直す。共起行列（starrai_memo_cooccur）を
+渡すと、よく一緒に使う組み合わせの表と CSV の書き出しも表示する。
+"""
+from collections import Counter
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (
+    QComboBox, QFileDialog, QHBoxLayout, QLabel, QMessageBox, QPushButton, QTableWidget,
+    QTableWidgetItem, QVBoxLayout, QWidget
+)
+
+import starrai_memo_cooccur
+
+from starrai_memo_model import TeamIndex
+from starrai_memo_storage import RELIC_PARTS
+
+CONTENTS = ("忘却の庭", "虚構叙事", "末日の幻影")
+PHASES = ("前半", "後半")
+KINDS = {"name": "キャラクター", "lightcone": "光円錐", "main_stats": "メイン効果"}  # 集計の種類 -> 表の見出し
+ALL_LABEL = "すべて"
+PANEL_ROWS = 30  # 表に表示する最大件数
+PAIR_REFRESH_MS = 500  # 共起行列の作り直しを待つ時間（入力が続く間はまとめる）
+_ANY = object()  # 集計の区分の「すべて」（content・phase が未選択の None とは区別する）
+
+
+def character_keys(char):
+    """キャラクター1人分の集計のキー [(種類, キー), ...]（メイン効果は名前との組み合わせ）"""
+    keys = []
+    name = char.name.strip()
+    if name:
+        keys.append(("name", name))
+        keys.append(("main_stats", (name,) + tuple(char.main_stats.get(part, "") for part in RELIC_PARTS)))
+    lightcone = char.lightcone.strip()
+    if lightcone:
+        keys.append(("lightcone", lightcone))
+    return keys
+
+
+def _totals(bucket):
+    """(content, phase) の回数を足し込む集計の区分（その区分と「すべて」を含む3つの合計）"""
+    content, phase = bucket
+    return (bucket, (content, _ANY), (_ANY, phase), (_ANY, _ANY))
+
+
+def key_label(kind, key):
+    """表に表示する文字列（メイン効果は "カフカ: 攻撃% / 攻撃% / ..." の形）"""
+    if kind == "main_stats":
+        return f"{key[0]}: " + " / ".join(key[1:])
+    return key
+
+
+class UsageStats(TeamIndex):
+    """全セクションの使用回数を (content, phase) ごとに持つ集計
+
+    「すべて」の合計（content だけ・phase だけ・全体）も同時に増減しておき、
+    表示のたびに区分を合算しない。on_change に関数を設定すると、回数が
+    変わるたびに引数なしで呼ぶ。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._counts = {}  # (content, phase) -> {種類: Counter}
+        self._team_keys = {}  # Team -> キャラクターごとの character_keys のリスト
+        self._team_sections = {}  # Team -> Section
+        self.on_change = None
+
+    def __len__(self):
+        return len(self._team_keys)
+
+    def _count(self, buckets, keys, delta):
+        for total in buckets:
+            counters = self._counts.get(total)
+            if counters is None:
+                counters = self._counts[total] = {kind: Counter() for kind in KINDS}
+            for kind, key in keys:
+                counter = counters[kind]
+                counter[key] += delta
+                if counter[key] <= 0:
+                    del counter[key]
+
+    def _notify(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    # TeamIndex
+    def add_team(self, section, team):
+        keys = [character_keys(char) for char in team.characters]
+        self._team_keys[team] = keys
+        self._team_sections[team] = section
+        buckets = _totals((section.content, section.phase))
+        for char_keys in keys:
+            self._count(buckets, char_keys, 1)
+        self._notify()
+
+    def remove_team(self, team):
+        keys = self._team_keys.pop(team, None)
+        if keys is None:
+            return
+        section = self._team_sections.pop(team)
+        buckets = _totals((section.content, section.phase))
+        for char_keys in keys:
+            self._count(buckets, char_keys, -1)
+        self._notify()
+
+    # ModelListener
+    def team_changed(self, team, index, key, old, new):
+        if index is None or key not in ("name", "lightcone", "main_stats"):
+            return
+        keys = self._team_keys.get(team)
+        if keys is None:
+            return  # 未登録のセクションの編成
+        new_keys = character_keys(team.characters[index])
+        if new_keys == keys[index]:
+            return  # 前後の空白だけの変更など
+        section = self._team_sections[team]
+        buckets = _totals((section.content, section.phase))
+        self._count(buckets, keys[index], -1)
+        self._count(buckets, new_keys, 1)
+        keys[index] = new_keys
+        self._notify()
+
+    def section_changed(self, section, key, old, new):
+        if section not in self._sections:
+            return
+        old_totals = _totals((old, section.phase) if key == "content" else (section.content, old))
+        new_totals = _totals((section.content, section.phase))
+        # 変わらない合計（content の変更なら phase だけの合計と全体）は付け替えない
+        removed = [bucket for bucket in old_totals if bucket not in new_totals]
+        added = [bucket for bucket in new_totals if bucket not in old_totals]
+        for team in section.teams:
+            for char_keys in self._team_keys.get(team, ()):
+                self._count(removed, char_keys, -1)
+                self._count(added, char_keys, 1)
+        self._notify()
+
+    def counts(self, kind, content=None, phase=None):
+        """種類ごとの回数の Counter（content・phase が None の場合はすべての区分の合計、変更しないこと）"""
+        bucket = (_ANY if content is None else content, _ANY if phase is None else phase)
+        counters = self._counts.get(bucket)
+        return counters[kind] if counters is not None else Counter()
+
+    def top(self, kind, content=None, phase=None, limit=PANEL_ROWS):
+        """回数の多い順に最大 limit 件 [(キー, 回数), ...]"""
+        return self.counts(kind, content, phase).most_common(limit)
+
+
+class UsageStatsPanel(QWidget):
+    """使用回数の表（コンテンツ・区分で絞り込み、編集に合わせて更新）"""
+
+    def __init__(self, stats, cooccurrence=None, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.cooccurrence = cooccurrence if starrai_memo_cooccur.available() else None
+        self._refresh_pending = False
+        self.setWindowTitle("使用回数の集計")
+        self.resize(900, 600)
+
+        layout = QVBoxLayout(self)
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("コンテンツ:"))
+        self.content_combo = QComboBox()
+        self.content_combo.addItems((ALL_LABEL,) + CONTENTS)
+        self.content_combo.currentIndexChanged.connect(self.refresh)
+        filter_layout.addWidget(self.content_combo)
+        filter_layout.addWidget(QLabel("区分:"))
+        self.phase_combo = QComboBox()
+        self.phase_combo.addItems((ALL_LABEL,) + PHASES)
+        self.phase_combo.currentIndexChanged.connect(self.refresh)
+        filter_layout.addWidget(self.phase_combo)
+        filter_layout.addStretch()
+        self.total_label = QLabel("")
+        filter_layout.addWidget(self.total_label)
+        layout.addLayout(filter_layout)
+
+        tables_layout = QHBoxLayout()
+        self.tables = {}
+        for kind, title in KINDS.items():
+            table = QTableWidget(0, 2)
+            table.setHorizontalHeaderLabels([title, "回数"])
+            table.setEditTriggers(QTableWidget.NoEditTriggers)
+            table.verticalHeader().setVisible(False)
+            table.horizontalHeader().setStretchLastSection(False)
+            table.setColumnWidth(0, 360 if kind == "main_stats" else 160)
+            self.tables[kind] = table
+            tables_layout.addWidget(table, 2 if kind == "main_stats" else 1)
+        layout.addLayout(tables_layout)
+
+        if self.cooccurrence is not None:
+            self.setup_pair_ui(layout)
+
+        stats.on_change = self.schedule_refresh
+        if self.cooccurrence is not None:
+            self.cooccurrence.on_change = self.schedule_refresh
+
+    def setup_pair_ui(self, layout):
+        """共起行列の組み合わせの表と CSV 書き出しボタン"""
+        pair_layout = QHBoxLayout()
+        pair_layout.addWidget(QLabel("よく一緒に使う組み合わせ（全セクション）"))
+        pair_layout.addStretch()
+        for label, scores in (("共起回数を CSV に保存", False), ("平均スコアを CSV に保存", True)):
+            button = QPushButton(label)
+            button.clicked.connect(lambda checked, s=scores: self.export_cooccurrence(s))
+            pair_layout.addWidget(button)
+        layout.addLayout(pair_layout)
+
+        self.pair_table = QTableWidget(0, 4)
+        self.pair_table.setHorizontalHeaderLabels(["キャラクター", "キャラクター", "編成数", "平均スコア"])
+        self.pair_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.pair_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.pair_table)
+
+        self.pair_timer = QTimer(self)
+        self.pair_timer.setSingleShot(True)
+        self.pair_timer.setInterval(PAIR_REFRESH_MS)
+        self.pair_timer.timeout.connect(self.refresh_pairs)
+
+    def schedule_refresh(self):
+        """変更の通知をまとめて次のイベントループで表示に反映"""
+        if not self._refresh_pending and self.isVisible():
+            self._refresh_pending = True
+            QTimer.singleShot(0, self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def refresh(self, *args):
+        self._refresh_pending = False
+        if not self.isVisible():
+            return
+        content = self.content_combo.currentText()
+        phase = self.phase_combo.currentText()
+        content = None if content == ALL_LABEL else content
+        phase = None if phase == ALL_LABEL else phase
+        for kind, table in self.tables.items():
+            rows = self.stats.top(kind, content, phase)
+            table.setRowCount(len(rows))
+            for i, (key, count) in enumerate(rows):
+                self._set_cell(table, i, 0, key_label(kind, key))
+                self._set_cell(table, i, 1, str(count))
+        self.total_label.setText(f"集計対象: {len(self.stats)}編成")
+        if self.cooccurrence is not None and (self.cooccurrence.stale or not self.pair_table.rowCount()):
+            self.pair_timer.start()
+
+    def refresh_pairs(self):
+        """共起行列を（古ければ作り直して）組み合わせの表に反映"""
+        if not self.isVisible():
+            return
+        rows = self.cooccurrence.matrix().top_pairs(PANEL_ROWS)
+        self.pair_table.setRowCount(len(rows))
+        for i, (first, second, count, score) in enumerate(rows):
+            self._set_cell(self.pair_table, i, 0, first)
+            self._set_cell(self.pair_table, i, 1, second)
+            self._set_cell(self.pair_table, i, 2, str(count))
+            self._set_cell(self.pair_table, i, 3, "" if score != score else f"{score:.0f}")  # NaN は空欄
+
+    def export_cooccurrence(self, scores):
+        """共起行列（scores=True では組み合わせごとの平均スコア）を CSV に保存"""
+        path, _ = QFileDialog.getSaveFileName(self, "CSV に保存",
+                                              "average_scores.csv" if scores else "cooccurrence.csv",
+                                              "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            # Excel で文字化けしないように BOM を付ける
+            with open(path, "w", encoding="utf-8-sig", newline="") as f:
+                self.cooccurrence.matrix().write_csv(f, scores)
+            print(f"共起行列を書き出しました（{path}）")
+        except Exception as e:
+            print(f"CSV 書き出しエラー: {e}")
+            QMessageBox.warning(self, "書き出しエラー", f"CSV を保存できませんでした:\n{e}")
+
+    @staticmethod
+    def _set_cell(table, row, column, text):
+        item = table.item(row, column)
+        if item is None:
+            table.setItem(row, column, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
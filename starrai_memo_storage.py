@@ -0,0 +1,783 @@
+"""設定ファイル（settings.txt）の保存・読み込み処理"""
+import json
+import os
+import re
+import threading
+
+SETTINGS_HEADER = "=== STARRAI MEMO SETTINGS ==="
+FORMAT_VERSION = 3  # 3: 値の前後の空白を保持・未選択は NONE_VALUE、2: 値の \\ 改行 ] をエスケープ（1 は MEMO の改行のみ）
+RELIC_PARTS = ["胴", "脚", "縄", "球"]
+COMPACT_THRESHOLD_BYTES = 256 * 1024  # ジャーナルがこのサイズを超えたらスナップショットに畳み込む
+TEAM_RECORD_LIMIT = 8  # 1編成の変更フィールドがこれより多ければ編成ごと記録する
+
+_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "]": "\\]"})
+_UNESCAPES = {"n": "\n", "r": "\r"}
+_ESCAPED_CHAR = re.compile(r"\\(.)")
+NONE_VALUE = "\\N"  # 形式 3 の未選択（None）。escape_value の結果とは重ならない（2 までは "None"）
+
+
+def escape_value(value):
+    """値を1行に収まるようにエスケープ（\\ 改行 ]。: はキー直後の最初の1つで区切るので不要）"""
+    value = str(value)
+    if "\\" in value or "\n" in value or "\r" in value or "]" in value:
+        return value.translate(_ESCAPE_TABLE)
+    return value
+
+
+def escape_optional(value):
+    """None を取りうる値（CONTENT・PHASE・LAST_SECTION）をエスケープ"""
+    return NONE_VALUE if value is None else escape_value(value)
+
+
+def unescape_value(value):
+    """escape_value の逆変換（\\: など不要なエスケープも受け付ける）"""
+    if "\\" not in value:
+        return value
+    return _ESCAPED_CHAR.sub(lambda m: _UNESCAPES.get(m.group(1), m.group(1)), value)
+
+
+def encode_team_body(team):
+    """編成1件分のテキストを作成（[TEAM_n] ヘッダー行は含まない）"""
+    lines = [
+        f"  ROW_ID: {team.get('row_id', 0)}\n",
+        f"  SCORE: {escape_value(team.get('score', ''))}\n",
+    ]
+    for j, char in enumerate(team.get('characters', [])):
+        main_stats = char.get('main_stats', {})
+        stats = "|".join(escape_value(main_stats.get(part, 'HP%')) for part in RELIC_PARTS)
+        lines.append(f"    [CHAR_{j+1}]\n")
+        lines.append(f"    NAME: {escape_value(char.get('name', ''))}\n")
+        lines.append(f"    EIDOLON: {char.get('eidolon', 0)}\n")
+        lines.append(f"    SUPERIMPOSE: {char.get('superimpose', 1)}\n")
+        lines.append(f"    LEVEL: {char.get('level', 80)}\n")
+        lines.append(f"    LIGHTCONE: {escape_value(char.get('lightcone', ''))}\n")
+        lines.append(f"    MEMO: {escape_value(char.get('memo', ''))}\n")
+        lines.append(f"    DETAIL_SHOWN: {char.get('detail_shown', False)}\n")
+        # メイン効果
+        lines.append(f"    MAIN_STATS: {stats}\n")
+    return "".join(lines)
+
+
+class _SectionBlock:
+    """エンコード済みセクションのキャッシュ"""
+    __slots__ = ("content", "phase", "teams", "team_bodies", "text")
+
+    def __init__(self, content, phase, teams, team_bodies, text):
+        self.content = content
+        self.phase = phase
+        self.teams = teams
+        self.team_bodies = team_bodies
+        self.text = text
+
+    def matches(self, content, phase, teams):
+        if self.content != content or self.phase != phase:
+            return False
+        if len(self.teams) != len(teams):
+            return False
+        return all(a is b for a, b in zip(self.teams, teams))
+
+
+class TextSettingsEncoder:
+    """settings.txt 形式のエンコーダ
+
+    セクション・編成ごとにエンコード結果をキャッシュし、変更のあった
+    ブロックだけを再エンコードする。編成の変更は辞書オブジェクトの
+    同一性で判定するため、呼び出し側は変更した編成だけ新しい辞書に
+    差し替え、未変更の編成は同じ辞書をそのまま渡すこと。
+    """
+
+    def __init__(self):
+        self._sections = {}
+        self.encoded_teams = 0  # 直近の encode で再エンコードした編成数
+
+    def clear(self):
+        """キャッシュを破棄"""
+        self._sections.clear()
+
+    def encode_section(self, name, section):
+        """セクション1件分のテキストを作成（キャッシュがあれば再利用）"""
+        if not isinstance(section, dict):
+            # 未解析のセクションは、名前が変わっていなければ読み込んだ行をそのまま使う
+            text = section.text() if isinstance(section, TextSection) and section.name == name else None
+            if text is not None:
+                return text
+            section = section.decode()
+        content = section.get('content')
+        phase = section.get('phase')
+        teams = section.get('teams', [])
+
+        block = self._sections.get(name)
+        if block is not None and block.matches(content, phase, teams):
+            return block.text
+
+        # 同じ辞書の編成は前回のエンコード結果を使い回す
+        previous = {}
+        if block is not None:
+            previous = {id(team): body for team, body in zip(block.teams, block.team_bodies)}
+
+        team_bodies = []
+        for team in teams:
+            body = previous.get(id(team))
+            if body is None:
+                body = encode_team_body(team)
+                self.encoded_teams += 1
+            team_bodies.append(body)
+
+        parts = [
+            f"[SECTION: {escape_value(name)}]\n",
+            f"CONTENT: {escape_optional(content)}\n",
+            f"PHASE: {escape_optional(phase)}\n",
+            f"TEAMS_COUNT: {len(teams)}\n",
+        ]
+        for i, body in enumerate(team_bodies):
+            parts.append(f"  [TEAM_{i+1}]\n")
+            parts.append(body)
+        parts.append("\n")
+        text = "".join(parts)
+
+        self._sections[name] = _SectionBlock(content, phase, tuple(teams), team_bodies, text)
+        return text
+
+    def encode(self, section_data, last_section=None, generation=0):
+        """全セクションを settings.txt 形式の文字列にする"""
+        self.encoded_teams = 0
+        names = [name for name in section_data if not name.startswith('_')]
+
+        parts = [
+            f"{SETTINGS_HEADER}\n",
+            f"FORMAT_VERSION: {FORMAT_VERSION}\n",
+            f"LAST_SECTION: {escape_optional(last_section)}\n",
+            f"GENERATION: {generation}\n",
+            f"SECTIONS_COUNT: {len(names)}\n",
+            "\n",
+        ]
+        for name in names:
+            parts.append(self.encode_section(name, section_data[name]))
+
+        # 削除・改名されたセクションのキャッシュを破棄
+        if len(self._sections) != len(names):
+            live = set(names)
+            for name in [n for n in self._sections if n not in live]:
+                del self._sections[name]
+
+        return "".join(parts)
+
+
+def new_character():
+    """キャラクターの初期データ"""
+    return {
+        "name": "",
+        "eidolon": 0,
+        "superimpose": 1,
+        "level": 80,
+        "lightcone": "",
+        "memo": "",
+        "detail_shown": False,
+        "main_stats": {part: "HP%" for part in RELIC_PARTS}
+    }
+
+
+def _parse_bool(value):
+    return value.strip().lower() == "true"
+
+
+def _parse_optional(value):
+    return None if value == "None" else value  # 形式 2 まで（3 からは _parse_field で NONE_VALUE を判定）
+
+
+def _parse_main_stats(value):
+    stats_parts = value.split("|")
+    if len(stats_parts) < len(RELIC_PARTS):
+        raise ValueError(f"メイン効果が{len(RELIC_PARTS)}つありません")
+    return dict(zip(RELIC_PARTS, stats_parts))
+
+
+# キー -> (対象, フィールド名, 変換関数)。フィールド名が None のキーは読み捨てる
+_FIELDS = {
+    "FORMAT_VERSION": ("file", "format_version", int),
+    "LAST_SECTION": ("file", "last_section", _parse_optional),
+    "GENERATION": ("file", "generation", int),
+    "SECTIONS_COUNT": ("file", None, int),
+    "CONTENT": ("section", "content", _parse_optional),
+    "PHASE": ("section", "phase", _parse_optional),
+    "TEAMS_COUNT": ("section", None, int),
+    "ROW_ID": ("team", "row_id", int),
+    "SCORE": ("team", "score", str),
+    "NAME": ("char", "name", str),
+    "EIDOLON": ("char", "eidolon", int),
+    "SUPERIMPOSE": ("char", "superimpose", int),
+    "LEVEL": ("char", "level", int),
+    "LIGHTCONE": ("char", "lightcone", str),
+    "MEMO": ("char", "memo", str),
+    "DETAIL_SHOWN": ("char", "detail_shown", _parse_bool),
+    "MAIN_STATS": ("char", "main_stats", _parse_main_stats),
+}
+
+
+_SCOPE_NAMES = {"section": "セクション", "team": "編成", "char": "キャラクター"}
+
+
+class SettingsTextParser:
+    """settings.txt 形式の1パス・ストリーミングパーサー
+
+    行を順に読み、[SECTION: ...] / [TEAM_n] / [CHAR_n] のタグと "キー: 値" の行を
+    テーブル引きで処理する。壊れた行は errors に (行番号, 内容) を記録して読み飛ばし、
+    残りの行の読み込みは続ける。
+    """
+
+    def __init__(self):
+        self.section_data = {}
+        self.errors = []
+        self.file = {"format_version": 1, "last_section": None, "generation": 0}
+        self.targets = {"file": self.file, "section": None, "team": None, "char": None}
+        self.tags = {
+            "SECTION": self._begin_section,
+            "TEAM": self._begin_team,
+            "CHAR": self._begin_char,
+        }
+
+    def parse(self, lines):
+        """行を読み込み (section_data, last_section, generation) を返す"""
+        for lineno, line in enumerate(lines, 1):
+            self._parse_line(lineno, line)
+        return self.section_data, self.file["last_section"], self.file["generation"]
+
+    def split(self, lines):
+        """ヘッダーだけを解析し、各セクションは未解析の TextSection として返す
+
+        セクションの行は [SECTION: ...] の行で区切って取っておくだけなので、
+        中身の解析は TextSection.decode を呼んだときに行う。
+        """
+        chunk = None
+        for lineno, line in enumerate(lines, 1):
+            stripped = line.strip()
+            if stripped.startswith("[SECTION:") and _has_closing_bracket(stripped):
+                name = _field_text(stripped[len("[SECTION:"):-1], self.file["format_version"])
+                chunk = TextSection(name, [], lineno, self.file["format_version"])
+                self.section_data[name] = chunk
+            if chunk is None:
+                self._parse_line(lineno, line)
+            else:
+                chunk.lines.append(line)
+        return self.section_data, self.file["last_section"], self.file["generation"]
+
+    def _parse_line(self, lineno, line):
+        if self.file["format_version"] >= 3:
+            line = line.rstrip("\r\n").lstrip()  # 字下げと改行だけを除き、値の末尾の空白は残す
+        else:
+            line = line.strip()
+        if not line or line.startswith("==="):
+            return
+        try:
+            if line[0] == "[":
+                self._parse_tag(line.rstrip())
+            else:
+                self._parse_field(line)
+        except ValueError as e:
+            self.errors.append((lineno, f"{e}: {line}"))
+
+    def _parse_tag(self, line):
+        if not _has_closing_bracket(line):
+            raise ValueError("閉じ括弧 ] がありません")
+        body = line[1:-1]
+        name, sep, rest = body.partition(":")
+        if not sep:
+            name = body.split("_", 1)[0]
+        handler = self.tags.get(name)
+        if handler is None:
+            raise ValueError("不明なタグ")
+        handler(rest)
+
+    def _parse_field(self, line):
+        key, sep, value = line.partition(":")
+        if not sep:
+            raise ValueError("キーと値の区切り : がありません")
+        field = _FIELDS.get(key.strip())
+        if field is None:
+            raise ValueError("不明なキー")
+        scope, attr, convert = field
+        target = self.targets[scope]
+        if target is None:
+            raise ValueError(f"{_SCOPE_NAMES[scope]}の外にある行")
+        version = self.file["format_version"]
+        if version >= 3 and convert is _parse_optional:
+            # 未選択は NONE_VALUE（"None" という名前の値と区別する。エスケープ済みの値とは重ならない）
+            value = None if value.strip() == NONE_VALUE else _field_text(value, version)
+        else:
+            value = _field_text(value, version)
+            if version < 2 and key == "MEMO":
+                value = value.replace("\\n", "\n")
+            value = convert(value)
+        if attr is not None:
+            target[attr] = value
+
+    def _begin_section(self, name):
+        name = _field_text(name, self.file["format_version"])
+        section = {"content": None, "phase": None, "teams": []}
+        self.section_data[name] = section
+        self.targets.update(section=section, team=None, char=None)
+
+    def _begin_team(self, _):
+        section = self.targets["section"]
+        if section is None:
+            raise ValueError("セクションの外にある編成")
+        team = {"row_id": 1, "score": "", "characters": []}
+        section["teams"].append(team)
+        self.targets.update(team=team, char=None)
+
+    def _begin_char(self, _):
+        team = self.targets["team"]
+        if team is None:
+            raise ValueError("編成の外にあるキャラクター")
+        char = new_character()
+        team["characters"].append(char)
+        self.targets["char"] = char
+
+
+class TextSection:
+    """まだ解析していないセクション（settings.txt の [SECTION: ...] から次のセクションまでの行）
+
+    decode で初めて解析する。保存時に一度もデコードされていなければ、
+    行をそのまま新しいスナップショットへ写す。
+    """
+    __slots__ = ("name", "lines", "lineno", "format_version", "decoded")
+
+    def __init__(self, name, lines, lineno, format_version):
+        self.name = name
+        self.lines = lines
+        self.lineno = lineno  # ファイル内の先頭の行番号
+        self.format_version = format_version
+        self.decoded = None  # decode した結果（保存時の差分の基準になる）
+
+    def decode(self, baseline=True):
+        """セクションの保存形式の辞書を返す（baseline=False では保存時の差分の基準に残さない）"""
+        parser = SettingsTextParser()
+        parser.file["format_version"] = self.format_version
+        section_data = parser.parse(self.lines)[0]
+        for lineno, message in parser.errors:
+            print(f"設定ファイル {self.lineno + lineno - 1}行目を読み飛ばしました: {message}")
+        section = section_data.get(self.name, {"content": None, "phase": None, "teams": []})
+        if baseline and self.decoded is None:
+            self.decoded = (section.get("content"), section.get("phase"), list(section.get("teams", [])))
+        return section
+
+    def text(self):
+        """そのままスナップショットに書き出せる場合はその文字列、できなければ None"""
+        if self.format_version != FORMAT_VERSION:
+            return None
+        text = "".join(self.lines)
+        if not text.endswith("\n\n"):
+            text = text.rstrip("\n") + "\n\n"
+        return text
+
+
+def _field_text(value, format_version):
+    """キー・タグの ":" より後ろを値にする（形式 3 は区切りの空白1つだけを除き、前後の空白を残す）"""
+    if format_version >= 3:
+        return unescape_value(value[1:] if value.startswith(" ") else value)
+    value = value.strip()
+    return unescape_value(value) if format_version >= 2 else value
+
+
+def _has_closing_bracket(line):
+    """行末が ] で、その ] がエスケープされていないか"""
+    if not line.endswith("]"):
+        return False
+    backslashes = len(line) - 1 - len(line[:-1].rstrip("\\"))
+    return backslashes % 2 == 0
+
+
+def parse_settings_text(lines, errors=None):
+    """settings.txt 形式の行を読み込み (section_data, last_section, generation) を返す
+
+    errors にリストを渡すと、読み飛ばした行の (行番号, 内容) を追加する。
+    """
+    parser = SettingsTextParser()
+    result = parser.parse(lines)
+    if errors is not None:
+        errors.extend(parser.errors)
+    return result
+
+
+def diff_team(section_name, index, old, new):
+    """編成1件の変更差分をジャーナルレコードにする（変更のあったフィールドのみ）"""
+    records = []
+    for key in ("row_id", "score"):
+        if old.get(key) != new.get(key):
+            records.append({"op": "set", "s": section_name, "t": index, "k": key, "v": new.get(key)})
+
+    old_chars = old.get("characters", [])
+    new_chars = new.get("characters", [])
+    if len(old_chars) != len(new_chars):
+        records.append({"op": "set", "s": section_name, "t": index, "k": "characters", "v": new_chars})
+        return records
+
+    for j, (old_char, new_char) in enumerate(zip(old_chars, new_chars)):
+        for key, value in new_char.items():
+            if old_char.get(key) != value:
+                records.append({"op": "set", "s": section_name, "t": index, "c": j, "k": key, "v": value})
+    return records
+
+
+def _deleted_indices(old_teams, new_teams):
+    """new_teams が old_teams から何件か取り除いただけなら、取り除かれた位置を返す"""
+    deleted = []
+    j = 0
+    for i, team in enumerate(old_teams):
+        if j < len(new_teams) and new_teams[j] is team:
+            j += 1
+        else:
+            deleted.append(i)
+    return deleted if j == len(new_teams) else None
+
+
+def diff_section(name, old, section):
+    """セクション1件の変更差分をジャーナルレコードにする"""
+    records = []
+    old_content, old_phase, old_teams = old
+    if old_content != section.get("content"):
+        records.append({"op": "set", "s": name, "k": "content", "v": section.get("content")})
+    if old_phase != section.get("phase"):
+        records.append({"op": "set", "s": name, "k": "phase", "v": section.get("phase")})
+
+    teams = section.get("teams", [])
+    if len(teams) < len(old_teams):
+        deleted = _deleted_indices(old_teams, teams)
+        if deleted is not None:
+            # 削除のみ（後ろから消すことで位置がずれないようにする）
+            for i in reversed(deleted):
+                records.append({"op": "del_team", "s": name, "t": i})
+            return records
+
+    for i, team in enumerate(teams):
+        if i >= len(old_teams):
+            records.append({"op": "team", "s": name, "t": i, "v": team})
+        elif team is not old_teams[i]:
+            team_records = diff_team(name, i, old_teams[i], team)
+            if len(team_records) > TEAM_RECORD_LIMIT:
+                team_records = [{"op": "team", "s": name, "t": i, "v": team}]
+            records.extend(team_records)
+    if len(teams) < len(old_teams):
+        records.append({"op": "truncate", "s": name, "n": len(teams)})
+    return records
+
+
+def apply_record(section_data, record):
+    """ジャーナルレコードを1件適用する（LAST_SECTION の変更時はその名前を返す）"""
+    op = record["op"]
+    if op == "last":
+        return record["v"]
+    if op == "section":
+        section_data[record["s"]] = record["v"]
+    elif op == "del_section":
+        section_data.pop(record["s"], None)
+    elif op == "team":
+        teams = section_data[record["s"]]["teams"]
+        if record["t"] < len(teams):
+            teams[record["t"]] = record["v"]
+        else:
+            teams.append(record["v"])
+    elif op == "del_team":
+        del section_data[record["s"]]["teams"][record["t"]]
+    elif op == "truncate":
+        del section_data[record["s"]]["teams"][record["n"]:]
+    elif op == "set":
+        target = section_data[record["s"]]
+        if "t" in record:
+            target = target["teams"][record["t"]]
+            if "c" in record:
+                target = target["characters"][record["c"]]
+        target[record["k"]] = record["v"]
+    return None
+
+
+class TextSettingsStore:
+    """settings.txt（スナップショット）と追記専用ジャーナルによる保存
+
+    自動保存ではジャーナル（settings.txt.journal）に変更のあったフィールドだけを
+    追記し、ジャーナルが大きくなったらスナップショットを一時ファイルに書き出して
+    os.replace で差し替える。スナップショットの GENERATION とジャーナル先頭の
+    世代が一致する場合のみ、読み込み時にジャーナルを再生する。
+    """
+
+    def __init__(self, path="settings.txt", compact_threshold=COMPACT_THRESHOLD_BYTES):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_threshold = compact_threshold
+        self.encoder = TextSettingsEncoder()
+        self.generation = None  # 未保存の場合は None
+        self._persisted = {}  # セクション名 -> (content, phase, teams) 保存済みの状態、または未解析の TextSection
+        self._last_section = None
+        self._journal_size = 0
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self, read_only=False):
+        """スナップショットとジャーナルを読み込み (section_data, last_section) を返す
+
+        セクションの中身は解析せずに TextSection で返す（ジャーナルの再生で
+        変更のあるセクションだけは解析して辞書にする）。read_only=True では
+        ジャーナルの作り直し・壊れた末尾の切り捨てをせず、ファイルに書き込まない
+        （書き出しなど読むだけの処理用。その後に save しないこと）。
+        """
+        parser = SettingsTextParser()
+        with open(self.path, "r", encoding="utf-8") as f:
+            section_data, last_section, generation = parser.split(f)
+        for lineno, message in parser.errors:
+            print(f"設定ファイル {lineno}行目を読み飛ばしました: {message}")
+
+        replayed = 0
+        valid_size = 0  # ジャーナルの先頭から正しく読めた行までのバイト数
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                for i, line in enumerate(f):
+                    if not line.endswith(b"\n"):
+                        break  # 書き込み途中で終了した末尾の行は捨てる
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if i == 0:
+                        if record.get("op") != "begin" or record.get("gen") != generation:
+                            break  # 畳み込み済みの古いジャーナル
+                        valid_size += len(line)
+                        continue
+                    try:
+                        target = section_data.get(record.get("s"))
+                        if isinstance(target, TextSection) and record["op"] not in ("section", "del_section"):
+                            section_data[record["s"]] = target.decode()
+                        name = apply_record(section_data, record)
+                    except (KeyError, IndexError, TypeError, AttributeError) as e:
+                        # スナップショットと合わないレコード（手で編集した場合など）以降は再生しない
+                        print(f"ジャーナル {i + 1}行目以降を読み飛ばしました: {e!r}")
+                        break
+                    if name is not None:
+                        last_section = name
+                    replayed += 1
+                    valid_size += len(line)
+        if replayed:
+            print(f"ジャーナルから{replayed}件の変更を再生しました")
+
+        self.generation = generation
+        self._remember(section_data, last_section)
+        if read_only:
+            return section_data, last_section
+        if replayed:
+            # 再生した内容はジャーナルに残っているため、次の保存から追記を続ける。
+            # 壊れた末尾の行は切り捨てる（残すと次の追記がその行の続きになり、以降を再生できない）
+            if os.path.getsize(self.journal_path) != valid_size:
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(valid_size)
+            self._journal_size = valid_size
+        else:
+            self._start_journal()
+        return section_data, last_section
+
+    def save(self, section_data, last_section):
+        """前回保存時からの差分をジャーナルに追記（必要ならスナップショットに畳み込む）"""
+        if self.generation is None:
+            self.compact(section_data, last_section)
+            return
+
+        records = []
+        if last_section != self._last_section:
+            records.append({"op": "last", "v": last_section})
+        for name in self._persisted:
+            if name not in section_data:
+                records.append({"op": "del_section", "s": name})
+        for name, section in section_data.items():
+            if name.startswith('_'):
+                continue
+            old = self._persisted.get(name)
+            if not isinstance(section, dict):
+                if section is old:
+                    continue  # 読み込んだまま開いていないセクションは変更もない
+                section = section.decode()
+            if old is not None and not isinstance(old, tuple):
+                # 読み込み後に開いたセクションは、解析した時点の内容と比べる
+                old = getattr(old, "decoded", None)
+            if old is None:
+                records.append({"op": "section", "s": name, "v": section})
+            else:
+                records.extend(diff_section(name, old, section))
+
+        if records:
+            payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_size += len(payload.encode("utf-8"))
+        self._remember(section_data, last_section)
+
+        if self._journal_size > self.compact_threshold:
+            self.compact(section_data, last_section)
+
+    def compact(self, section_data, last_section):
+        """全データをスナップショットとして書き出し、ジャーナルを空にする"""
+        generation = (self.generation or 0) + 1
+        text = self.encoder.encode(section_data, last_section, generation)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.generation = generation
+        self._start_journal()
+        self._remember(section_data, last_section)
+
+    def _start_journal(self):
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "begin", "gen": self.generation}) + "\n")
+        self._journal_size = 0
+
+    def _remember(self, section_data, last_section):
+        self._last_section = last_section
+        self._persisted = {
+            name: section if not isinstance(section, dict)
+            else (section.get("content"), section.get("phase"), list(section.get("teams", [])))
+            for name, section in section_data.items() if not name.startswith('_')
+        }
+
+
+class PickleSettingsStore:
+    """settings.pkl（旧 pickle 版と同じ形式: セクションの辞書 + "_last_section"）
+
+    差分保存はせず、保存のたびに全体を一時ファイルに書き出して os.replace で差し替える。
+    """
+
+    def __init__(self, path="settings.pkl"):
+        self.path = path
+        self.generation = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self, read_only=False):
+        import pickle
+        with open(self.path, "rb") as f:
+            data = pickle.load(f)
+        return _split_special_keys(data, self.path)
+
+    def save(self, section_data, last_section):
+        import pickle
+        data = _with_last_section(section_data, last_section)
+        _replace_file(self.path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+    compact = save
+
+
+class JsonSettingsStore:
+    """settings.json（旧 JSON 版と同じ形式: セクションの辞書 + "_last_section"）"""
+
+    def __init__(self, path="settings.json"):
+        self.path = path
+        self.generation = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self, read_only=False):
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return _split_special_keys(data, self.path)
+
+    def save(self, section_data, last_section):
+        data = _with_last_section(section_data, last_section)
+        _replace_file(self.path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    compact = save
+
+
+def _split_special_keys(data, path):
+    """旧形式の辞書から (section_data, last_section) を取り出す"""
+    if not isinstance(data, dict):
+        raise ValueError(f"設定ファイルが無効な形式です: {path}")
+    data = dict(data)
+    last_section = data.pop("_last_section", None)
+    data.pop("_window_geometry", None)
+    return data, last_section
+
+
+def _with_last_section(section_data, last_section):
+    data = {
+        name: section if isinstance(section, dict) else section.decode()
+        for name, section in section_data.items() if not name.startswith('_')
+    }
+    data["_last_section"] = last_section
+    return data
+
+
+def _replace_file(path, payload):
+    """一時ファイルに書き出してから差し替える"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SettingsWriter:
+    """設定の保存を専用スレッドで行う
+
+    submit されたスナップショットは書き込みスレッドがエンコード・保存する。
+    書き込み待ちのスナップショットがある間に新しいものが submit された場合、
+    古い方は書き込まずに新しい方で置き換える。
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._cond = threading.Condition()
+        self._pending = None  # (section_data, last_section, compact)
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="SettingsWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, section_data, last_section, compact=False):
+        """スナップショットの保存を依頼（書き込み待ちのものは置き換える）"""
+        with self._cond:
+            if self._closed:
+                return
+            if self._pending is not None:
+                compact = compact or self._pending[2]
+            self._pending = (section_data, last_section, compact)
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """依頼済みの保存がすべて終わるまで待つ"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        """残りを書き込んでからスレッドを終了"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                section_data, last_section, compact = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                if compact:
+                    self.store.compact(section_data, last_section)
+                else:
+                    self.store.save(section_data, last_section)
+                print(f"設定を保存しました（{self.store.path}）: {len(section_data)}セクション")
+            except Exception as e:
+                print(f"設定保存エラー: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
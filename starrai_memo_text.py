@@ -1,13 +1,34 @@
 import sys
+import time
+
+_STARTED_AT = time.perf_counter()  # 起動時間の計測用（PyQt5 の import を含める）
+
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QPushButton, QStackedWidget, QFrame, QInputDialog, QToolButton, 
     QMessageBox, QLineEdit, QTextEdit, QScrollArea, QSpinBox, QComboBox,
-    QGroupBox
+    QGroupBox, QListView, QStyledItemDelegate, QMenu, QFileDialog
 )
 from PyQt5.QtGui import QFont, QPalette, QColor
-from PyQt5.QtCore import Qt, QTimer
-import os
+from PyQt5.QtCore import (
+    Qt, QTimer, QAbstractListModel, QModelIndex, QPersistentModelIndex, QSize
+)
+from starrai_memo_backends import open_backend
+from starrai_memo_completion import completion_index
+from starrai_memo_cooccur import CooccurrenceIndex
+from starrai_memo_model import (
+    SCORE_SEPARATOR, Section, Team, format_team_line, iter_teams_from_lines, parse_score, sections_from_dict,
+    snapshot_sections
+)
+from starrai_memo_scheduler import idle_scheduler
+from starrai_memo_search import SearchIndex
+from starrai_memo_stats import UsageStats, UsageStatsPanel
+from starrai_memo_theme import DEFAULT_THEME, apply_theme, current_theme, theme_color
+
+VIRTUAL_ROW_THRESHOLD = 50  # この編成数以上のセクションは仮想化表示にする
+SEARCH_LIMIT = 100  # 検索で移動できる一致の最大数
+SORT_ORDERS = ("入力順", "スコアの高い順", "スコアの低い順")  # 並び替えの選択肢（添字で判定）
+IMPORT_BATCH = 50  # 取り込みで1回にセクションへ追加する編成数（1回の処理を1フレーム程度に抑える）
 
 class CollapsibleSection(QWidget):
     """折りたたみ可能なセクション"""
@@ -16,22 +37,7 @@ class CollapsibleSection(QWidget):
         self.toggle_button = QToolButton()
         self.toggle_button.setText(f"▶ {title}")
         self.toggle_button.setCheckable(True)
-        self.toggle_button.setStyleSheet("""
-            QToolButton {
-                border: none;
-                background: #f5f5f5;
-                padding: 8px;
-                text-align: left;
-                font-weight: bold;
-                border-radius: 3px;
-            }
-            QToolButton:hover {
-                background: #e8e8e8;
-            }
-            QToolButton:checked {
-                background: #d0d0d0;
-            }
-        """)
+        self.toggle_button.setObjectName("collapsibleToggle")
         self.toggle_button.clicked.connect(self.toggle_content)
 
         self.content_area = QWidget()
@@ -58,13 +64,20 @@ class CollapsibleSection(QWidget):
         self.content_layout.addWidget(widget)
 
 class SimpleTeamRow(QWidget):
-    """簡易編成表示行"""
-    def __init__(self, row_id, parent=None):
+    """簡易編成表示行（編成モデル Team の入力ウィジェット）"""
+    def __init__(self, team, parent=None, owner=None):
         super().__init__(parent)
-        self.row_id = row_id
-        self.parent_widget = parent
+        self.team = team
+        # 保存・削除を依頼する TeamCompositionWidget（仮想表示では Qt の親とは異なる）
+        self.parent_widget = owner if owner is not None else parent
         self.character_detail_widgets = []
+        self._binding = False  # モデル→ウィジェット反映中は変更シグナルを無視する
         self.setup_ui()
+        self.load_from_team()
+
+    @property
+    def row_id(self):
+        return self.team.row_id
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -73,13 +86,7 @@ class SimpleTeamRow(QWidget):
 
         # 編成行全体を囲むフレーム
         main_frame = QFrame()
-        main_frame.setStyleSheet("""
-            QFrame {
-                border: 2px solid #ddd;
-                border-radius: 8px;
-                background: #f9f9f9;
-            }
-        """)
+        main_frame.setObjectName("teamFrame")
         main_frame_layout = QVBoxLayout(main_frame)
         main_frame_layout.setContentsMargins(15, 15, 15, 15)
         main_frame_layout.setSpacing(10)
@@ -94,13 +101,7 @@ class SimpleTeamRow(QWidget):
             char_frame = QFrame()
             char_frame.setMinimumHeight(120)  # 最小高さに変更（固定→最小）
             char_frame.setMinimumWidth(140)  # 最小幅を設定
-            char_frame.setStyleSheet("""
-                QFrame { 
-                    border: 2px solid #bbb; 
-                    border-radius: 6px; 
-                    background: #ffffff; 
-                }
-            """)
+            char_frame.setObjectName("characterFrame")
             char_layout = QVBoxLayout(char_frame)
             char_layout.setContentsMargins(8, 8, 8, 8)
             char_layout.setSpacing(6)
@@ -108,16 +109,7 @@ class SimpleTeamRow(QWidget):
             # キャラクター番号ラベル
             char_label = QLabel(f"{i+1}人目")
             char_label.setFixedHeight(20)
-            char_label.setStyleSheet("""
-                QLabel {
-                    font-size: 11px;
-                    font-weight: bold;
-                    color: #666;
-                    background: #f0f0f0;
-                    padding: 3px 6px;
-                    border-radius: 3px;
-                }
-            """)
+            char_label.setObjectName("characterLabel")
             char_layout.addWidget(char_label)
 
             # 簡易情報行
@@ -128,164 +120,80 @@ class SimpleTeamRow(QWidget):
             char_edit = QLineEdit()
             char_edit.setPlaceholderText(f"キャラ名")
             char_edit.setFixedHeight(24)
-            char_edit.setStyleSheet("""
-                QLineEdit {
-                    border: 1px solid #ccc; 
-                    background: #fafafa; 
-                    font-size: 11px;
-                    padding: 4px 6px;
-                    border-radius: 3px;
-                }
-                QLineEdit:focus {
-                    border: 2px solid #4a90e2;
-                    background: #ffffff;
-                }
-            """)
+            char_edit.setObjectName("characterNameEdit")
+            completion_index().attach(char_edit, "name")
             simple_layout.addWidget(char_edit)
 
             # E（凸数）
             e_label = QLabel("E")
             e_label.setFixedSize(15, 24)
-            e_label.setStyleSheet("font-size: 10px; color: #666; font-weight: bold;")
+            e_label.setProperty("role", "field")
             simple_layout.addWidget(e_label)
             
             e_spin = QSpinBox()
             e_spin.setRange(0, 6)
             e_spin.setFixedSize(40, 24)
-            e_spin.setStyleSheet("""
-                QSpinBox {
-                    border: 1px solid #ccc; 
-                    background: #fafafa; 
-                    font-size: 11px;
-                    padding: 3px;
-                    border-radius: 3px;
-                }
-                QSpinBox:focus {
-                    border: 2px solid #4a90e2;
-                    background: #ffffff;
-                }
-            """)
+            e_spin.setObjectName("rankSpin")
             simple_layout.addWidget(e_spin)
 
             # S（光円錐重畳）
             s_label = QLabel("S")
             s_label.setFixedSize(15, 24)
-            s_label.setStyleSheet("font-size: 10px; color: #666; font-weight: bold;")
+            s_label.setProperty("role", "field")
             simple_layout.addWidget(s_label)
             
             s_spin = QSpinBox()
             s_spin.setRange(1, 5)
             s_spin.setValue(1)
             s_spin.setFixedSize(40, 24)
-            s_spin.setStyleSheet("""
-                QSpinBox {
-                    border: 1px solid #ccc; 
-                    background: #fafafa; 
-                    font-size: 11px;
-                    padding: 3px;
-                    border-radius: 3px;
-                }
-                QSpinBox:focus {
-                    border: 2px solid #4a90e2;
-                    background: #ffffff;
-                }
-            """)
+            s_spin.setObjectName("rankSpin")
             simple_layout.addWidget(s_spin)
 
             # 詳細表示ボタン
             detail_btn = QPushButton("▼")
             detail_btn.setCheckable(True)
             detail_btn.setFixedSize(24, 24)
-            detail_btn.setStyleSheet("""
-                QPushButton {
-                    font-size: 10px;
-                    padding: 4px;
-                    background: #e8e8e8;
-                    border: 1px solid #ccc;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background: #d8d8d8;
-                }
-                QPushButton:checked {
-                    background: #d0d0d0;
-                    color: #333;
-                }
-            """)
+            detail_btn.setObjectName("detailButton")
             detail_btn.clicked.connect(lambda checked, idx=i: self.toggle_character_detail(idx, checked))
             
-            # 入力フィールドの変更を監視してリアルタイム保存
-            char_edit.textChanged.connect(self.save_data_delayed)
-            e_spin.valueChanged.connect(self.save_data_delayed)
-            s_spin.valueChanged.connect(self.save_data_delayed)
+            # 入力フィールドの変更をモデルに反映してリアルタイム保存
+            char_edit.textChanged.connect(lambda text, idx=i: self.update_character(idx, 'name', text))
+            e_spin.valueChanged.connect(lambda value, idx=i: self.update_character(idx, 'eidolon', value))
+            s_spin.valueChanged.connect(lambda value, idx=i: self.update_character(idx, 'superimpose', value))
             simple_layout.addWidget(detail_btn)
 
             char_layout.addLayout(simple_layout)
 
-            # 詳細エリア（初期は非表示）
-            detail_widget = self.create_character_detail_widget(i)
-            detail_widget.hide()
-            char_layout.addWidget(detail_widget)
-
+            # 詳細エリアは初めて開いたときに作成（それまでの値はモデルが保持）
             main_layout.addWidget(char_frame)
             self.character_edits.append({
                 'name': char_edit,
                 'eidolon': e_spin,
                 'superimpose': s_spin,
                 'detail_btn': detail_btn,
-                'detail_widget': detail_widget
+                'detail_widget': None,
+                'layout': char_layout
             })
-            self.character_detail_widgets.append(detail_widget)
+            self.character_detail_widgets.append(None)
 
         # スコア入力
         score_frame = QFrame()
         score_frame.setMinimumHeight(120)  # キャラフレームと同じ最小高さ
         score_frame.setFixedWidth(120)
-        score_frame.setStyleSheet("""
-            QFrame { 
-                border: 2px solid #4a90e2; 
-                border-radius: 6px; 
-                background: #f0f8ff;
-            }
-        """)
+        score_frame.setObjectName("scoreFrame")
         score_layout = QVBoxLayout(score_frame)
         score_layout.setContentsMargins(10, 8, 10, 8)
         score_layout.setSpacing(4)
         
         score_title = QLabel("スコア")
         score_title.setFixedHeight(20)
-        score_title.setStyleSheet("""
-            QLabel {
-                font-size: 12px; 
-                color: #4a90e2; 
-                font-weight: bold;
-                background: #e6f3ff;
-                padding: 3px 6px;
-                border-radius: 3px;
-                text-align: center;
-            }
-        """)
+        score_title.setObjectName("scoreTitle")
         score_layout.addWidget(score_title)
         
         self.score_edit = QLineEdit()
         self.score_edit.setPlaceholderText("30000")
         self.score_edit.setFixedHeight(30)
-        self.score_edit.setStyleSheet("""
-            QLineEdit {
-                border: 1px solid #4a90e2; 
-                background: #ffffff; 
-                font-size: 14px; 
-                font-weight: bold;
-                padding: 6px 8px;
-                border-radius: 4px;
-                text-align: center;
-            }
-            QLineEdit:focus {
-                border: 2px solid #4a90e2;
-                background: #f8fcff;
-            }
-        """)
+        self.score_edit.setObjectName("scoreEdit")
         score_layout.addWidget(self.score_edit)
         
         main_layout.addWidget(score_frame)
@@ -294,26 +202,12 @@ class SimpleTeamRow(QWidget):
         delete_btn = QToolButton()
         delete_btn.setText("×")
         delete_btn.setFixedSize(32, 32)
-        delete_btn.setStyleSheet("""
-            QToolButton {
-                color: #d32f2f;
-                background: #ffebee;
-                border: 2px solid #f8bbd9;
-                border-radius: 16px;
-                font-size: 16px;
-                font-weight: bold;
-            }
-            QToolButton:hover {
-                color: #b71c1c;
-                background: #ffcdd2;
-                border-color: #f06292;
-            }
-        """)
+        delete_btn.setObjectName("deleteButton")
         delete_btn.clicked.connect(self.delete_row)
         main_layout.addWidget(delete_btn)
 
         # スコア入力の変更も監視
-        self.score_edit.textChanged.connect(self.save_data_delayed)
+        self.score_edit.textChanged.connect(self.update_score)
         
         main_frame_layout.addLayout(main_layout)
         layout.addWidget(main_frame)
@@ -321,14 +215,7 @@ class SimpleTeamRow(QWidget):
     def create_character_detail_widget(self, char_index):
         """キャラクター詳細ウィジェット作成"""
         detail_widget = QWidget()
-        detail_widget.setStyleSheet("""
-            QWidget {
-                background: #f8f8f8;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                margin-top: 5px;
-            }
-        """)
+        detail_widget.setObjectName("characterDetail")
         detail_layout = QVBoxLayout(detail_widget)
         detail_layout.setContentsMargins(8, 8, 8, 8)
         detail_layout.setSpacing(6)
@@ -342,30 +229,15 @@ class SimpleTeamRow(QWidget):
         level_spin.setRange(1, 80)
         level_spin.setValue(80)
         level_spin.setMinimumWidth(60)
-        level_spin.setStyleSheet("""
-            QSpinBox {
-                font-size: 10px; 
-                padding: 4px; 
-                border: 1px solid #ccc;
-                border-radius: 3px;
-                background: #ffffff;
-            }
-        """)
+        level_spin.setObjectName("detailSpin")
         info_layout.addWidget(level_spin, 0, 1)
         
         # 光円錐名
         info_layout.addWidget(QLabel("光円錐:"), 1, 0)
         lightcone_edit = QLineEdit()
         lightcone_edit.setPlaceholderText("光円錐名")
-        lightcone_edit.setStyleSheet("""
-            QLineEdit {
-                font-size: 10px; 
-                padding: 5px; 
-                border: 1px solid #ccc; 
-                border-radius: 3px;
-                background: #ffffff;
-            }
-        """)
+        lightcone_edit.setObjectName("detailEdit")
+        completion_index().attach(lightcone_edit, "lightcone")
         info_layout.addWidget(lightcone_edit, 1, 1, 1, 2)
         
         detail_layout.addLayout(info_layout)
@@ -379,16 +251,7 @@ class SimpleTeamRow(QWidget):
             relic_layout.addWidget(QLabel(f"{part}:"), i//2, (i%2)*2)
             combo = QComboBox()
             combo.addItems(["HP%", "攻撃%", "防御%", "会心率", "会心DMG", "撃破", "回復効率", "属性DMG"])
-            combo.setStyleSheet("""
-                QComboBox {
-                    font-size: 9px; 
-                    padding: 3px;
-                    border: 1px solid #ccc;
-                    border-radius: 3px;
-                    background: #ffffff;
-                    min-width: 80px;
-                }
-            """)
+            combo.setObjectName("mainStatCombo")
             relic_layout.addWidget(combo, i//2, (i%2)*2+1)
             main_stat_combos[part] = combo
         
@@ -398,15 +261,7 @@ class SimpleTeamRow(QWidget):
         memo_edit = QTextEdit()
         memo_edit.setMaximumHeight(50)
         memo_edit.setPlaceholderText("セット効果、サブ効果など...")
-        memo_edit.setStyleSheet("""
-            QTextEdit {
-                font-size: 9px; 
-                padding: 5px; 
-                border: 1px solid #ccc; 
-                border-radius: 3px;
-                background: #ffffff;
-            }
-        """)
+        memo_edit.setObjectName("detailMemo")
         detail_layout.addWidget(memo_edit)
         
         # ウィジェット情報を保存
@@ -416,11 +271,11 @@ class SimpleTeamRow(QWidget):
         detail_widget.memo_edit = memo_edit
         
         # 詳細入力フィールドの変更も監視
-        level_spin.valueChanged.connect(self.save_data_delayed)
-        lightcone_edit.textChanged.connect(self.save_data_delayed)
-        memo_edit.textChanged.connect(self.save_data_delayed)
-        for combo in main_stat_combos.values():
-            combo.currentTextChanged.connect(self.save_data_delayed)
+        level_spin.valueChanged.connect(lambda value: self.update_character(char_index, 'level', value))
+        lightcone_edit.textChanged.connect(lambda text: self.update_character(char_index, 'lightcone', text))
+        memo_edit.textChanged.connect(lambda: self.update_character(char_index, 'memo', memo_edit.toPlainText()))
+        for part, combo in main_stat_combos.items():
+            combo.currentTextChanged.connect(lambda text, p=part: self.update_main_stat(char_index, p, text))
         
         return detail_widget
 
@@ -429,24 +284,80 @@ class SimpleTeamRow(QWidget):
         if hasattr(self.parent_widget, 'save_data_delayed'):
             self.parent_widget.save_data_delayed()
 
+    def update_character(self, char_index, key, value):
+        """キャラクターの入力内容をモデルに反映"""
+        if self._binding:
+            return
+        self.team.set_character_field(char_index, key, value)
+        self.save_data_delayed()
+
+    def update_main_stat(self, char_index, part, value):
+        """遺物メイン効果の選択をモデルに反映"""
+        if self._binding:
+            return
+        self.team.set_main_stat(char_index, part, value)
+        self.save_data_delayed()
+
+    def update_score(self, text):
+        """スコアの入力内容をモデルに反映"""
+        if self._binding:
+            return
+        self.team.set_score(text)
+        self.save_data_delayed()
+
+    def ensure_detail_widget(self, char_index):
+        """キャラクター詳細ウィジェットを必要になったときに作成"""
+        detail_widget = self.character_detail_widgets[char_index]
+        if detail_widget is None:
+            detail_widget = self.create_character_detail_widget(char_index)
+            detail_widget.hide()
+            self.character_edits[char_index]['layout'].addWidget(detail_widget)
+            self.character_edits[char_index]['detail_widget'] = detail_widget
+            self.character_detail_widgets[char_index] = detail_widget
+            self.load_character_detail(char_index)
+        return detail_widget
+
+    def load_character_detail(self, char_index):
+        """モデルの詳細情報を詳細ウィジェットに反映"""
+        detail_widget = self.character_detail_widgets[char_index]
+        char = self.team.characters[char_index]
+        binding = self._binding
+        self._binding = True
+        try:
+            detail_widget.level_spin.setValue(char.level)
+            detail_widget.lightcone_edit.setText(char.lightcone)
+            detail_widget.memo_edit.setPlainText(char.memo)
+            
+            # メイン効果設定
+            for part, combo in detail_widget.main_stat_combos.items():
+                index = combo.findText(char.main_stats.get(part, ''))
+                # 一覧にない値は先頭（既定の HP%）に戻す（再利用した行に前の編成の値を残さない）
+                combo.setCurrentIndex(index if index >= 0 else 0)
+        finally:
+            self._binding = binding
+
     def toggle_character_detail(self, char_index, show):
         """キャラクター詳細の表示/非表示を切り替え"""
-        detail_widget = self.character_edits[char_index]['detail_widget']
         detail_btn = self.character_edits[char_index]['detail_btn']
         
         if show:
+            detail_widget = self.ensure_detail_widget(char_index)
             detail_widget.show()
             detail_btn.setText("▲")
             # 親フレームの高さを動的に調整
             self.adjustSize()
         else:
-            detail_widget.hide()
+            detail_widget = self.character_detail_widgets[char_index]
+            if detail_widget is not None:
+                detail_widget.hide()
             detail_btn.setText("▼")
             # 親フレームの高さを動的に調整
             self.adjustSize()
+        if hasattr(self.parent_widget, 'row_size_changed'):
+            self.parent_widget.row_size_changed(self)
         
         # 詳細表示状態の変更を保存
-        self.save_data_delayed()
+        self.update_character(char_index, 'detail_shown', show)
 
     def delete_row(self):
         """行を削除"""
@@ -454,61 +365,36 @@ class SimpleTeamRow(QWidget):
             self.parent_widget.delete_team_row(self.row_id)
 
     def get_simple_data(self):
-        """簡易データを取得"""
-        characters = []
-        for i, char_edit in enumerate(self.character_edits):
-            detail_widget = self.character_detail_widgets[i]
-            
-            char_data = {
-                'name': char_edit['name'].text(),
-                'eidolon': char_edit['eidolon'].value(),
-                'superimpose': char_edit['superimpose'].value(),
-                'level': detail_widget.level_spin.value(),
-                'lightcone': detail_widget.lightcone_edit.text(),
-                'main_stats': {part: combo.currentText() for part, combo in detail_widget.main_stat_combos.items()},
-                'memo': detail_widget.memo_edit.toPlainText(),
-                'detail_shown': char_edit['detail_btn'].isChecked()
-            }
-            characters.append(char_data)
-        
-        return {
-            'characters': characters,
-            'score': self.score_edit.text()
-        }
+        """簡易データを取得（モデルの保存用辞書）"""
+        return self.team.to_dict()
 
-    def set_simple_data(self, data):
-        """簡易データを設定"""
-        if not data:
-            return
-        
-        characters = data.get('characters', [])
-        for i, char_edit in enumerate(self.character_edits):
-            if i < len(characters):
-                char_data = characters[i]
-                char_edit['name'].setText(char_data.get('name', ''))
-                char_edit['eidolon'].setValue(char_data.get('eidolon', 0))
-                char_edit['superimpose'].setValue(char_data.get('superimpose', 1))
-                
-                # 詳細情報も設定
-                detail_widget = self.character_detail_widgets[i]
-                detail_widget.level_spin.setValue(char_data.get('level', 80))
-                detail_widget.lightcone_edit.setText(char_data.get('lightcone', ''))
-                detail_widget.memo_edit.setPlainText(char_data.get('memo', ''))
+    def bind_team(self, team):
+        """別の編成モデルに付け替える（ウィジェットは作り直さずに再利用する）"""
+        self.team = team
+        self.load_from_team()
+
+    def load_from_team(self):
+        """モデルの内容をウィジェットに反映"""
+        self._binding = True
+        try:
+            for i, char_edit in enumerate(self.character_edits):
+                char = self.team.characters[i]
+                char_edit['name'].setText(char.name)
+                char_edit['eidolon'].setValue(char.eidolon)
+                char_edit['superimpose'].setValue(char.superimpose)
                 
-                # メイン効果設定
-                main_stats = char_data.get('main_stats', {})
-                for part, combo in detail_widget.main_stat_combos.items():
-                    if part in main_stats:
-                        index = combo.findText(main_stats[part])
-                        if index >= 0:
-                            combo.setCurrentIndex(index)
+                # 詳細情報は詳細ウィジェットが作成済みの場合のみ設定
+                if self.character_detail_widgets[i] is not None:
+                    self.load_character_detail(i)
                 
                 # 詳細表示状態の復元
-                if char_data.get('detail_shown', False):
-                    char_edit['detail_btn'].setChecked(True)
-                    self.toggle_character_detail(i, True)
-        
-        self.score_edit.setText(data.get('score', ''))
+                if char.detail_shown != char_edit['detail_btn'].isChecked():
+                    char_edit['detail_btn'].setChecked(char.detail_shown)
+                    self.toggle_character_detail(i, char.detail_shown)
+            
+            self.score_edit.setText(self.team.score)
+        finally:
+            self._binding = False
 
 class DetailTeamWidget(QWidget):
     """詳細編成ウィジェット"""
@@ -528,20 +414,7 @@ class DetailTeamWidget(QWidget):
 
         for i in range(4):
             char_group = QGroupBox(f"キャラクター {i+1}")
-            char_group.setStyleSheet("""
-                QGroupBox {
-                    font-weight: bold;
-                    border: 2px solid #ccc;
-                    border-radius: 5px;
-                    margin: 5px 0;
-                    padding-top: 10px;
-                }
-                QGroupBox::title {
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 5px;
-                }
-            """)
+            char_group.setObjectName("detailGroup")
             char_layout = QVBoxLayout(char_group)
             
             # 基本情報
@@ -550,7 +423,7 @@ class DetailTeamWidget(QWidget):
             # キャラ名
             basic_layout.addWidget(QLabel("キャラ名:"), 0, 0)
             name_edit = QLineEdit()
-            name_edit.setStyleSheet("padding: 5px; border: 1px solid #ccc; border-radius: 3px;")
+            name_edit.setObjectName("detailTeamEdit")
             basic_layout.addWidget(name_edit, 0, 1)
             
             # レベル
@@ -558,20 +431,20 @@ class DetailTeamWidget(QWidget):
             level_spin = QSpinBox()
             level_spin.setRange(1, 80)
             level_spin.setValue(80)
-            level_spin.setStyleSheet("padding: 2px; border: 1px solid #ccc;")
+            level_spin.setObjectName("detailTeamSpin")
             basic_layout.addWidget(level_spin, 0, 3)
             
             # 凸数
             basic_layout.addWidget(QLabel("凸:"), 1, 0)
             eidolon_spin = QSpinBox()
             eidolon_spin.setRange(0, 6)
-            eidolon_spin.setStyleSheet("padding: 2px; border: 1px solid #ccc;")
+            eidolon_spin.setObjectName("detailTeamSpin")
             basic_layout.addWidget(eidolon_spin, 1, 1)
             
             # 光円錐
             basic_layout.addWidget(QLabel("光円錐:"), 1, 2)
             lightcone_edit = QLineEdit()
-            lightcone_edit.setStyleSheet("padding: 5px; border: 1px solid #ccc; border-radius: 3px;")
+            lightcone_edit.setObjectName("detailTeamEdit")
             basic_layout.addWidget(lightcone_edit, 1, 3)
             
             # 光円錐重畳
@@ -579,7 +452,7 @@ class DetailTeamWidget(QWidget):
             superimpose_spin = QSpinBox()
             superimpose_spin.setRange(1, 5)
             superimpose_spin.setValue(1)
-            superimpose_spin.setStyleSheet("padding: 2px; border: 1px solid #ccc;")
+            superimpose_spin.setObjectName("detailTeamSpin")
             basic_layout.addWidget(superimpose_spin, 2, 1)
             
             char_layout.addLayout(basic_layout)
@@ -598,7 +471,7 @@ class DetailTeamWidget(QWidget):
                 main_stats_layout.addWidget(QLabel(f"{part}:"), j, 0)
                 combo = QComboBox()
                 combo.addItems(["HP%", "攻撃力%", "防御力%", "効果命中", "撃破特効", "エネルギー回復効率", "会心率", "会心ダメージ", "治療量アップ", "属性ダメージ"])
-                combo.setStyleSheet("padding: 3px; border: 1px solid #ccc;")
+                combo.setObjectName("detailTeamCombo")
                 main_stats_layout.addWidget(combo, j, 1)
                 main_stat_combos[part] = combo
             
@@ -611,13 +484,13 @@ class DetailTeamWidget(QWidget):
             memo_layout.addWidget(QLabel("セット効果:"))
             relic_set_edit = QTextEdit()
             relic_set_edit.setMaximumHeight(50)
-            relic_set_edit.setStyleSheet("padding: 5px; border: 1px solid #ccc; border-radius: 3px;")
+            relic_set_edit.setObjectName("detailTeamText")
             memo_layout.addWidget(relic_set_edit)
             
             memo_layout.addWidget(QLabel("重要サブ効果:"))
             sub_stats_edit = QTextEdit()
             sub_stats_edit.setMaximumHeight(50)
-            sub_stats_edit.setStyleSheet("padding: 5px; border: 1px solid #ccc; border-radius: 3px;")
+            sub_stats_edit.setObjectName("detailTeamText")
             memo_layout.addWidget(sub_stats_edit)
             
             relic_section.add_widget(memo_widget)
@@ -643,26 +516,13 @@ class DetailTeamWidget(QWidget):
 
         # 戦術メモ
         strategy_group = QGroupBox("戦術・立ち回りメモ")
-        strategy_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #ccc;
-                border-radius: 5px;
-                margin: 5px 0;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """)
+        strategy_group.setObjectName("detailGroup")
         strategy_layout = QVBoxLayout(strategy_group)
         
         self.strategy_edit = QTextEdit()
         self.strategy_edit.setMaximumHeight(80)
         self.strategy_edit.setPlaceholderText("ローテーション、立ち回り、注意点など...")
-        self.strategy_edit.setStyleSheet("padding: 5px; border: 1px solid #ccc; border-radius: 3px;")
+        self.strategy_edit.setObjectName("detailTeamText")
         strategy_layout.addWidget(self.strategy_edit)
         
         layout.addWidget(strategy_group)
@@ -714,13 +574,232 @@ class DetailTeamWidget(QWidget):
         
         self.strategy_edit.setPlainText(data.get('strategy', ''))
 
+class TeamListModel(QAbstractListModel):
+    """セクションの編成一覧を Qt のリストモデルとして公開
+
+    set_order で表示順（並び替え・絞り込み後の編成のリスト）を指定すると、
+    セクションの編成の順番は変えずにその順で表示する。
+    """
+    def __init__(self, section, parent=None):
+        super().__init__(parent)
+        self.section = section
+        self.order = None  # 表示順の編成のリスト（None はセクションの順番のまま）
+
+    @property
+    def teams(self):
+        return self.section.teams if self.order is None else self.order
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.teams)
+
+    def data(self, index, role=Qt.DisplayRole):
+        teams = self.teams
+        if not index.isValid() or index.row() >= len(teams):
+            return None
+        team = teams[index.row()]
+        if role == Qt.DisplayRole:
+            return format_team_line(team) or "（未入力の編成）"
+        if role == Qt.UserRole:
+            return team
+        return None
+
+    def row_of(self, team):
+        """編成の行番号（見つからなければ -1）"""
+        for row, t in enumerate(self.teams):
+            if t is team:
+                return row
+        return -1
+
+    def reset(self):
+        """セクションの編成が差し替えられたときに呼ぶ"""
+        self.beginResetModel()
+        self.endResetModel()
+
+    def set_order(self, teams):
+        """表示順を差し替える（None でセクションの順番に戻す）"""
+        self.beginResetModel()
+        self.order = None if teams is None else list(teams)
+        self.endResetModel()
+
+    def add_new_team(self):
+        """空の編成を末尾に追加"""
+        row = len(self.teams)
+        self.beginInsertRows(QModelIndex(), row, row)
+        team = self.section.new_team()
+        if self.order is not None:
+            self.order.append(team)
+        self.endInsertRows()
+        return team
+
+    def add_teams(self, teams):
+        """編成をまとめて末尾に追加（行の挿入の通知は1回）"""
+        row = len(self.teams)
+        self.beginInsertRows(QModelIndex(), row, row + len(teams) - 1)
+        self.section.add_teams(teams)
+        if self.order is not None:
+            self.order.extend(teams)
+        self.endInsertRows()
+
+    def remove_team(self, row_id):
+        """row_id の編成を削除"""
+        for row, team in enumerate(self.teams):
+            if team.row_id == row_id:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                if self.order is not None:
+                    del self.order[row]
+                self.section.remove_team(row_id)
+                self.endRemoveRows()
+                return
+        self.section.remove_team(row_id)  # 絞り込みで表示していない編成
+
+class TeamRowDelegate(QStyledItemDelegate):
+    """編成行のデリゲート（エディタとして SimpleTeamRow を使う）"""
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.row_height = 170  # エディタ未生成の行の高さ（最初のエディタで実測して更新）
+        self._measured = False
+        self.editor_pool = []  # 閉じたエディタ（スクロールで再び開くときに再利用）
+
+    def createEditor(self, parent, option, index):
+        team = index.data(Qt.UserRole)
+        if self.editor_pool:
+            editor = self.editor_pool.pop()
+            editor.setParent(parent)
+            editor.bind_team(team)
+            return editor
+        editor = SimpleTeamRow(team, parent, owner=self.view.owner)
+        if not self._measured:
+            self.row_height = editor.sizeHint().height()
+            self._measured = True
+        return editor
+
+    def destroyEditor(self, editor, index):
+        editor.hide()
+        self.editor_pool.append(editor)
+
+    def setEditorData(self, editor, index):
+        pass  # 行はモデルを直接読む
+
+    def setModelData(self, editor, model, index):
+        pass  # 入力時にモデルへ反映済み
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+    def sizeHint(self, option, index):
+        width = self.view.viewport().width() - 2 * self.view.spacing()
+        editor = self.view.indexWidget(index)
+        if editor is not None:
+            return QSize(width, editor.sizeHint().height())
+        return QSize(width, self.row_height)
+
+    def paint(self, painter, option, index):
+        if self.view.indexWidget(index) is not None:
+            return
+        # スクロール中などエディタがまだない行は要約だけを描く
+        painter.save()
+        painter.setPen(QColor(theme_color("row_border")))
+        painter.setBrush(QColor(theme_color("row_bg")))
+        painter.drawRoundedRect(option.rect.adjusted(5, 5, -5, -5), 8, 8)
+        painter.setPen(QColor(theme_color("muted")))
+        painter.drawText(option.rect.adjusted(20, 0, -20, 0), Qt.AlignVCenter | Qt.AlignLeft, index.data())
+        painter.restore()
+
+class TeamListView(QListView):
+    """仮想化された編成一覧（表示中の行にだけ SimpleTeamRow を生成する）"""
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+        self._editors = {}  # Team -> QPersistentModelIndex
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setEditTriggers(QListView.NoEditTriggers)
+        self.setSpacing(5)
+        self.setItemDelegate(TeamRowDelegate(self))
+        self.verticalScrollBar().valueChanged.connect(self.update_visible_editors)
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.modelReset.connect(self._on_model_reset)
+        model.rowsInserted.connect(self.schedule_update)
+        model.rowsRemoved.connect(self.schedule_update)
+
+    def _on_model_reset(self):
+        self._editors.clear()  # リセット時にエディタは破棄される
+        self.schedule_update()
+
+    def schedule_update(self, *args):
+        """レイアウト確定後にエディタを更新"""
+        QTimer.singleShot(0, self.update_visible_editors)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_visible_editors()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_update()
+
+    def visible_rows(self):
+        """表示範囲にある行番号"""
+        model = self.model()
+        count = model.rowCount() if model is not None else 0
+        if count == 0 or not self.isVisible():
+            return range(0)
+        viewport = self.viewport().rect()
+        # 表示範囲の下端より下にはみ出していない最初の行を二分探索
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.visualRect(model.index(mid)).bottom() < viewport.top():
+                lo = mid + 1
+            else:
+                hi = mid
+        last = lo
+        while last < count:
+            rect = self.visualRect(model.index(last))
+            if not rect.isValid() or rect.top() > viewport.bottom():
+                break
+            last += 1
+        return range(lo, last)
+
+    def update_visible_editors(self, *args):
+        """表示範囲の行にだけエディタを開き、範囲外のエディタを閉じる"""
+        model = self.model()
+        if model is None:
+            return
+        wanted = {}
+        for row in self.visible_rows():
+            index = model.index(row)
+            wanted[index.data(Qt.UserRole)] = index
+        
+        for team, persistent in list(self._editors.items()):
+            if team not in wanted:
+                if persistent.isValid():
+                    self.closePersistentEditor(QModelIndex(persistent))
+                del self._editors[team]
+        for team, index in wanted.items():
+            if team not in self._editors:
+                self.openPersistentEditor(index)
+                self._editors[team] = QPersistentModelIndex(index)
+
+    def team_size_changed(self, team):
+        """エディタの高さが変わったことをビューに通知"""
+        row = self.model().row_of(team)
+        if row >= 0:
+            self.itemDelegate().sizeHintChanged.emit(self.model().index(row))
+
 class TeamCompositionWidget(QWidget):
-    """編成管理ウィジェット"""
-    def __init__(self):
+    """編成管理ウィジェット（セクションモデル Section の編成一覧）"""
+    def __init__(self, section):
         super().__init__()
+        self.section = section
         self.team_rows = []
+        self.row_pool = []  # 削除・余剰で非表示にした行（次の追加・復元で再利用）
         self.detail_widgets = {}
-        self.next_row_id = 1
+        self.virtual_mode = False  # True の間は TeamListView で表示
+        self.shown_generation = -1  # 行に反映済みのセクションの generation
         self.save_timer = QTimer()
         self.save_timer.setSingleShot(True)
         self.save_timer.timeout.connect(self.save_data_now)
@@ -738,7 +817,7 @@ class TeamCompositionWidget(QWidget):
         while parent and not hasattr(parent, 'save_settings'):
             parent = parent.parent()
         if parent and hasattr(parent, 'save_settings'):
-            parent.save_settings()
+            parent.save_settings(self.section.name)
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -751,41 +830,41 @@ class TeamCompositionWidget(QWidget):
         # 追加ボタン
         add_button = QPushButton("+ 編成を追加")
         add_button.setFixedHeight(40)
-        add_button.setStyleSheet("""
-            QPushButton {
-                background: #f0f8ff;
-                border: 2px dashed #4a90e2;
-                border-radius: 5px;
-                padding: 10px;
-                color: #4a90e2;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #e6f3ff;
-            }
-        """)
+        add_button.setObjectName("addTeamButton")
         add_button.clicked.connect(self.add_team_row)
         button_layout.addWidget(add_button)
         
         # コピーボタン
         copy_button = QPushButton("📋 編成をコピー")
         copy_button.setFixedHeight(40)
-        copy_button.setStyleSheet("""
-            QPushButton {
-                background: #f0fff0;
-                border: 2px solid #90ee90;
-                border-radius: 5px;
-                padding: 10px;
-                color: #228b22;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #e6ffe6;
-            }
-        """)
+        copy_button.setObjectName("copyTeamsButton")
         copy_button.clicked.connect(self.copy_teams_to_clipboard)
         button_layout.addWidget(copy_button)
         
+        # 取り込みボタン（コピーした形式のテキストを編成として追加）
+        import_button = QPushButton("📥 編成を取り込み")
+        import_button.setFixedHeight(40)
+        import_button.setObjectName("importTeamsButton")
+        import_menu = QMenu(import_button)
+        import_menu.addAction("クリップボードから", self.import_teams_from_clipboard)
+        import_menu.addAction("テキストファイルから...", self.import_teams_from_file)
+        import_button.setMenu(import_menu)
+        button_layout.addWidget(import_button)
+        
+        # スコアでの並び替え・絞り込み（行は作り直さずに並べ替える）
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(SORT_ORDERS)
+        self.sort_combo.setObjectName("sortCombo")
+        self.sort_combo.currentIndexChanged.connect(self.apply_score_view)
+        button_layout.addWidget(self.sort_combo)
+        
+        self.min_score_edit = QLineEdit()
+        self.min_score_edit.setPlaceholderText("最低スコア")
+        self.min_score_edit.setFixedWidth(90)
+        self.min_score_edit.setObjectName("minScoreEdit")
+        self.min_score_edit.textChanged.connect(self.apply_score_view)
+        button_layout.addWidget(self.min_score_edit)
+        
         layout.addLayout(button_layout)
         
         # ヘッダー
@@ -793,13 +872,13 @@ class TeamCompositionWidget(QWidget):
         header_layout.setContentsMargins(20, 0, 20, 0)
         
         header_label = QLabel("キャラ編成")
-        header_label.setStyleSheet("font-size: 12px; font-weight: bold; color: #333;")
+        header_label.setProperty("role", "header")
         header_layout.addWidget(header_label)
         
         header_layout.addStretch()
         
         score_label = QLabel("スコア")
-        score_label.setStyleSheet("font-size: 12px; font-weight: bold; color: #333;")
+        score_label.setProperty("role", "header")
         header_layout.addWidget(score_label)
         
         # 削除ボタン用のスペース
@@ -808,37 +887,11 @@ class TeamCompositionWidget(QWidget):
         layout.addLayout(header_layout)
         
         # スクロール可能な編成行一覧
-        scroll_area = QScrollArea()
+        self.scroll_area = scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setStyleSheet("""
-            QScrollArea {
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                background: #fafafa;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #f0f0f0;
-                width: 12px;
-                border-radius: 6px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #c0c0c0;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #a0a0a0;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                border: none;
-                background: none;
-                height: 0px;
-            }
-        """)
+        scroll_area.setObjectName("teamScroll")
         
         self.scroll_widget = QWidget()
         self.rows_layout = QVBoxLayout(self.scroll_widget)
@@ -848,32 +901,27 @@ class TeamCompositionWidget(QWidget):
         self.rows_layout.addStretch()
         
         scroll_area.setWidget(self.scroll_widget)
-        layout.addWidget(scroll_area)
+        
+        # 編成数が多いセクション用の仮想化表示（表示中の行だけウィジェットを生成）
+        self.team_model = TeamListModel(self.section, self)
+        self.list_view = TeamListView(self)
+        self.list_view.setModel(self.team_model)
+        self.list_view.setObjectName("teamList")
+        
+        self.rows_stack = QStackedWidget()
+        self.rows_stack.addWidget(scroll_area)
+        self.rows_stack.addWidget(self.list_view)
+        layout.addWidget(self.rows_stack)
 
     def copy_teams_to_clipboard(self):
         """編成情報をクリップボードにコピー"""
-        if not self.team_rows:
+        if not self.section.teams:
             return
         
         copy_text = []
-        for i, row in enumerate(self.team_rows):
-            row_data = row.get_simple_data()
-            characters = row_data.get('characters', [])
-            score = row_data.get('score', '')
-            
-            # キャラクター情報を整理
-            char_parts = []
-            for char in characters:
-                name = char.get('name', '').strip()
-                if name:  # 名前が入力されている場合のみ追加
-                    eidolon = char.get('eidolon', 0)
-                    superimpose = char.get('superimpose', 1)
-                    char_parts.append(f"{name} E{eidolon} S{superimpose}")
-            
-            if char_parts:  # キャラクターが1人以上いる場合
-                team_text = " / ".join(char_parts)
-                if score.strip():
-                    team_text += f" - スコア: {score}"
+        for team in self.section.teams:
+            team_text = format_team_line(team)
+            if team_text:  # キャラクターが1人以上いる場合
                 copy_text.append(team_text)
         
         if copy_text:
@@ -884,95 +932,283 @@ class TeamCompositionWidget(QWidget):
             QMessageBox.warning(self.parent(), "コピーエラー", 
                               "コピー可能な編成がありません。")
 
+    def import_teams_from_clipboard(self):
+        """クリップボードのテキスト（copy_teams_to_clipboard の形式）を編成として追加"""
+        text = QApplication.clipboard().text()
+        if not text.strip():
+            QMessageBox.warning(self.parent(), "取り込みエラー", "クリップボードにテキストがありません。")
+            return
+        self.import_teams(text.splitlines())
+
+    def import_teams_from_file(self):
+        """テキストファイルの各行（copy_teams_to_clipboard の形式）を編成として追加"""
+        path, _ = QFileDialog.getOpenFileName(self, "編成を取り込み", "", "テキスト (*.txt);;すべてのファイル (*)")
+        if path:
+            self.import_teams(self._read_lines(path), source=path)
+
+    @staticmethod
+    def _read_lines(path):
+        """ファイルを1行ずつ読むジェネレーター（取り込みが終わるか取り消されたら閉じる）"""
+        with open(path, "r", encoding="utf-8-sig") as f:
+            yield from f
+
+    def import_teams(self, lines, source="クリップボード"):
+        """行の iterable を編成として末尾に追加する（IMPORT_BATCH 件ずつ空き時間に進める）
+
+        行は読みながら変換し、まとめてセクションへ追加する。追加の間は描画を止め、
+        モデルの変更通知（検索索引などの更新）も1回の追加につき1回にまとめる。
+        最初の1回分はすぐに追加し、残りは idle_scheduler で進める。
+        """
+        self.finish_pending_rows()
+        steps = self._import_steps(lines, source)
+        try:
+            next(steps)
+        except StopIteration:
+            return
+        idle_scheduler().schedule((self, "import"), steps, priority=0)
+
+    def _import_steps(self, lines, source):
+        imported = skipped = 0
+        batch = []
+        error = None
+        try:
+            for lineno, data in iter_teams_from_lines(lines):
+                if data is None:
+                    skipped += 1
+                    print(f"取り込み: {lineno}行目を読み飛ばしました")
+                    continue
+                batch.append(Team.from_dict(data, row_id=self.section.next_row_id + len(batch)))
+                if len(batch) >= IMPORT_BATCH:
+                    self._append_teams(batch)
+                    imported += len(batch)
+                    batch = []
+                    yield
+        except Exception as e:
+            print(f"取り込みエラー（{source}）: {e}")
+            error = e
+        if batch:
+            self._append_teams(batch)
+            imported += len(batch)
+        print(f"{source} から{imported}編成を取り込みました" + (f"（{skipped}行は読み飛ばし）" if skipped else ""))
+        if imported:
+            self.save_data_delayed()
+        if error is not None:
+            message = (f"{source} の取り込み中にエラーが発生しました:\n{error}\n\n"
+                       f"{imported}編成を取り込み、{skipped}行を読み飛ばしました。")
+        elif not imported:
+            message = (f"{source} に取り込める編成がありませんでした（{skipped}行を読み飛ばし）。\n"
+                       f"1行に1編成、「カフカ E0 S1 / 銀狼 E2 S1{SCORE_SEPARATOR}35000」の形式で入力してください。")
+        else:
+            return
+        # 取り込みの処理中（idle_scheduler の実行中）にダイアログを開かないよう、次のイベントループで表示する
+        parent = self.parent()
+        QTimer.singleShot(0, lambda: QMessageBox.warning(parent, "取り込みエラー", message))
+
+    def finish_import(self):
+        """取り込みの残りをすぐに最後まで行う（終了時の保存の前に呼ぶ）"""
+        idle_scheduler().finish((self, "import"))
+
+    def cancel_import(self):
+        idle_scheduler().cancel((self, "import"))
+
+    def _append_teams(self, teams):
+        """編成をセクションと表示にまとめて追加（この間は描画しない）"""
+        self.setUpdatesEnabled(False)
+        try:
+            if self.virtual_mode:
+                self.team_model.add_teams(teams)
+            elif len(self.section.teams) + len(teams) >= VIRTUAL_ROW_THRESHOLD:
+                self.section.add_teams(teams)
+                self.rebuild_rows()  # 仮想化表示に切り替える（行ウィジェットは作らない）
+            else:
+                self.section.add_teams(teams)
+                for team in teams:
+                    self.insert_team_row(team)
+            self.shown_generation = self.section.generation
+        finally:
+            self.setUpdatesEnabled(True)
+
     def add_team_row(self):
         """編成行を追加"""
-        row_id = self.next_row_id
-        self.next_row_id += 1
-        
-        team_row = SimpleTeamRow(row_id, self)
+        self.finish_pending_rows()
+        if self.virtual_mode:
+            self.team_model.add_new_team()
+            self.list_view.scrollToBottom()
+        else:
+            team = self.section.new_team()
+            self.insert_team_row(team)
+        self.shown_generation = self.section.generation
+
+    def insert_team_row(self, team):
+        """編成モデルの行ウィジェットを末尾に追加"""
+        if self.row_pool:
+            team_row = self.row_pool.pop()
+            team_row.bind_team(team)
+        else:
+            team_row = SimpleTeamRow(team, self)
         self.team_rows.append(team_row)
         
         # ストレッチの前に挿入（最後から2番目の位置）
         insert_index = self.rows_layout.count() - 1
         self.rows_layout.insertWidget(insert_index, team_row)
+        team_row.show()
+        return team_row
+
+    def park_team_row(self, row):
+        """行をレイアウトから外して非表示で待機させる（破棄しない）"""
+        self.rows_layout.removeWidget(row)
+        row.hide()
+        self.row_pool.append(row)
 
     def delete_team_row(self, row_id):
         """編成行を削除"""
-        for i, row in enumerate(self.team_rows):
-            if row.row_id == row_id:
-                row.deleteLater()
-                self.team_rows.pop(i)
-                break
-
-    def get_all_team_data(self):
-        """全編成データを取得"""
-        teams = []
-        for row in self.team_rows:
-            row_data = row.get_simple_data()
-            row_data['row_id'] = row.row_id
-            teams.append(row_data)
-        return teams
+        self.finish_pending_rows()
+        if self.virtual_mode:
+            self.team_model.remove_team(row_id)
+        else:
+            for i, row in enumerate(self.team_rows):
+                if row.row_id == row_id:
+                    self.team_rows.pop(i)
+                    self.park_team_row(row)
+                    break
+            self.section.remove_team(row_id)
+        self.shown_generation = self.section.generation
 
     def set_all_team_data(self, teams_data):
         """全編成データを設定"""
         if not teams_data:
             return
         
-        # 既存の行をクリア（ストレッチ以外）
-        for row in self.team_rows:
-            row.deleteLater()
-        self.team_rows.clear()
+        self.section.set_teams([Team.from_dict(team_data) for team_data in teams_data])
+        self.rebuild_rows()
+
+    def rebuild_rows(self):
+        """モデルの編成を行に反映（既存の行は付け替えて再利用し、不足分だけ作成する）
+
+        不足分の行は表示範囲に入る分だけすぐに作り、残りはイベントループの
+        空き時間に少しずつ作る（idle_scheduler）。作り終わるまでは is_current() が
+        False のままなので、途中でタブを切り替えた場合は次の表示で続きを作る。
+        """
+        idle_scheduler().cancel(self)
+        # 編成数が多い場合は仮想化表示に切り替える
+        self.virtual_mode = len(self.section.teams) >= VIRTUAL_ROW_THRESHOLD
+        self.team_model.set_order(self.display_teams() if self.virtual_mode and self.score_view_active() else None)
+        teams = [] if self.virtual_mode else self.section.teams
         
-        # データから行を復元
-        for team_data in teams_data:
-            row_id = team_data.get('row_id', self.next_row_id)
-            self.next_row_id = max(self.next_row_id, row_id + 1)
-            
-            team_row = SimpleTeamRow(row_id, self)
-            team_row.set_simple_data(team_data)
-            self.team_rows.append(team_row)
-            
-            # ストレッチの前に挿入
-            insert_index = self.rows_layout.count() - 1
-            self.rows_layout.insertWidget(insert_index, team_row)
+        # 余った行は非表示にして待機させる
+        while len(self.team_rows) > len(teams):
+            self.park_team_row(self.team_rows.pop())
+        for row, team in zip(self.team_rows, teams):
+            row.bind_team(team)
+            row.show()  # 絞り込みで隠していた行
+        
+        if self.virtual_mode:
+            self.rows_stack.setCurrentWidget(self.list_view)
+        else:
+            self.rows_stack.setCurrentIndex(0)
+        
+        steps = self._insert_rows(teams[len(self.team_rows):], self.section.generation)
+        space = self.rows_stack.height() - sum(row.sizeHint().height() for row in self.team_rows)
+        for row in steps:
+            space -= row.sizeHint().height() + self.rows_layout.spacing()
+            if space <= 0:
+                idle_scheduler().schedule(self, steps, priority=0 if self.isVisible() else 1)
+                break
+
+    def _insert_rows(self, teams, generation):
+        """行を1つ作るごとに中断するジェネレーター（最後まで進むと表示済みになる）"""
+        for team in teams:
+            yield self.insert_team_row(team)
+        self.shown_generation = generation
+        if self.score_view_active():
+            self._arrange_rows()
+
+    def finish_pending_rows(self):
+        """作成待ちの行を今すぐ作る（行の追加・削除の前に呼ぶ）"""
+        idle_scheduler().finish(self)
+
+    def scroll_to_team(self, team):
+        """編成の行が見える位置までスクロール（絞り込みで隠れていれば絞り込みを解除）"""
+        if self.virtual_mode:
+            row = self.team_model.row_of(team)
+            if row < 0:
+                self.min_score_edit.clear()
+                row = self.team_model.row_of(team)
+            if row >= 0:
+                self.list_view.scrollTo(self.team_model.index(row), QListView.PositionAtCenter)
+            return
+        self.finish_pending_rows()
+        for row in self.team_rows:
+            if row.team is team:
+                if row.isHidden():
+                    self.min_score_edit.clear()
+                self.rows_layout.activate()  # 作ったばかりの行にも位置を割り当てる
+                self.scroll_area.ensureWidgetVisible(row)
+                break
+
+    def score_view_active(self):
+        """スコアでの並び替え・絞り込みをしているか"""
+        return self.sort_combo.currentIndex() != 0 or parse_score(self.min_score_edit.text()) is not None
+
+    def display_teams(self):
+        """並び替え・絞り込みを適用した表示順の編成
+
+        スコアの数値（Team.score_value）が最低スコア未満の編成を除き、選んだ順に
+        並べる。スコアが数値でない編成（未入力など）は除かずに末尾に置く。
+        """
+        teams = self.section.teams
+        minimum = parse_score(self.min_score_edit.text())
+        if minimum is not None:
+            teams = [team for team in teams if team.score_value is None or team.score_value >= minimum]
+        order = self.sort_combo.currentIndex()
+        if order == 0:
+            return list(teams)
+        scored = [team for team in teams if team.score_value is not None]
+        scored.sort(key=lambda team: team.score_value, reverse=order == 1)
+        return scored + [team for team in teams if team.score_value is None]
+
+    def apply_score_view(self, *args):
+        """並び替え・絞り込みを表示に反映（入力中のスコアの変更では並べ替えない）"""
+        if self.virtual_mode:
+            self.team_model.set_order(self.display_teams() if self.score_view_active() else None)
+            return
+        self.finish_pending_rows()
+        self._arrange_rows()
+
+    def _arrange_rows(self):
+        """既存の行をレイアウト内で表示順に並べ替え、絞り込みで除いた行を隠す"""
+        rows = {row.team: row for row in self.team_rows}
+        shown = self.display_teams()
+        for position, team in enumerate(shown):
+            row = rows.pop(team, None)
+            if row is None:
+                continue
+            if self.rows_layout.indexOf(row) != position:
+                self.rows_layout.removeWidget(row)
+                self.rows_layout.insertWidget(position, row)
+            row.show()
+        for row in rows.values():
+            row.hide()
+
+    def cancel_pending_rows(self):
+        """作成待ちの行を取り消す（別のタブに切り替えたとき、取り込みは続ける）"""
+        idle_scheduler().cancel(self)
+
+    def is_current(self):
+        """行の表示がセクションの編成と一致しているか"""
+        return self.shown_generation == self.section.generation
+
+    def row_size_changed(self, row):
+        """行の高さが変わった（詳細の開閉）"""
+        if self.virtual_mode:
+            self.list_view.team_size_changed(row.team)
 
 class StarRailMemo(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("スターレイル メモアプリ")
-        # 最大化状態で起動
-        self.showMaximized()
-        
-        # シンプルな白黒テーマを設定
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #ffffff;
-                color: #333333;
-                font-family: 'Meiryo', sans-serif;
-            }
-            QFrame {
-                background-color: #ffffff;
-            }
-            QPushButton {
-                background-color: #f8f8f8;
-                border: 1px solid #cccccc;
-                border-radius: 4px;
-                padding: 6px 12px;
-                color: #333333;
-            }
-            QPushButton:hover {
-                background-color: #e8e8e8;
-                border-color: #999999;
-            }
-            QPushButton:pressed {
-                background-color: #d8d8d8;
-            }
-            QPushButton:checked {
-                background-color: #333333;
-                color: #ffffff;
-                font-weight: bold;
-            }
-        """)
+        # シンプルな白黒テーマをアプリ全体に一度だけ設定
+        apply_theme(QApplication.instance(), DEFAULT_THEME)
 
         self.sections = {}
         self.section_data = {}
@@ -980,15 +1216,18 @@ class StarRailMemo(QWidget):
         self.section_selector_buttons = []
         self.name_to_button = {}
         self.last_section = None
-        self._first_show = True  # 初回表示フラグ
+        self._startup_pending = True  # 最初の描画後の処理（finish_startup）が未実行
+        self.first_frame_at = None  # 最初の描画が終わった時刻（time.perf_counter）
         self._initialization_complete = False  # 初期化完了フラグ
+        # 保存先（STARRAI_MEMO_BACKEND で切り替え）。エンコード・書き込みは専用スレッドで行う
+        self.settings_backend = open_backend()
 
         self.section_stack = QStackedWidget()
         self.main_layout = QVBoxLayout()
 
         # タブバー
         self.tab_bar_frame = QFrame()
-        self.tab_bar_frame.setStyleSheet("background-color: #f5f5f5; border-bottom: 1px solid #ddd;")
+        self.tab_bar_frame.setObjectName("tabBar")
         self.tab_bar_layout = QHBoxLayout(self.tab_bar_frame)
         self.tab_bar_layout.setContentsMargins(5, 5, 5, 5)
         self.tab_bar_layout.setSpacing(2)
@@ -1002,6 +1241,40 @@ class StarRailMemo(QWidget):
         self.tab_bar_layout.addWidget(self.add_button)
         self.tab_bar_layout.addStretch()
 
+        # 全セクションの検索（Enter で次の一致へ移動）
+        self.search_index = SearchIndex()
+        self._search_query = None
+        self._search_hits = []
+        self._search_version = None  # 検索したときの search_index.version
+        self._search_pos = -1
+        self.search_edit = QLineEdit()
+        self.search_edit.setObjectName("searchEdit")
+        self.search_edit.setPlaceholderText("検索（名前・光円錐・メモ・スコア）")
+        self.search_edit.setFixedWidth(240)
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.returnPressed.connect(self.search_next)
+        self.tab_bar_layout.addWidget(self.search_edit)
+        self.search_label = QLabel("")
+        self.search_label.setObjectName("searchLabel")
+        self.tab_bar_layout.addWidget(self.search_label)
+
+        # 使用回数の集計（パネルは初めて開くときに作る）
+        self.usage_stats = UsageStats()
+        self.cooccurrence = CooccurrenceIndex()  # 組み合わせの共起行列（パネルを開いたときに計算）
+        self.stats_panel = None
+        self.stats_button = QPushButton("📊")
+        self.stats_button.setFixedSize(30, 25)
+        self.stats_button.setToolTip("キャラクター・光円錐・メイン効果の使用回数")
+        self.stats_button.clicked.connect(self.show_stats_panel)
+        self.tab_bar_layout.addWidget(self.stats_button)
+
+        # テーマ切り替えボタン（ウィジェットは作り直さずスタイルシートだけ差し替える）
+        self.theme_button = QPushButton("🌓")
+        self.theme_button.setFixedSize(30, 25)
+        self.theme_button.setToolTip("ライト/ダーク切り替え")
+        self.theme_button.clicked.connect(self.toggle_theme)
+        self.tab_bar_layout.addWidget(self.theme_button)
+
         self.main_layout.addWidget(self.section_stack)
         self.setLayout(self.main_layout)
 
@@ -1021,23 +1294,86 @@ class StarRailMemo(QWidget):
         else:
             # 初回起動時のみデフォルトセクションを作成
             default_name = "セクション 1"
-            self.section_data[default_name] = {
-                "content": None,
-                "phase": None,
-                "teams": []
-            }
+            self.section_data[default_name] = Section(default_name)
             self.add_section(name=default_name)
         
-        # 最後に開いていたセクションを復元
-        if self.last_section and self.last_section in self.sections:
-            self.change_section_by_name(self.last_section)
-        elif self.sections:
+        # 最後に開いていたセクションは枠だけ作り、編成の読み込みは最初の描画の後に行う
+        if self.last_section not in self.sections:
             # last_sectionが無効な場合は最初のセクションを選択
-            first_section = list(self.sections.keys())[0]
-            self.change_section_by_name(first_section)
+            self.last_section = next(iter(self.sections), None)
+        if self.last_section:
+            self.section_stack.setCurrentWidget(self.sections[self.last_section])
+            self.highlight_selected_section(self.last_section)
+            self.build_section_ui(self.last_section, restore=False)
         
         # 初期化完了
         self._initialization_complete = True
+        # 最大化状態で表示（タブバーと枠を組み立ててから一度だけ表示する）
+        self.showMaximized()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._startup_pending:
+            self._startup_pending = False
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """最初の描画の後に行う起動処理（表示中のセクションの編成を読み込む）"""
+        self.first_frame_at = time.perf_counter()
+        print(f"起動: 最初の画面まで {(self.first_frame_at - _STARTED_AT) * 1000:.0f} ms")
+        name = self.current_section_name()
+        if name:
+            self.change_section_by_name(name)
+        # 検索索引・入力補完の候補・使用回数は編成の表示が終わってから空き時間に作る
+        for index in self.team_indexes():
+            idle_scheduler().schedule(index, index.build(self.section_data), priority=2)
+
+    def team_indexes(self):
+        """全セクションの編成から作る派生データ（TeamIndex）"""
+        return [self.search_index, completion_index(), self.usage_stats, self.cooccurrence]
+
+    def show_stats_panel(self):
+        """使用回数の集計パネルを開く（集計が途中なら先に終える）"""
+        idle_scheduler().finish(self.usage_stats)
+        idle_scheduler().finish(self.cooccurrence)
+        if self.stats_panel is None:
+            self.stats_panel = UsageStatsPanel(self.usage_stats, self.cooccurrence)
+        self.stats_panel.show()
+        self.stats_panel.raise_()
+
+    def search_next(self):
+        """検索語に一致する次の編成のセクション・行へ移動（Enter を押すたびに次の一致へ）"""
+        query = self.search_edit.text()
+        idle_scheduler().finish(self.search_index)  # 索引の作成が途中なら先に終える
+        if query != self._search_query or self.search_index.version != self._search_version:
+            # 同じ検索語で編成が変わった場合は検索し直し、今の一致の続きから移動する
+            current = None
+            position = -1
+            if query == self._search_query and 0 <= self._search_pos < len(self._search_hits):
+                current = self._search_hits[self._search_pos].team
+                position = self._search_pos - 1  # 今の一致が消えた場合は、同じ位置に来た次の一致へ
+            order = {name: i for i, name in enumerate(self.section_data)}
+            hits = self.search_index.search(query, SEARCH_LIMIT)
+            hits.sort(key=lambda hit: order.get(hit.section.name, len(order)))
+            self._search_query = query
+            self._search_hits = hits
+            self._search_version = self.search_index.version
+            self._search_pos = next((i for i, hit in enumerate(hits) if hit.team is current), position)
+        if not self._search_hits:
+            self.search_label.setText("0件" if query.strip() else "")
+            return
+        self._search_pos = (self._search_pos + 1) % len(self._search_hits)
+        hit = self._search_hits[self._search_pos]
+        more = "+" if len(self._search_hits) == SEARCH_LIMIT else ""  # 打ち切った場合
+        self.search_label.setText(f"{self._search_pos + 1}/{len(self._search_hits)}{more}件")
+        self.search_label.setToolTip(hit.label())
+        if hit.section.name in self.sections:
+            self.change_section_by_name(hit.section.name)
+            self.section_ui[hit.section.name]["team_widget"].scroll_to_team(hit.team)
+
+    def toggle_theme(self):
+        """ライトテーマとダークテーマを切り替える"""
+        apply_theme(QApplication.instance(), "dark" if current_theme() == "light" else "light")
 
     def prompt_new_section_name(self):
         name, ok = QInputDialog.getText(self, "新規セクション", "セクション名を入力:")
@@ -1055,15 +1391,60 @@ class StarRailMemo(QWidget):
         
         # デフォルトデータ（既存データがない場合のみ作成）
         if name not in self.section_data:
-            self.section_data[name] = {
-                "content": None, 
-                "phase": None,
-                "teams": []
-            }
+            self.section_data[name] = Section(name)
+        if self._initialization_complete:
+            for index in self.team_indexes():
+                index.index_section(self.section_data[name])
 
-        # セクションウィジェット作成
+        # セクションウィジェット（中身は初めて表示するときに作成）
         section_widget = QWidget()
-        section_layout = QVBoxLayout(section_widget)
+        QVBoxLayout(section_widget)
+        self.section_stack.addWidget(section_widget)
+        self.sections[name] = section_widget
+
+        # タブ作成
+        tab_frame = QFrame()
+        tab_frame.setObjectName("tabFrame")
+        tab_layout = QHBoxLayout(tab_frame)
+        tab_layout.setContentsMargins(5, 0, 5, 0)
+        tab_layout.setSpacing(5)
+
+        tab_button = QPushButton(name)
+        tab_button.setCheckable(True)
+        tab_button.setObjectName("tabButton")
+        tab_button.clicked.connect(lambda checked, n=name: self.change_section_by_name(n))
+        tab_button.setContextMenuPolicy(Qt.CustomContextMenu)
+        tab_button.customContextMenuRequested.connect(lambda pos, n=name: self.rename_section(n))
+
+        close_button = QToolButton()
+        close_button.setText("×")
+        close_button.setFixedSize(16, 16)
+        close_button.setObjectName("tabCloseButton")
+        close_button.clicked.connect(lambda _, n=name, f=tab_frame: self.remove_section_by_name(n, f))
+
+        tab_layout.addWidget(tab_button)
+        tab_layout.addWidget(close_button)
+        tab_frame.setLayout(tab_layout)
+
+        self.section_selector_buttons.append(tab_button)
+        self.name_to_button[name] = tab_button
+        self.tab_bar_layout.insertWidget(self.tab_bar_layout.indexOf(self.add_button), tab_frame)
+
+        # 起動時の復元ではタブだけを作り、中身は初めて表示したときに作成する
+        if self._initialization_complete:
+            # 新規セクション作成時はすぐに表示し、デフォルトで1行追加（編成が空の場合のみ）
+            self.change_section_by_name(name)
+            self.ensure_minimum_teams(name)
+
+    def build_section_ui(self, name, restore=True):
+        """セクションの中身（コンテンツ・区分ボタンと編成一覧）を作成
+
+        restore=False の場合は枠だけを作り、保存データの復元（セクションの
+        読み込み）は次に change_section_by_name を呼んだときに行う。
+        """
+        section_widget = self.sections[name]
+        section_layout = section_widget.layout()
+
 
         # コンテンツ選択
         content_layout = QHBoxLayout()
@@ -1097,91 +1478,18 @@ class StarRailMemo(QWidget):
         section_layout.addLayout(content_layout)
 
         # 編成管理ウィジェット
-        team_widget = TeamCompositionWidget()
+        team_widget = TeamCompositionWidget(self.section_data[name])
         section_layout.addWidget(team_widget)
 
-        self.section_stack.addWidget(section_widget)
-        self.sections[name] = section_widget
-
         self.section_ui[name] = {
             "content_buttons": content_buttons,
             "phase_buttons": phase_buttons,
             "team_widget": team_widget
         }
 
-        # タブ作成
-        tab_frame = QFrame()
-        tab_frame.setStyleSheet("""
-            QFrame { 
-                border: 1px solid #ccc; 
-                border-bottom: none; 
-                border-top-left-radius: 5px; 
-                border-top-right-radius: 5px; 
-                background-color: #f8f8f8; 
-            }
-        """)
-        tab_layout = QHBoxLayout(tab_frame)
-        tab_layout.setContentsMargins(5, 0, 5, 0)
-        tab_layout.setSpacing(5)
-
-        tab_button = QPushButton(name)
-        tab_button.setCheckable(True)
-        tab_button.setStyleSheet("""
-            QPushButton { 
-                border: none; 
-                background: transparent; 
-                padding: 8px 12px; 
-                font-size: 11px;
-                color: #666;
-            }
-            QPushButton:checked { 
-                background-color: #ffffff; 
-                font-weight: bold; 
-                border-radius: 3px;
-                color: #333;
-            }
-        """)
-        tab_button.clicked.connect(lambda checked, n=name: self.change_section_by_name(n))
-        tab_button.setContextMenuPolicy(Qt.CustomContextMenu)
-        tab_button.customContextMenuRequested.connect(lambda pos, n=name: self.rename_section(n))
-
-        close_button = QToolButton()
-        close_button.setText("×")
-        close_button.setFixedSize(16, 16)
-        close_button.setStyleSheet("""
-            QToolButton { 
-                color: #666; 
-                background-color: transparent; 
-                border: 1px solid #ddd; 
-                font-weight: bold; 
-                padding: 0; 
-                border-radius: 8px; 
-            } 
-            QToolButton:hover { 
-                color: #333; 
-                background-color: #f0f0f0; 
-            }
-        """)
-        close_button.clicked.connect(lambda _, n=name, f=tab_frame: self.remove_section_by_name(n, f))
-
-        tab_layout.addWidget(tab_button)
-        tab_layout.addWidget(close_button)
-        tab_frame.setLayout(tab_layout)
-
-        self.section_selector_buttons.append(tab_button)
-        self.name_to_button[name] = tab_button
-        self.tab_bar_layout.insertWidget(self.tab_bar_layout.count() - 2, tab_frame)
-
-        self.highlight_selected_section(name)
-        self.section_stack.setCurrentWidget(section_widget)
-        
-        # セクション作成直後にデータを復元
-        if not self._initialization_complete:
-            # 起動時の復元の場合は保存データから復元
-            QTimer.singleShot(100, lambda: self.restore_section_state(name))
-        else:
-            # 新規セクション作成時はデフォルトで1行追加（編成が空の場合のみ）
-            QTimer.singleShot(100, lambda: self.ensure_minimum_teams(name))
+        # 保存データから状態を復元
+        if restore:
+            self.restore_section_state(name)
 
     def rename_section(self, name):
         new_name, ok = QInputDialog.getText(self, "セクション名変更", "新しい名前:", text=name)
@@ -1189,9 +1497,12 @@ class StarRailMemo(QWidget):
             if new_name in self.sections:
                 QMessageBox.warning(self, "エラー", "すでにある名前です")
                 return
-            self.section_data[new_name] = self.section_data.pop(name)
+            section = self.section_data.pop(name)
+            section.name = new_name
+            self.section_data[new_name] = section
             self.sections[new_name] = self.sections.pop(name)
-            self.section_ui[new_name] = self.section_ui.pop(name)
+            if name in self.section_ui:
+                self.section_ui[new_name] = self.section_ui.pop(name)
             btn = self.name_to_button.pop(name)
             btn.setText(new_name)
             self.name_to_button[new_name] = btn
@@ -1204,11 +1515,17 @@ class StarRailMemo(QWidget):
     def remove_section_by_name(self, name, frame):
         if name in self.sections:
             widget = self.sections.pop(name)
+            was_current = self.section_stack.currentWidget() is widget
             self.section_stack.removeWidget(widget)
             if name in self.section_data:
-                del self.section_data[name]
+                section = self.section_data.pop(name)
+                for index in self.team_indexes():
+                    index.remove_section(section)
             if name in self.section_ui:
-                del self.section_ui[name]
+                # 削除したセクションの作成待ちの行・取り込みは、ウィジェットを破棄する前に取り消す
+                team_widget = self.section_ui.pop(name)["team_widget"]
+                team_widget.cancel_pending_rows()
+                team_widget.cancel_import()
             if name in self.name_to_button:
                 del self.name_to_button[name]
                 # セクションボタンリストからも削除
@@ -1217,286 +1534,98 @@ class StarRailMemo(QWidget):
                         self.section_selector_buttons.remove(btn)
                         break
             frame.deleteLater()
+            if was_current and self.sections:
+                # 表示中のセクションを削除した場合は、代わりに表示されたセクションを作成・選択する
+                current = self.section_stack.currentWidget()
+                self.change_section_by_name(next(
+                    (n for n, w in self.sections.items() if w is current), next(iter(self.sections))))
             self.save_settings()
 
     def change_section_by_name(self, section_name):
         if section_name in self.sections:
-            # 現在のセクションのデータを保存
-            self.save_all_team_data()
-            # セクションを切り替え
+            # 前のタブで作成途中だった行は取り消す（次に表示したときに続きを作る）
+            for name, ui in self.section_ui.items():
+                if name != section_name:
+                    ui["team_widget"].cancel_pending_rows()
+            # セクションを切り替え（編成データは入力時にモデルへ反映済み）
             self.section_stack.setCurrentWidget(self.sections[section_name])
             self.highlight_selected_section(section_name)
-            # データ復元は少し遅延させる
-            QTimer.singleShot(50, lambda: self.restore_section_state(section_name))
+            if section_name not in self.section_ui:
+                # 初めて表示するセクションはここで作成・復元する
+                self.build_section_ui(section_name)
+                return
+            # 前回表示してから編成が入れ替わっていなければ何もしない
+            self.restore_section_state(section_name)
 
     def highlight_selected_section(self, active_name):
         for name, btn in self.name_to_button.items():
             btn.setChecked(name == active_name)
 
     def select_content(self, section_name, button):
-        # 現在のデータを保存
-        self.save_all_team_data()
         buttons = self.section_ui.get(section_name, {}).get("content_buttons", [])
         for b in buttons:
             b.setChecked(False)
         button.setChecked(True)
-        self.section_data[section_name]["content"] = button.text()
+        self.section_data[section_name].set_content(button.text())
         if self._initialization_complete:
             self.save_settings()
 
     def select_phase(self, section_name, button):
-        # 現在のデータを保存
-        self.save_all_team_data()
         buttons = self.section_ui.get(section_name, {}).get("phase_buttons", [])
         for b in buttons:
             b.setChecked(False)
         button.setChecked(True)
-        self.section_data[section_name]["phase"] = button.text()
+        self.section_data[section_name].set_phase(button.text())
         if self._initialization_complete:
             self.save_settings()
 
     def closeEvent(self, event):
         """アプリケーション終了時に全てのデータを保存"""
         print("アプリケーションを終了中... データを保存しています")
-        self.save_all_team_data()
-        self.save_settings()
+        for ui in self.section_ui.values():
+            ui["team_widget"].finish_import()
+        if self._initialization_complete:
+            # 終了時はジャーナルをスナップショットに畳み込み、書き込み完了を待つ
+            self.settings_backend.save_all(snapshot_sections(self.section_data),
+                                           self.current_section_name(), compact=True)
+        self.settings_backend.close()
+        for index in self.team_indexes():
+            idle_scheduler().cancel(index)
+        self.search_index.close()
+        self.usage_stats.close()
+        self.cooccurrence.close()
+        if self.stats_panel is not None:
+            self.stats_panel.close()
         print("データ保存完了")
         event.accept()
 
-    def save_all_team_data(self):
-        """全セクションの編成データを保存"""
-        for name, ui in self.section_ui.items():
-            if "team_widget" in ui:
-                self.section_data[name]["teams"] = ui["team_widget"].get_all_team_data()
+    def current_section_name(self):
+        """現在表示されているセクション名"""
+        current_widget = self.section_stack.currentWidget()
+        for name, widget in self.sections.items():
+            if widget == current_widget:
+                return name
+        return None
 
-    def save_settings(self):
+    def save_settings(self, section_name=None):
+        """設定を保存（section_name を指定するとそのセクションの変更だけを保存）"""
         if not self._initialization_complete:
             return  # 初期化中は保存しない
             
-        self.save_all_team_data()
-        try:
-            data_to_save = self.section_data.copy()
-            # 現在表示されているセクションを記録
-            current_widget = self.section_stack.currentWidget()
-            for name, widget in self.sections.items():
-                if widget == current_widget:
-                    data_to_save["_last_section"] = name
-                    break
-            
-            # テキストファイルとして保存
-            with open("settings.txt", "w", encoding="utf-8") as f:
-                f.write("=== STARRAI MEMO SETTINGS ===\n")
-                f.write(f"LAST_SECTION: {data_to_save.get('_last_section', 'None')}\n")
-                f.write(f"SECTIONS_COUNT: {len([k for k in data_to_save.keys() if not k.startswith('_')])}\n")
-                f.write("\n")
-                
-                # 各セクションのデータを保存
-                for section_name, section_data in data_to_save.items():
-                    if section_name.startswith('_'):
-                        continue  # 特別なキーはスキップ
-                    
-                    f.write(f"[SECTION: {section_name}]\n")
-                    f.write(f"CONTENT: {section_data.get('content', 'None')}\n")
-                    f.write(f"PHASE: {section_data.get('phase', 'None')}\n")
-                    
-                    teams = section_data.get('teams', [])
-                    f.write(f"TEAMS_COUNT: {len(teams)}\n")
-                    
-                    for i, team in enumerate(teams):
-                        f.write(f"  [TEAM_{i+1}]\n")
-                        f.write(f"  ROW_ID: {team.get('row_id', 0)}\n")
-                        f.write(f"  SCORE: {team.get('score', '')}\n")
-                        
-                        characters = team.get('characters', [])
-                        for j, char in enumerate(characters):
-                            f.write(f"    [CHAR_{j+1}]\n")
-                            f.write(f"    NAME: {char.get('name', '')}\n")
-                            f.write(f"    EIDOLON: {char.get('eidolon', 0)}\n")
-                            f.write(f"    SUPERIMPOSE: {char.get('superimpose', 1)}\n")
-                            f.write(f"    LEVEL: {char.get('level', 80)}\n")
-                            f.write(f"    LIGHTCONE: {char.get('lightcone', '')}\n")
-                            f.write(f"    MEMO: {char.get('memo', '').replace(chr(10), '\\n')}\n")
-                            f.write(f"    DETAIL_SHOWN: {char.get('detail_shown', False)}\n")
-                            
-                            # メイン効果
-                            main_stats = char.get('main_stats', {})
-                            f.write(f"    MAIN_STATS: {main_stats.get('胴', 'HP%')}|{main_stats.get('脚', 'HP%')}|{main_stats.get('縄', 'HP%')}|{main_stats.get('球', 'HP%')}\n")
-                    
-                    f.write("\n")
-                
-            print(f"設定をテキストファイルに保存しました: {len([k for k in data_to_save.keys() if not k.startswith('_')])}セクション")
-                
-        except Exception as e:
-            print(f"設定保存エラー: {e}")
+        # GUIスレッドではモデルのスナップショットを取るだけで、エンコード・書き込みは専用スレッドに任せる
+        if section_name in self.section_data:
+            self.settings_backend.save_section(section_name, self.section_data[section_name].to_dict(),
+                                               self.current_section_name())
+        else:
+            self.settings_backend.save_all(snapshot_sections(self.section_data), self.current_section_name())
 
     def load_settings(self):
-        self.last_section = None
-        
-        # まずテキストファイルを確認
-        if os.path.exists("settings.txt"):
-            try:
-                self.section_data = {}
-                current_section = None
-                current_team = None
-                current_char = None
-                
-                with open("settings.txt", "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                
-                for line in lines:
-                    line = line.strip()
-                    if not line or line.startswith("==="):
-                        continue
-                    
-                    if line.startswith("LAST_SECTION:"):
-                        self.last_section = line.split(":", 1)[1].strip()
-                        if self.last_section == "None":
-                            self.last_section = None
-                    
-                    elif line.startswith("[SECTION:"):
-                        section_name = line[9:-1]  # [SECTION: と ] を除去
-                        current_section = section_name
-                        self.section_data[current_section] = {
-                            "content": None,
-                            "phase": None,
-                            "teams": []
-                        }
-                    
-                    elif line.startswith("CONTENT:") and current_section:
-                        content = line.split(":", 1)[1].strip()
-                        self.section_data[current_section]["content"] = content if content != "None" else None
-                    
-                    elif line.startswith("PHASE:") and current_section:
-                        phase = line.split(":", 1)[1].strip()
-                        self.section_data[current_section]["phase"] = phase if phase != "None" else None
-                    
-                    elif line.startswith("  [TEAM_"):
-                        current_team = {
-                            "row_id": 1,
-                            "score": "",
-                            "characters": []
-                        }
-                        self.section_data[current_section]["teams"].append(current_team)
-                    
-                    elif line.startswith("  ROW_ID:") and current_team is not None:
-                        current_team["row_id"] = int(line.split(":", 1)[1].strip())
-                    
-                    elif line.startswith("  SCORE:") and current_team is not None:
-                        current_team["score"] = line.split(":", 1)[1].strip()
-                    
-                    elif line.startswith("    [CHAR_"):
-                        current_char = {
-                            "name": "",
-                            "eidolon": 0,
-                            "superimpose": 1,
-                            "level": 80,
-                            "lightcone": "",
-                            "memo": "",
-                            "detail_shown": False,
-                            "main_stats": {"胴": "HP%", "脚": "HP%", "縄": "HP%", "球": "HP%"}
-                        }
-                        current_team["characters"].append(current_char)
-                    
-                    elif line.startswith("    NAME:") and current_char is not None:
-                        current_char["name"] = line.split(":", 1)[1].strip()
-                    
-                    elif line.startswith("    EIDOLON:") and current_char is not None:
-                        current_char["eidolon"] = int(line.split(":", 1)[1].strip())
-                    
-                    elif line.startswith("    SUPERIMPOSE:") and current_char is not None:
-                        current_char["superimpose"] = int(line.split(":", 1)[1].strip())
-                    
-                    elif line.startswith("    LEVEL:") and current_char is not None:
-                        current_char["level"] = int(line.split(":", 1)[1].strip())
-                    
-                    elif line.startswith("    LIGHTCONE:") and current_char is not None:
-                        current_char["lightcone"] = line.split(":", 1)[1].strip()
-                    
-                    elif line.startswith("    MEMO:") and current_char is not None:
-                        memo = line.split(":", 1)[1].strip()
-                        current_char["memo"] = memo.replace("\\n", "\n")
-                    
-                    elif line.startswith("    DETAIL_SHOWN:") and current_char is not None:
-                        current_char["detail_shown"] = line.split(":", 1)[1].strip().lower() == "true"
-                    
-                    elif line.startswith("    MAIN_STATS:") and current_char is not None:
-                        stats_str = line.split(":", 1)[1].strip()
-                        stats_parts = stats_str.split("|")
-                        if len(stats_parts) >= 4:
-                            current_char["main_stats"] = {
-                                "胴": stats_parts[0],
-                                "脚": stats_parts[1],
-                                "縄": stats_parts[2],
-                                "球": stats_parts[3]
-                            }
-                
-                print(f"テキスト設定を読み込みました: {len(self.section_data)}セクション")
-                print(f"セクション一覧: {list(self.section_data.keys())}")
-                    
-            except Exception as e:
-                print(f"テキスト設定読み込みエラー: {e}")
-                # テキストが失敗した場合、pickleからの移行を試行
-                self.migrate_from_pickle()
-        else:
-            # テキストファイルがない場合、pickleからの移行を試行
-            self.migrate_from_pickle()
-
-    def migrate_from_pickle(self):
-        """pickleファイルからテキストへの移行"""
-        if os.path.exists("settings.pkl"):
-            try:
-                import pickle
-                with open("settings.pkl", "rb") as f:
-                    data = pickle.load(f)
-                    if isinstance(data, dict):
-                        self.last_section = data.pop("_last_section", None)
-                        data.pop("_window_geometry", None)
-                        self.section_data = data
-                        print(f"pickle設定からデータを移行しました: {len(self.section_data)}セクション")
-                        # 移行後、テキストで保存し直す
-                        self.save_settings()
-                        # 古いpickleファイルをリネーム（バックアップとして）
-                        if os.path.exists("settings.pkl"):
-                            os.rename("settings.pkl", "settings_backup.pkl")
-                            print("旧pickleファイルをsettings_backup.pklにリネームしました")
-                    else:
-                        self.section_data = {}
-                        print("pickle設定ファイルが無効な形式です")
-            except Exception as e:
-                print(f"pickle設定移行エラー: {e}")
-                # pickleも失敗した場合、JSONからの移行を試行
-                self.migrate_from_json()
-        else:
-            # pickleファイルがない場合、JSONからの移行を試行
-            self.migrate_from_json()
-
-    def migrate_from_json(self):
-        """JSONファイルからテキストへの移行"""
-        if os.path.exists("settings.json"):
-            try:
-                import json
-                with open("settings.json", "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    if isinstance(data, dict):
-                        self.last_section = data.pop("_last_section", None)
-                        data.pop("_window_geometry", None)
-                        self.section_data = data
-                        print(f"JSON設定からデータを移行しました: {len(self.section_data)}セクション")
-                        # 移行後、テキストで保存し直す
-                        self.save_settings()
-                        # 古いJSONファイルをリネーム（バックアップとして）
-                        if os.path.exists("settings.json"):
-                            os.rename("settings.json", "settings_backup.json")
-                            print("旧JSONファイルをsettings_backup.jsonにリネームしました")
-                    else:
-                        self.section_data = {}
-                        print("JSON設定ファイルが無効な形式です")
-            except Exception as e:
-                print(f"JSON設定移行エラー: {e}")
-                self.section_data = {}
-        else:
-            self.section_data = {}
-            print("設定ファイルが見つかりません")
+        # 保存先のファイルがなければ、旧形式（pickle・JSON など）から移行する
+        data, self.last_section = self.settings_backend.load()
+        self.section_data = sections_from_dict(data)
+        print(f"セクション一覧: {list(self.section_data.keys())}")
+        if self.settings_backend.load_error:
+            QMessageBox.warning(self, "設定読み込みエラー", self.settings_backend.load_error)
 
     def ensure_minimum_teams(self, section_name):
         """新規セクションで編成が空の場合、最低1行は追加する"""
@@ -1514,24 +1643,25 @@ class StarRailMemo(QWidget):
             print(f"セクション '{section_name}' のデータが見つかりません")
             return
             
-        data = self.section_data[section_name]
+        section = self.section_data[section_name]
         ui = self.section_ui.get(section_name, {})
+        if "team_widget" in ui and ui["team_widget"].is_current():
+            return  # 表示中のウィジェットはモデルと一致している
         
         print(f"セクション '{section_name}' の状態を復元中...")
-        print(f"コンテンツ: {data.get('content')}, フェーズ: {data.get('phase')}, チーム数: {len(data.get('teams', []))}")
+        print(f"コンテンツ: {section.content}, フェーズ: {section.phase}, チーム数: {len(section.teams)}")
         
         # コンテンツ・フェーズボタンの復元
         for btn in ui.get("content_buttons", []):
-            btn.setChecked(btn.text() == data.get("content"))
+            btn.setChecked(btn.text() == section.content)
         for btn in ui.get("phase_buttons", []):
-            btn.setChecked(btn.text() == data.get("phase"))
+            btn.setChecked(btn.text() == section.phase)
         
         # 編成データの復元
-        if "team_widget" in ui and "teams" in data:
-            teams_data = data["teams"]
-            if teams_data:  # データが存在する場合のみ復元
-                ui["team_widget"].set_all_team_data(teams_data)
-                print(f"編成データを復元しました: {len(teams_data)}編成")
+        if "team_widget" in ui:
+            if section.teams:  # データが存在する場合のみ復元
+                ui["team_widget"].rebuild_rows()
+                print(f"編成データを復元しました: {len(section.teams)}編成")
             else:
                 print("編成データが空です")
     
@@ -1543,8 +1673,11 @@ class StarRailMemo(QWidget):
         """ウィンドウ移動時の処理（即座に保存はしない）"""
         super().moveEvent(event)
 
-if __name__ == '__main__':
+def main():
     app = QApplication(sys.argv)
     window = StarRailMemo()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
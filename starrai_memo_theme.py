@@ -0,0 +1,388 @@
+"""アプリ全体のテーマ（スタイルシート）
+
+ウィジェットごとに setStyleSheet を呼ぶ代わりに、objectName と動的プロパティを
+キーにしたスタイルシートをアプリケーションに一度だけ設定する。テーマの
+切り替えはスタイルシートを差し替えるだけで、ウィジェットは作り直さない。
+"""
+from string import Template
+
+THEMES = {
+    "light": {
+        "window_bg": "#ffffff", "text": "#333333", "muted": "#666666",
+        "button_bg": "#f8f8f8", "button_border": "#cccccc", "button_hover": "#e8e8e8",
+        "button_hover_border": "#999999", "button_pressed": "#d8d8d8",
+        "button_checked_bg": "#333333", "button_checked_text": "#ffffff",
+        "panel_bg": "#f5f5f5", "panel_hover": "#e8e8e8", "panel_checked": "#d0d0d0",
+        "row_border": "#dddddd", "row_bg": "#f9f9f9",
+        "card_border": "#bbbbbb", "card_bg": "#ffffff", "label_bg": "#f0f0f0",
+        "input_border": "#cccccc", "input_bg": "#fafafa", "input_focus_bg": "#ffffff",
+        "accent": "#4a90e2", "accent_bg": "#f0f8ff", "accent_soft": "#e6f3ff", "accent_focus_bg": "#f8fcff",
+        "danger": "#d32f2f", "danger_bg": "#ffebee", "danger_border": "#f8bbd9",
+        "danger_hover": "#b71c1c", "danger_hover_bg": "#ffcdd2", "danger_hover_border": "#f06292",
+        "detail_bg": "#f8f8f8",
+        "success": "#228b22", "success_bg": "#f0fff0", "success_border": "#90ee90", "success_hover": "#e6ffe6",
+        "scroll_bg": "#fafafa", "scrollbar_bg": "#f0f0f0", "handle": "#c0c0c0", "handle_hover": "#a0a0a0",
+    },
+    "dark": {
+        "window_bg": "#1f2024", "text": "#e4e4e4", "muted": "#a0a0a0",
+        "button_bg": "#2c2e33", "button_border": "#4a4c52", "button_hover": "#373a40",
+        "button_hover_border": "#6a6d75", "button_pressed": "#42454c",
+        "button_checked_bg": "#e4e4e4", "button_checked_text": "#1f2024",
+        "panel_bg": "#26282d", "panel_hover": "#31343a", "panel_checked": "#3c3f46",
+        "row_border": "#3a3c42", "row_bg": "#25272b",
+        "card_border": "#4a4c52", "card_bg": "#2c2e33", "label_bg": "#34363c",
+        "input_border": "#4a4c52", "input_bg": "#232529", "input_focus_bg": "#1b1c20",
+        "accent": "#6aa8f0", "accent_bg": "#1d2a3a", "accent_soft": "#243447", "accent_focus_bg": "#1a2533",
+        "danger": "#ef6b6b", "danger_bg": "#3a2326", "danger_border": "#6b3a45",
+        "danger_hover": "#ff8a8a", "danger_hover_bg": "#4a2a2e", "danger_hover_border": "#9c4a5c",
+        "detail_bg": "#26282d",
+        "success": "#7bd17b", "success_bg": "#1f2f22", "success_border": "#3f6b45", "success_hover": "#27392a",
+        "scroll_bg": "#232529", "scrollbar_bg": "#26282d", "handle": "#4a4c52", "handle_hover": "#5d6068",
+    },
+}
+DEFAULT_THEME = "light"
+
+STYLESHEET = Template("""
+QWidget {
+    background-color: $window_bg;
+    color: $text;
+    font-family: 'Meiryo', sans-serif;
+}
+QFrame {
+    background-color: $window_bg;
+}
+QPushButton {
+    background-color: $button_bg;
+    border: 1px solid $button_border;
+    border-radius: 4px;
+    padding: 6px 12px;
+    color: $text;
+}
+QPushButton:hover {
+    background-color: $button_hover;
+    border-color: $button_hover_border;
+}
+QPushButton:pressed {
+    background-color: $button_pressed;
+}
+QPushButton:checked {
+    background-color: $button_checked_bg;
+    color: $button_checked_text;
+    font-weight: bold;
+}
+
+/* 折りたたみセクション */
+QToolButton#collapsibleToggle {
+    border: none;
+    background: $panel_bg;
+    padding: 8px;
+    text-align: left;
+    font-weight: bold;
+    border-radius: 3px;
+}
+QToolButton#collapsibleToggle:hover {
+    background: $panel_hover;
+}
+QToolButton#collapsibleToggle:checked {
+    background: $panel_checked;
+}
+
+/* 編成行 */
+QFrame#teamFrame {
+    border: 2px solid $row_border;
+    border-radius: 8px;
+    background: $row_bg;
+}
+QFrame#characterFrame {
+    border: 2px solid $card_border;
+    border-radius: 6px;
+    background: $card_bg;
+}
+QLabel#characterLabel {
+    font-size: 11px;
+    font-weight: bold;
+    color: $muted;
+    background: $label_bg;
+    padding: 3px 6px;
+    border-radius: 3px;
+}
+QLineEdit#characterNameEdit {
+    border: 1px solid $input_border;
+    background: $input_bg;
+    font-size: 11px;
+    padding: 4px 6px;
+    border-radius: 3px;
+}
+QLineEdit#characterNameEdit:focus {
+    border: 2px solid $accent;
+    background: $input_focus_bg;
+}
+QLabel[role="field"] {
+    font-size: 10px;
+    color: $muted;
+    font-weight: bold;
+    background: transparent;
+}
+QSpinBox#rankSpin {
+    border: 1px solid $input_border;
+    background: $input_bg;
+    font-size: 11px;
+    padding: 3px;
+    border-radius: 3px;
+}
+QSpinBox#rankSpin:focus {
+    border: 2px solid $accent;
+    background: $input_focus_bg;
+}
+QPushButton#detailButton {
+    font-size: 10px;
+    padding: 4px;
+    background: $button_hover;
+    border: 1px solid $input_border;
+    border-radius: 4px;
+    font-weight: bold;
+    color: $text;
+}
+QPushButton#detailButton:hover {
+    background: $button_pressed;
+}
+QPushButton#detailButton:checked {
+    background: $panel_checked;
+    color: $text;
+}
+QFrame#scoreFrame {
+    border: 2px solid $accent;
+    border-radius: 6px;
+    background: $accent_bg;
+}
+QLabel#scoreTitle {
+    font-size: 12px;
+    color: $accent;
+    font-weight: bold;
+    background: $accent_soft;
+    padding: 3px 6px;
+    border-radius: 3px;
+}
+QLineEdit#scoreEdit {
+    border: 1px solid $accent;
+    background: $input_focus_bg;
+    font-size: 14px;
+    font-weight: bold;
+    padding: 6px 8px;
+    border-radius: 4px;
+}
+QLineEdit#scoreEdit:focus {
+    border: 2px solid $accent;
+    background: $accent_focus_bg;
+}
+QToolButton#deleteButton {
+    color: $danger;
+    background: $danger_bg;
+    border: 2px solid $danger_border;
+    border-radius: 16px;
+    font-size: 16px;
+    font-weight: bold;
+}
+QToolButton#deleteButton:hover {
+    color: $danger_hover;
+    background: $danger_hover_bg;
+    border-color: $danger_hover_border;
+}
+
+/* キャラクター詳細 */
+QWidget#characterDetail {
+    background: $detail_bg;
+    border: 1px solid $row_border;
+    border-radius: 4px;
+    margin-top: 5px;
+}
+QWidget#characterDetail QLabel {
+    background: transparent;
+}
+QSpinBox#detailSpin {
+    font-size: 10px;
+    padding: 4px;
+    border: 1px solid $input_border;
+    border-radius: 3px;
+    background: $input_focus_bg;
+}
+QLineEdit#detailEdit {
+    font-size: 10px;
+    padding: 5px;
+    border: 1px solid $input_border;
+    border-radius: 3px;
+    background: $input_focus_bg;
+}
+QComboBox#mainStatCombo {
+    font-size: 9px;
+    padding: 3px;
+    border: 1px solid $input_border;
+    border-radius: 3px;
+    background: $input_focus_bg;
+    min-width: 80px;
+}
+QTextEdit#detailMemo {
+    font-size: 9px;
+    padding: 5px;
+    border: 1px solid $input_border;
+    border-radius: 3px;
+    background: $input_focus_bg;
+}
+
+/* 詳細編成ウィジェット */
+QGroupBox#detailGroup {
+    font-weight: bold;
+    border: 2px solid $input_border;
+    border-radius: 5px;
+    margin: 5px 0;
+    padding-top: 10px;
+}
+QGroupBox#detailGroup::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px;
+}
+QLineEdit#detailTeamEdit, QTextEdit#detailTeamText {
+    padding: 5px;
+    border: 1px solid $input_border;
+    border-radius: 3px;
+}
+QSpinBox#detailTeamSpin {
+    padding: 2px;
+    border: 1px solid $input_border;
+}
+QComboBox#detailTeamCombo {
+    padding: 3px;
+    border: 1px solid $input_border;
+}
+
+/* 編成一覧 */
+QPushButton#addTeamButton {
+    background: $accent_bg;
+    border: 2px dashed $accent;
+    border-radius: 5px;
+    padding: 10px;
+    color: $accent;
+    font-weight: bold;
+}
+QPushButton#addTeamButton:hover {
+    background: $accent_soft;
+}
+QPushButton#copyTeamsButton {
+    background: $success_bg;
+    border: 2px solid $success_border;
+    border-radius: 5px;
+    padding: 10px;
+    color: $success;
+    font-weight: bold;
+}
+QPushButton#copyTeamsButton:hover {
+    background: $success_hover;
+}
+QLabel[role="header"] {
+    font-size: 12px;
+    font-weight: bold;
+    color: $text;
+}
+QScrollArea#teamScroll, QListView#teamList {
+    border: 1px solid $row_border;
+    border-radius: 5px;
+    background: $scroll_bg;
+}
+QScrollBar:vertical {
+    border: none;
+    background: $scrollbar_bg;
+    width: 12px;
+    border-radius: 6px;
+    margin: 0px;
+}
+QScrollBar::handle:vertical {
+    background: $handle;
+    border-radius: 6px;
+    min-height: 20px;
+}
+QScrollBar::handle:vertical:hover {
+    background: $handle_hover;
+}
+QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+    border: none;
+    background: none;
+    height: 0px;
+}
+
+/* タブバー */
+QFrame#tabBar {
+    background-color: $panel_bg;
+    border-bottom: 1px solid $row_border;
+}
+QFrame#tabFrame {
+    border: 1px solid $input_border;
+    border-bottom: none;
+    border-top-left-radius: 5px;
+    border-top-right-radius: 5px;
+    background-color: $button_bg;
+}
+QPushButton#tabButton {
+    border: none;
+    background: transparent;
+    padding: 8px 12px;
+    font-size: 11px;
+    color: $muted;
+}
+QPushButton#tabButton:checked {
+    background-color: $window_bg;
+    font-weight: bold;
+    border-radius: 3px;
+    color: $text;
+}
+QToolButton#tabCloseButton {
+    color: $muted;
+    background-color: transparent;
+    border: 1px solid $row_border;
+    font-weight: bold;
+    padding: 0;
+    border-radius: 8px;
+}
+QLineEdit#searchEdit {
+    border: 1px solid $input_border;
+    background: $input_bg;
+    padding: 3px 6px;
+    border-radius: 3px;
+}
+QLineEdit#searchEdit:focus {
+    border: 1px solid $accent;
+    background: $input_focus_bg;
+}
+QLabel#searchLabel {
+    color: $muted;
+    background: transparent;
+    padding: 0 4px;
+}
+QToolButton#tabCloseButton:hover {
+    color: $text;
+    background-color: $label_bg;
+}
+""")
+
+_current_theme = DEFAULT_THEME
+
+
+def stylesheet(name):
+    """テーマ名からアプリ全体のスタイルシートを作成"""
+    return STYLESHEET.substitute(THEMES[name])
+
+
+def apply_theme(app, name=DEFAULT_THEME):
+    """アプリケーションにテーマを適用（既存のウィジェットはそのまま再描画される）"""
+    global _current_theme
+    _current_theme = name
+    app.setStyleSheet(stylesheet(name))
+
+
+def current_theme():
+    return _current_theme
+
+
+def theme_color(key):
+    """現在のテーマの色（スタイルシートを使わずに描画する箇所用）"""
+    return THEMES[_current_theme][key]
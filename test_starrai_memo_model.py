@@ -0,0 +1,55 @@
+"""編成モデル（starrai_memo_model）の文字列の解析のテスト
+
+    python -m pytest -q
+"""
+import unittest
+
+from starrai_memo_model import Team, format_team_line, iter_teams_from_lines, parse_score, parse_team_line
+
+
+class ParseScoreTest(unittest.TestCase):
+
+    def test_numbers_and_units(self):
+        self.assertEqual(parse_score("38,500"), 38500)
+        self.assertEqual(parse_score("３８５００"), 38500)
+        self.assertEqual(parse_score("3.4万"), 34000)
+        self.assertEqual(parse_score("12 k"), 12000)
+        self.assertEqual(parse_score("1000 / 2000"), 2000)
+        self.assertIsNone(parse_score(""))
+        self.assertIsNone(parse_score("未クリア"))
+
+    def test_star_count_is_not_the_score(self):
+        self.assertEqual(parse_score("3★ 34000"), 34000)
+        self.assertEqual(parse_score("★3 34000"), 34000)
+        self.assertEqual(parse_score("35000 ★3"), 35000)
+        self.assertEqual(parse_score("35000★3"), 35000)
+        self.assertEqual(parse_score("3★34000"), 34000)
+        self.assertEqual(parse_score("35000 ☆3"), 35000)
+        self.assertEqual(parse_score("100 ★"), 100)
+        self.assertIsNone(parse_score("★3"))
+
+
+class ParseTeamLineTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        team = Team.from_dict({"row_id": 1, "score": "35000", "characters": [
+            {"name": "カフカ", "eidolon": 0, "superimpose": 1}, {"name": "銀狼", "eidolon": 2, "superimpose": 1}, {}, {}]})
+        data = parse_team_line(format_team_line(team))
+        self.assertEqual(data["score"], "35000")
+        self.assertEqual([(c["name"], c["eidolon"], c["superimpose"]) for c in data["characters"]],
+                         [("カフカ", 0, 1), ("銀狼", 2, 1)])
+        self.assertEqual(len(parse_team_line("カフカ / 銀狼 - スコア: 100")["characters"]), 2)
+
+    def test_text_that_is_not_a_team(self):
+        for line in ["スコア: 100", " / カフカ E0 S1", "カフカ", "今日は混沌を回した", "- スコア: 100",
+                     "カフカ E0 S1 / / 銀狼 E0 S1", "a E0 / b E0 / c E0 / d E0 / e E0"]:
+            self.assertIsNone(parse_team_line(line), line)
+
+    def test_iter_teams_from_lines(self):
+        lines = ["カフカ E0 S1 - スコア: 1", "", "メモ: 前半は単体", "銀狼 E2"]
+        self.assertEqual([(lineno, data is not None) for lineno, data in iter_teams_from_lines(lines)],
+                         [(1, True), (3, False), (4, True)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+"""保存形式（starrai_memo_storage・starrai_memo_sqlite）の読み書きのテスト
+
+    python -m pytest -q
+"""
+import os
+import tempfile
+import unittest
+
+from starrai_memo_backends import iter_settings
+from starrai_memo_sqlite import SqliteSettingsStore
+from starrai_memo_storage import TextSettingsEncoder, TextSettingsStore, new_character, parse_settings_text
+
+
+def make_section(content, names, score="1000"):
+    characters = [new_character() for _ in names]
+    for char, name in zip(characters, names):
+        char["name"] = name
+    return {"content": content, "phase": "前半", "teams": [{"row_id": 1, "score": score, "characters": characters}]}
+
+
+class SqliteSettingsStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "settings.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def reopen(self):
+        store = SqliteSettingsStore(self.path)
+        self.addCleanup(store.close)
+        section_data, last_section = store.load()
+        return store, section_data, last_section
+
+    def test_rename_unopened_section(self):
+        store = SqliteSettingsStore(self.path)
+        store.save({"A": make_section("忘却の庭", ["カフカ"]), "B": make_section("虚構叙事", ["ホタル"])}, "A")
+        store.close()
+
+        # 一度も開いていないセクション A を C に改名して保存する
+        store, section_data, _ = self.reopen()
+        store.save({"C": section_data["A"], "B": section_data["B"]}, "C")
+        self.assertEqual(store.read_section("C")["content"], "忘却の庭")
+
+        _, section_data, last_section = self.reopen()
+        self.assertEqual(list(section_data), ["C", "B"])
+        self.assertEqual(last_section, "C")
+        section = section_data["C"].decode()
+        self.assertEqual(section["content"], "忘却の庭")
+        self.assertEqual(section["teams"][0]["characters"][0]["name"], "カフカ")
+
+    def test_swap_unopened_section_names(self):
+        store = SqliteSettingsStore(self.path)
+        store.save({"A": make_section("忘却の庭", ["カフカ"]), "B": make_section("虚構叙事", ["ホタル"])}, "A")
+        store.close()
+
+        store, section_data, _ = self.reopen()
+        store.save({"A": section_data["B"], "B": section_data["A"]}, "A")
+
+        _, section_data, _ = self.reopen()
+        self.assertEqual(section_data["A"].decode()["teams"][0]["characters"][0]["name"], "ホタル")
+        self.assertEqual(section_data["B"].decode()["teams"][0]["characters"][0]["name"], "カフカ")
+
+
+class TextSettingsStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "settings.txt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @staticmethod
+    def decoded(section_data):
+        return {name: section if isinstance(section, dict) else section.decode()
+                for name, section in section_data.items()}
+
+    def test_torn_journal_tail_then_new_edits(self):
+        store = TextSettingsStore(self.path)
+        store.save({"A": make_section("忘却の庭", ["カフカ"], "1000")}, "A")  # 初回はスナップショット
+        store.save({"A": make_section("忘却の庭", ["カフカ"], "2000")}, "A")  # ジャーナルに追記
+        with open(store.journal_path, "ab") as f:
+            f.write('{"op": "set", "s": "A", "t": 0, "k": "score", "v": "9'.encode("utf-8"))  # 書き込み途中で終了
+
+        store = TextSettingsStore(self.path)
+        section_data = self.decoded(store.load()[0])
+        self.assertEqual(section_data["A"]["teams"][0]["score"], "2000")
+        section_data["A"] = make_section("忘却の庭", ["カフカ"], "3000")
+        section_data["B"] = make_section("虚構叙事", ["ホタル"])
+        store.save(section_data, "B")
+
+        section_data, last_section = TextSettingsStore(self.path).load()
+        section_data = self.decoded(section_data)
+        self.assertEqual(last_section, "B")
+        self.assertEqual(section_data["A"]["teams"][0]["score"], "3000")
+        self.assertEqual(section_data["B"]["content"], "虚構叙事")
+
+    def test_journal_record_for_missing_section(self):
+        store = TextSettingsStore(self.path)
+        store.save({"A": make_section("忘却の庭", ["カフカ"], "1000"),
+                    "B": make_section("虚構叙事", ["ホタル"], "1000")}, "A")
+        store.save({"A": make_section("忘却の庭", ["カフカ"], "1000"),
+                    "B": make_section("虚構叙事", ["ホタル"], "2000")}, "A")  # 再生できるレコード
+        store.save({"A": make_section("忘却の庭", ["カフカ"], "2000"),
+                    "B": make_section("虚構叙事", ["ホタル"], "2000")}, "A")
+        # スナップショットを手で編集してセクション A を消す（ジャーナルには A の変更が残っている）
+        with open(self.path, encoding="utf-8") as f:
+            text = f.read()
+        start = text.index("[SECTION: A]")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text[:start] + text[text.index("[SECTION: B]"):])
+
+        store = TextSettingsStore(self.path)
+        section_data = self.decoded(store.load()[0])
+        self.assertEqual(list(section_data), ["B"])
+        self.assertEqual(section_data["B"]["teams"][0]["score"], "2000")
+        section_data["B"] = make_section("虚構叙事", ["ホタル"], "5000")
+        store.save(section_data, "B")
+
+        section_data, last_section = TextSettingsStore(self.path).load()
+        section_data = self.decoded(section_data)
+        self.assertEqual(list(section_data), ["B"])
+        self.assertEqual(last_section, "B")
+        self.assertEqual(section_data["B"]["teams"][0]["score"], "5000")
+
+
+class IterSettingsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def snapshot(self):
+        files = {}
+        for name in sorted(os.listdir(self.tmp.name)):
+            with open(os.path.join(self.tmp.name, name), "rb") as f:
+                files[name] = f.read()
+        return files
+
+    def test_text_is_not_rewritten(self):
+        path = os.path.join(self.tmp.name, "settings.txt")
+        store = TextSettingsStore(path)
+        store.save({"A": make_section("忘却の庭", ["カフカ"], "1000")}, "A")
+        store.save({"A": make_section("忘却の庭", ["カフカ"], "2000")}, "A")
+        with open(store.journal_path, "ab") as f:
+            f.write(b'{"op": "last", "v": "A')  # 書き込み途中の行も残す
+        before = self.snapshot()
+
+        sections = list(iter_settings(path))
+        self.assertEqual(sections[0][1]["teams"][0]["score"], "2000")
+        self.assertEqual(self.snapshot(), before)
+
+    def test_sqlite_is_opened_read_only(self):
+        path = os.path.join(self.tmp.name, "settings.db")
+        store = SqliteSettingsStore(path)
+        store.compact({"A": make_section("忘却の庭", ["カフカ"])}, "A")
+        store.close()
+        with open(path, "rb") as f:
+            before = f.read()
+
+        self.assertEqual([name for name, _ in iter_settings(path)], ["A"])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), before)
+
+
+class SettingsTextTest(unittest.TestCase):
+
+    def test_round_trip_none_and_surrounding_spaces(self):
+        section = make_section("None", ["  カフカ "])
+        section["teams"][0]["score"] = " 1,000 "
+        section["teams"][0]["characters"][0]["memo"] = "\t先頭はタブ\n2行目 "
+        section_data = {"None": section, " 空白 ": {"content": None, "phase": None, "teams": []}}
+        text = TextSettingsEncoder().encode(section_data, None, 1)
+
+        parsed, last_section, generation = parse_settings_text(text.splitlines(keepends=True))
+        self.assertIsNone(last_section)
+        self.assertEqual(generation, 1)
+        self.assertEqual(parsed, section_data)
+
+        _, last_section, _ = parse_settings_text(TextSettingsEncoder().encode(section_data, "None").splitlines())
+        self.assertEqual(last_section, "None")
+
+    def test_format_version_2_none(self):
+        lines = [
+            "=== STARRAI MEMO SETTINGS ===\n",
+            "FORMAT_VERSION: 2\n",
+            "LAST_SECTION: None\n",
+            "[SECTION:  A ]\n",
+            "CONTENT: None\n",
+            "PHASE: 前半 \n",
+            "  [TEAM_1]\n",
+            "  SCORE:  100 \n",
+        ]
+        section_data, last_section, _ = parse_settings_text(lines)
+        self.assertIsNone(last_section)
+        self.assertEqual(list(section_data), ["A"])
+        self.assertIsNone(section_data["A"]["content"])
+        self.assertEqual(section_data["A"]["phase"], "前半")
+        self.assertEqual(section_data["A"]["teams"][0]["score"], "100")
+
+
+if __name__ == '__main__':
+    unittest.main()